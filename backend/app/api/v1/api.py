@@ -1,9 +1,15 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import health, metrics, dashboard, webhook
+from app.core.serialization import FastJSONResponse
+from app.api.v1.endpoints import health, metrics, dashboard, webhook, products, sales, aws, users, expenses
 
-api_router = APIRouter()
+api_router = APIRouter(default_response_class=FastJSONResponse)
 
 api_router.include_router(health.router, prefix="/health", tags=["health"])
 api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
 api_router.include_router(webhook.router, prefix="/webhook", tags=["webhook"])
+api_router.include_router(products.router, prefix="/products", tags=["products"])
+api_router.include_router(sales.router, prefix="/sales", tags=["sales"])
+api_router.include_router(aws.router, prefix="/aws", tags=["aws"])
+api_router.include_router(users.router, prefix="/users", tags=["users"])
+api_router.include_router(expenses.router, prefix="/expenses", tags=["expenses"])
@@ -0,0 +1,61 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from app.monitoring.aws_snapshot import aws_snapshot_store
+from app.monitoring.prometheus_metrics import API_CALLS
+
+router = APIRouter()
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+@router.get("/resources")
+async def list_resources(
+    request: Request,
+    response: Response,
+    account: Optional[str] = None,
+    region: Optional[str] = None,
+    resource_type: Optional[str] = None
+):
+    """
+    Inventoried AWS resources from the in-memory snapshot. Send the ETag back
+    in ``If-None-Match`` to get a 304 while the matching resources are unchanged.
+    The body only holds what the ETag covers; the snapshot version and update
+    time are served by ``/summary``.
+    """
+    API_CALLS.labels(service="aws", endpoint="/resources").inc()
+    
+    etag = aws_snapshot_store.etag(account, region, resource_type)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    resources = aws_snapshot_store.query(account, region, resource_type)
+    return {
+        "count": len(resources),
+        "resources": [resource.to_dict() for resource in resources]
+    }
+
+@router.get("/summary")
+async def resource_summary():
+    """
+    Resource counts per account, region and resource type
+    """
+    return {
+        "version": aws_snapshot_store.version,
+        "updated_at": aws_snapshot_store.updated_at,
+        "groups": aws_snapshot_store.summary()
+    }
+
+@router.get("/changes")
+async def resource_changes(since: int = Query(0, ge=0)):
+    """
+    Resources added, removed or changed in each snapshot version after ``since``
+    """
+    changes = aws_snapshot_store.changes_since(since)
+    if changes is None:
+        raise HTTPException(status_code=410, detail="Changes since that version are no longer retained")
+    return {"version": aws_snapshot_store.version, "changes": changes}
@@ -1,35 +1,45 @@
-from fastapi import APIRouter
-from app.monitoring.prometheus_metrics import (
-    USER_REGISTRATIONS, API_CALLS, INVENTORY_LEVELS, 
-    SALES_VOLUME, RESPONSE_TIME_P95, THROUGHPUT
-)
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
+from app.core.config import settings
+from app.monitoring.prometheus_metrics import API_CALLS
+from app.monitoring.aggregator import dashboard_aggregator
+from app.monitoring.streaming import Subscriber, dashboard_broadcaster
 
 router = APIRouter()
 
 @router.get("/metrics")
 async def get_dashboard_metrics():
-    # Simulate some business metrics
-    USER_REGISTRATIONS.inc(5)
     API_CALLS.labels(service="dashboard", endpoint="/metrics").inc()
     
-    # Mock data for dashboard
-    return {
-        "system_metrics": {
-            "cpu_usage": 45.2,
-            "memory_usage": 67.8,
-            "disk_usage": 23.1,
-            "network_io": 125.5
-        },
-        "application_metrics": {
-            "request_rate": 150.5,
-            "response_time_p95": 0.25,
-            "error_rate": 0.02,
-            "active_users": 1250
-        },
-        "business_metrics": {
-            "total_users": 5420,
-            "daily_active_users": 1250,
-            "revenue_today": 12500.50,
-            "conversion_rate": 3.2
-        }
-    }
+    # Precomputed and encoded once per aggregator tick
+    return Response(dashboard_aggregator.snapshot_json(), media_type="application/json")
+
+@router.get("/stream")
+async def stream_dashboard_metrics():
+    """
+    Server-Sent Events stream of the dashboard metrics: a ``snapshot`` event
+    with the full payload, then ``delta`` events with only the changed values.
+    """
+    # Registering is the capacity check, so concurrent connects cannot overshoot
+    subscriber = dashboard_broadcaster.subscribe()
+    if subscriber is None:
+        raise HTTPException(status_code=503, detail="Too many dashboard stream subscribers")
+    
+    API_CALLS.labels(service="dashboard", endpoint="/stream").inc()
+    
+    return StreamingResponse(
+        _event_stream(subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also runs if the client is gone before the stream starts
+        background=BackgroundTask(dashboard_broadcaster.unsubscribe, subscriber)
+    )
+
+async def _event_stream(subscriber: Subscriber):
+    try:
+        while True:
+            frame = await subscriber.next_frame(settings.DASHBOARD_STREAM_KEEPALIVE_SECONDS)
+            yield frame if frame is not None else b": keepalive\n\n"
+    finally:
+        dashboard_broadcaster.unsubscribe(subscriber)
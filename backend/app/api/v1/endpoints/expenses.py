@@ -0,0 +1,38 @@
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.data.database import get_session
+from app.data.repositories import ExpenseRepository
+from app.data.schemas import ExpenseByCategorySummaryOut, ExpenseCreate, ExpenseOut
+
+router = APIRouter()
+
+@router.get("", response_model=List[ExpenseByCategorySummaryOut])
+async def list_expenses_by_category(
+    category: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Expense totals per category and day, newest first. Served from the
+    summary table, which is updated on every write; no GROUP BY on read.
+    """
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    
+    summaries = await ExpenseRepository(session).summaries(category, start, end)
+    return [
+        ExpenseByCategorySummaryOut(
+            expense_by_category_summary_id=f"{day.isoformat()}:{name}",
+            category=name,
+            amount=f"{amount:.2f}",
+            date=day
+        )
+        for name, day, amount in summaries
+    ]
+
+@router.post("", response_model=ExpenseOut, status_code=201)
+async def create_expense(expense: ExpenseCreate, session: AsyncSession = Depends(get_session)):
+    return await ExpenseRepository(session).create(expense)
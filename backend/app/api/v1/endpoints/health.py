@@ -1,21 +1,29 @@
 from fastapi import APIRouter
-from app.monitoring.prometheus_metrics import ACTIVE_CONNECTIONS
+from fastapi.responses import Response
+from app.monitoring.health import health_monitor
 
 router = APIRouter()
 
 @router.get("/")
 async def health_check():
-    ACTIVE_CONNECTIONS.inc()
-    return {
-        "status": "healthy",
-        "service": "monitoring-api",
-        "timestamp": "2025-01-27T10:00:00Z"
-    }
+    """
+    Per-dependency results of the last probe round; always 200, see /ready
+    """
+    status_code, body = health_monitor.report()
+    return Response(body, status_code=status_code, media_type="application/json")
 
 @router.get("/ready")
 async def readiness_check():
-    return {"status": "ready"}
+    """
+    503 until a probe round completes, and while a critical dependency is failing
+    """
+    status_code, body = health_monitor.readiness()
+    return Response(body, status_code=status_code, media_type="application/json")
 
 @router.get("/live")
 async def liveness_check():
-    return {"status": "alive"}
+    """
+    503 only when probe rounds have stopped completing
+    """
+    status_code, body = health_monitor.liveness()
+    return Response(body, status_code=status_code, media_type="application/json")
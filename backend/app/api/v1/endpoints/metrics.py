@@ -1,10 +1,85 @@
-from fastapi import APIRouter
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
-from fastapi.responses import Response
+from typing import Optional
+import hmac
+from fastapi import APIRouter, HTTPException, Query, Request
+from prometheus_client import CONTENT_TYPE_LATEST
+from fastapi.responses import PlainTextResponse, Response
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.exceptions import error_aggregator
+from app.monitoring.exposition import accepts_gzip, exposition_cache
+from app.monitoring.loop_monitor import loop_monitor
+from app.monitoring.profiler import ProfilerBusy, profiler
 
 router = APIRouter()
 
 @router.get("/")
-async def get_metrics():
-    data = generate_latest()
-    return Response(data, media_type=CONTENT_TYPE_LATEST)
+async def get_metrics(request: Request):
+    exposition = await exposition_cache.get()
+    
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        return Response(
+            exposition.gzipped,
+            media_type=CONTENT_TYPE_LATEST,
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return Response(
+        exposition.data,
+        media_type=CONTENT_TYPE_LATEST,
+        headers={"Vary": "Accept-Encoding"}
+    )
+
+@router.get("/debug/slow")
+async def slow_callbacks(limit: Optional[int] = Query(None, ge=1, le=1000)):
+    """
+    Most recent callbacks that blocked the event loop past the threshold,
+    newest first, with the loop thread's stack captured while they ran
+    """
+    return {
+        "threshold": loop_monitor.threshold,
+        "max_lag": round(loop_monitor.max_lag, 4),
+        "offenders": loop_monitor.recent(limit)
+    }
+
+@router.get("/debug/errors")
+async def error_fingerprints(limit: Optional[int] = Query(50, ge=1, le=1000)):
+    """
+    Exception fingerprints seen by this worker, most frequent first
+    """
+    return {
+        "window_seconds": error_aggregator.window_seconds,
+        "fingerprints": error_aggregator.top(limit)
+    }
+
+@router.get("/debug/profile", response_class=PlainTextResponse)
+async def profile(
+    request: Request,
+    seconds: float = Query(10.0, gt=0),
+    rate: Optional[float] = Query(None, gt=0)
+):
+    """
+    Sample this worker's thread stacks for ``seconds`` and return them in
+    collapsed flamegraph format. The worker keeps serving meanwhile.
+    """
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = request.headers.get("x-profiler-token", "")
+    if settings.PROFILER_TOKEN and not hmac.compare_digest(token, settings.PROFILER_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid profiler token")
+    
+    try:
+        result = await run_in_threadpool(
+            profiler.run, seconds, rate or settings.PROFILER_DEFAULT_RATE
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return PlainTextResponse(
+        result.collapsed(),
+        headers={
+            "X-Profile-Samples": str(result.samples),
+            "X-Profile-Duration": f"{result.duration:.3f}",
+            "X-Profile-Rate": str(result.rate)
+        }
+    )
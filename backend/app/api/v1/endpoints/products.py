@@ -0,0 +1,58 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.data.database import get_session
+from app.data.repositories import ProductRepository, decode_cursor, encode_cursor
+from app.data.schemas import ProductCreate, ProductOut
+from app.data.search import product_search
+
+router = APIRouter()
+
+@router.get("", response_model=List[ProductOut])
+async def list_products(
+    response: Response,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.DB_PAGE_SIZE, ge=1, le=settings.DB_MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Products ordered by name, or ranked by relevance when ``search`` is given,
+    one page at a time. Pass the ``X-Next-Cursor`` response header back as
+    ``cursor`` to fetch the following page.
+    """
+    repository = ProductRepository(session)
+    try:
+        if search:
+            products, next_cursor = await _search_page(repository, search, cursor, limit, response)
+        else:
+            products, next_cursor = await repository.list_page(limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return products
+
+async def _search_page(repository: ProductRepository, search: str, cursor: Optional[str],
+                       limit: int, response: Response):
+    offset = 0
+    if cursor:
+        key = decode_cursor(cursor)
+        if len(key) != 1 or not isinstance(key[0], int) or key[0] < 0:
+            raise ValueError("Invalid cursor")
+        offset = key[0]
+    
+    await product_search.sync(repository.session)
+    product_ids, total = product_search.search(search, limit, offset)
+    response.headers["X-Total-Count"] = str(total)
+    
+    next_cursor = encode_cursor(offset + limit) if offset + limit < total else None
+    return await repository.get_many(product_ids), next_cursor
+
+@router.post("", response_model=ProductOut, status_code=201)
+async def create_product(product: ProductCreate, session: AsyncSession = Depends(get_session)):
+    created = await ProductRepository(session).create(product)
+    product_search.add(created.product_id, created.name, created.category)
+    return created
@@ -0,0 +1,50 @@
+from typing import Optional
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import JSONResponse
+from app.core.logging import get_logger
+from app.data.sales import parse_ndjson, sales_pipeline
+from app.monitoring.prometheus_metrics import API_CALLS
+
+router = APIRouter()
+logger = get_logger("sales")
+
+@router.post("/events", status_code=202)
+async def ingest_sales_events(request: Request):
+    """
+    Bulk-ingest sales events as newline-delimited JSON.
+
+    Valid lines are buffered and written in batches; invalid lines are
+    skipped and reported by line number.
+    """
+    API_CALLS.labels(service="sales", endpoint="/events").inc()
+    events, rejected, errors = parse_ndjson(await request.body())
+    
+    if not events and rejected:
+        return JSONResponse(
+            status_code=400,
+            content={"status": "error", "accepted": 0, "rejected": rejected, "errors": errors}
+        )
+    
+    if not sales_pipeline.submit(events):
+        logger.warning("Sales buffer full, asking client to retry", events=len(events))
+        return JSONResponse(
+            status_code=503,
+            content={"status": "error", "message": "Sales buffer full"},
+            headers={"Retry-After": "1"}
+        )
+    
+    return {"status": "accepted", "accepted": len(events), "rejected": rejected, "errors": errors}
+
+@router.get("/aggregates")
+async def sales_aggregates(
+    window: str = Query("hour", pattern="^(minute|hour|day)$"),
+    limit: Optional[int] = Query(None, ge=1, le=1000)
+):
+    """
+    Tumbling-window sales totals of this worker, newest bucket first
+    """
+    return {
+        "window": window,
+        "buffered": sales_pipeline.buffered,
+        "buckets": sales_pipeline.windows[window].series(limit)
+    }
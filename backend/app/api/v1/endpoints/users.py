@@ -0,0 +1,50 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.data.database import get_session
+from app.data.repositories import UserRepository
+from app.data.schemas import UserCreate, UserOut
+from app.monitoring.prometheus_metrics import USER_REGISTRATIONS
+
+router = APIRouter()
+
+@router.get("", response_model=List[UserOut])
+async def list_users(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.DB_PAGE_SIZE, ge=1, le=settings.DB_MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Users ordered by name, one page at a time. ``X-Total-Count`` comes from
+    the maintained user counter, so it costs no ``COUNT(*)``.
+    """
+    repository = UserRepository(session)
+    try:
+        users, next_cursor = await repository.list_page(limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    response.headers["X-Total-Count"] = str(await repository.count())
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return users
+
+@router.get("/count")
+async def count_users(session: AsyncSession = Depends(get_session)):
+    """
+    Total registered users, read from the maintained counter
+    """
+    return {"total": await UserRepository(session).count()}
+
+@router.post("", response_model=UserOut, status_code=201)
+async def create_user(user: UserCreate, session: AsyncSession = Depends(get_session)):
+    try:
+        created = await UserRepository(session).create(user)
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(status_code=409, detail="A user with this email already exists")
+    USER_REGISTRATIONS.inc()
+    return created
@@ -1,53 +1,80 @@
-from fastapi import APIRouter, Request
-from app.monitoring.prometheus_metrics import API_CALLS
-import json
-import logging
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+from app.core.exceptions import ValidationError
+from app.core.logging import get_logger
+from app.core.serialization import FastJSONResponse, loads
+from app.monitoring.alert_queue import alert_queue, validate_alert_payload
+from app.monitoring.alert_store import alert_store, FIRING, RESOLVED
+from app.monitoring.prometheus_metrics import ALERT_PAYLOADS_REJECTED
 
 router = APIRouter()
-logger = logging.getLogger(__name__)
+logger = get_logger("webhook")
 
 @router.post("/webhook")
 async def alertmanager_webhook(request: Request):
     """
-    Handle AlertManager webhook notifications
+    Handle AlertManager webhook notifications.
+
+    The payload is validated and queued; alerts are processed in the
+    background so AlertManager gets an immediate response.
     """
     try:
-        body = await request.json()
-        
-        # Log the alert for debugging
-        logger.info(f"Received alert webhook: {json.dumps(body, indent=2)}")
-        
-        # Process different alert types
-        for alert in body.get("alerts", []):
-            alert_name = alert.get("labels", {}).get("alertname", "unknown")
-            severity = alert.get("labels", {}).get("severity", "unknown")
-            status = alert.get("status", "unknown")
-            
-            # Record webhook call in metrics
-            API_CALLS.labels(service="webhook", endpoint="/webhook").inc()
-            
-            # Log alert details
-            logger.info(f"Alert: {alert_name}, Severity: {severity}, Status: {status}")
-            
-            # Here you could integrate with external systems:
-            # - Send to Slack
-            # - Create JIRA tickets
-            # - Update status pages
-            # - Send SMS notifications
-            
-            if severity == "critical" and status == "firing":
-                logger.critical(f"CRITICAL ALERT: {alert_name}")
-                # Implement critical alert handling logic
-                
-        return {"status": "success", "message": "Webhook processed"}
-        
-    except Exception as e:
-        logger.error(f"Error processing webhook: {str(e)}")
-        return {"status": "error", "message": str(e)}
+        alerts = validate_alert_payload(loads(await request.body()))
+    except (ValueError, ValidationError) as e:
+        ALERT_PAYLOADS_REJECTED.labels(reason="invalid").inc()
+        message = e.message if isinstance(e, ValidationError) else "Invalid JSON body"
+        logger.warning(f"Rejected alert webhook: {message}")
+        return JSONResponse(status_code=400, content={"status": "error", "message": message})
+    
+    if not alert_queue.submit(alerts):
+        ALERT_PAYLOADS_REJECTED.labels(reason="queue_full").inc()
+        logger.warning("Alert queue full, asking AlertManager to retry", alerts=len(alerts))
+        return JSONResponse(
+            status_code=503,
+            content={"status": "error", "message": "Alert queue full"},
+            headers={"Retry-After": "5"}
+        )
+    
+    return FastJSONResponse({"status": "accepted", "message": "Webhook queued", "alerts": len(alerts)})
 
 @router.get("/webhook/health")
 async def webhook_health():
     """
     Health check for webhook endpoint
     """
-    return {"status": "healthy", "service": "webhook"}
+    return {"status": "healthy", "service": "webhook", "queue_depth": alert_queue.depth}
+
+@router.get("/alerts/active")
+async def list_active_alerts(limit: int = Query(100, ge=1, le=10000)):
+    """
+    Currently firing alerts, oldest first
+    """
+    alerts = alert_store.active(limit)
+    return {"count": len(alerts), "alerts": [alert.to_dict() for alert in alerts]}
+
+@router.get("/alerts")
+async def query_alerts(
+    alertname: Optional[str] = None,
+    severity: Optional[str] = None,
+    team: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=10000)
+):
+    """
+    Alerts filtered by indexed labels and, optionally, status
+    """
+    if status not in (None, FIRING, RESOLVED):
+        raise HTTPException(status_code=400, detail=f"status must be '{FIRING}' or '{RESOLVED}'")
+    
+    alerts = alert_store.query(
+        status=status, limit=limit, alertname=alertname, severity=severity, team=team
+    )
+    return {"count": len(alerts), "alerts": [alert.to_dict() for alert in alerts]}
+
+@router.get("/alerts/counts")
+async def alert_counts():
+    """
+    Firing alert counts by severity
+    """
+    return {"by_severity": alert_store.counts_by_severity(), **alert_store.stats()}
@@ -1,15 +1,47 @@
 """
 Custom exceptions and error handling for the monitoring application.
+
+Failures are reported through ``ErrorAggregator``. It fingerprints each
+exception by its type and call site, without formatting anything, and counts
+repeats per fingerprint in a bounded LRU and in ``application_errors_total``.
+Only the first occurrence of a fingerprint in each window is logged, with its
+full traceback and the number of repeats suppressed since the previous log.
+Under an error storm, thousands of identical failures therefore cost one
+formatted traceback per window instead of one each.
 """
 
-from typing import Any, Dict, Optional
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
 import traceback
-from .logging import get_logger
+from datetime import datetime
+from .config import settings
+from .logging import MonitoringLogger, get_logger
+from app.monitoring.cardinality import ERROR_FINGERPRINT_GUARD
 
 logger = get_logger("exceptions")
 
+# Frames under this directory are the application's own code
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Every request passes through these wrappers, so they never locate a failure
+_REQUEST_WRAPPERS = frozenset(
+    os.path.join(APP_ROOT, "monitoring", name) for name in ("middleware.py", "loop_monitor.py")
+)
+
+# (exception type, innermost app frame, innermost frame); frames are (file, line)
+CallSite = Tuple[type, Optional[Tuple[str, int]], Optional[Tuple[str, int]]]
+
+def _timestamp() -> str:
+    """UTC timestamp for error responses."""
+    return datetime.utcnow().isoformat()
+
 class MonitoringException(Exception):
     """Base exception for monitoring application."""
     
@@ -65,11 +97,152 @@ class ConfigurationError(MonitoringException):
         super().__init__(message, "CONFIGURATION_ERROR", details)
         self.config_key = config_key
 
+def _call_site(exc: BaseException) -> CallSite:
+    app_frame = last_frame = None
+    tb = exc.__traceback__
+    while tb is not None:
+        filename = tb.tb_frame.f_code.co_filename
+        last_frame = (filename, tb.tb_lineno)
+        if filename.startswith(APP_ROOT) and filename not in _REQUEST_WRAPPERS:
+            app_frame = last_frame
+        tb = tb.tb_next
+    return type(exc), app_frame, last_frame
+
+def _site_label(frame: Optional[Tuple[str, int]]) -> str:
+    if frame is None:
+        return "unknown"
+    filename, lineno = frame
+    return f"{os.path.relpath(filename, APP_ROOT) if filename.startswith(APP_ROOT) else filename}:{lineno}"
+
+class ErrorGroup:
+    """Occurrences of one exception fingerprint."""
+    
+    __slots__ = ("fingerprint", "exception_type", "site", "origin", "count",
+                 "first_seen", "last_seen", "window_start", "suppressed")
+    
+    def __init__(self, key: CallSite):
+        exc_type, app_frame, last_frame = key
+        self.exception_type = exc_type.__name__
+        self.site = _site_label(app_frame or last_frame)
+        self.origin = _site_label(last_frame)
+        qualified = f"{exc_type.__module__}.{exc_type.__qualname__}|{self.site}|{self.origin}"
+        self.fingerprint = hashlib.blake2b(qualified.encode(), digest_size=6).hexdigest()
+        self.count = 0
+        self.first_seen = self.last_seen = time.time()
+        self.window_start = float("-inf")
+        # Repeats not logged since the last full log
+        self.suppressed = 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "exception_type": self.exception_type,
+            "site": self.site,
+            "origin": self.origin,
+            "count": self.count,
+            "first_seen": datetime.utcfromtimestamp(self.first_seen).isoformat(),
+            "last_seen": datetime.utcfromtimestamp(self.last_seen).isoformat(),
+        }
+
+class ErrorAggregator:
+    """Counts exceptions per fingerprint and rate-limits their full logs."""
+    
+    def __init__(self, window_seconds: float = 60.0, max_fingerprints: int = 1000):
+        self.window_seconds = window_seconds
+        self.max_fingerprints = max_fingerprints
+        self._groups: "OrderedDict[CallSite, ErrorGroup]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def record(self, exc: BaseException) -> Tuple[ErrorGroup, bool, int]:
+        """
+        Count ``exc`` and return its group, whether to log it in full, and
+        how many repeats were suppressed since its last full log. An
+        exception already recorded (e.g. by the middleware before the
+        exception handler sees it) is not counted or logged again.
+        """
+        group = getattr(exc, "_error_group", None)
+        if group is not None:
+            return group, False, 0
+        
+        key = _call_site(exc)
+        now = time.monotonic()
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = ErrorGroup(key)
+                if len(self._groups) > self.max_fingerprints:
+                    self._groups.popitem(last=False)
+            else:
+                self._groups.move_to_end(key)
+            group.count += 1
+            group.last_seen = time.time()
+            
+            log_full = now - group.window_start >= self.window_seconds
+            if log_full:
+                group.window_start = now
+                suppressed, group.suppressed = group.suppressed, 0
+            else:
+                group.suppressed += 1
+                suppressed = 0
+        
+        ERROR_FINGERPRINT_GUARD.labels(
+            fingerprint=group.fingerprint, exception_type=group.exception_type
+        ).inc()
+        try:
+            exc._error_group = group
+        except AttributeError:
+            pass
+        return group, log_full, suppressed
+    
+    def report(self, log: MonitoringLogger, exc: BaseException, message: str,
+               level: str = "error", include_traceback: bool = True, **kwargs) -> ErrorGroup:
+        """Record ``exc`` and log it if it is the first of its fingerprint in the window."""
+        group, log_full, suppressed = self.record(exc)
+        if log_full:
+            if include_traceback:
+                kwargs["traceback"] = "".join(
+                    traceback.format_exception(type(exc), exc, exc.__traceback__)
+                )
+            getattr(log, level)(
+                message,
+                fingerprint=group.fingerprint,
+                call_site=group.site,
+                occurrences=group.count,
+                suppressed_repeats=suppressed,
+                **kwargs
+            )
+        return group
+    
+    def top(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Tracked fingerprints, most frequent first."""
+        with self._lock:
+            groups = list(self._groups.values())
+        groups.sort(key=lambda group: group.count, reverse=True)
+        return [group.to_dict() for group in groups[:limit]]
+
+error_aggregator = ErrorAggregator(
+    window_seconds=settings.ERROR_LOG_WINDOW_SECONDS,
+    max_fingerprints=settings.ERROR_MAX_FINGERPRINTS
+)
+
+class _ReportedErrorFilter(logging.Filter):
+    """Drops server log records for exceptions the aggregator already handled."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        exc = record.exc_info[1] if record.exc_info else None
+        return getattr(exc, "_error_group", None) is None
+
+# Starlette re-raises after the exception handler has responded, and uvicorn
+# would log (and format) the traceback of every failing request again
+logging.getLogger("uvicorn.error").addFilter(_ReportedErrorFilter())
+
 async def monitoring_exception_handler(request: Request, exc: MonitoringException):
     """Handle custom monitoring exceptions."""
     
-    logger.error(
+    error_aggregator.report(
+        logger, exc,
         f"Monitoring exception: {exc.error_code}",
+        include_traceback=False,
         error_code=exc.error_code,
         error_message=exc.message,
         request_path=str(request.url),
@@ -84,9 +257,7 @@ async def monitoring_exception_handler(request: Request, exc: MonitoringExceptio
                 "code": exc.error_code,
                 "message": exc.message,
                 "details": exc.details,
-                "timestamp": logger.logger.handlers[0].formatter.formatTime(
-                    logger.logger.handlers[0].formatter.converter()
-                )
+                "timestamp": _timestamp()
             }
         }
     )
@@ -108,23 +279,22 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             "error": {
                 "code": f"HTTP_{exc.status_code}",
                 "message": exc.detail,
-                "timestamp": logger.logger.handlers[0].formatter.formatTime(
-                    logger.logger.handlers[0].formatter.converter()
-                )
+                "timestamp": _timestamp()
             }
         }
     )
 
 async def general_exception_handler(request: Request, exc: Exception):
-    """Handle general exceptions with full traceback logging."""
+    """Handle general exceptions, logging each fingerprint's traceback once per window."""
     
-    logger.critical(
+    error_aggregator.report(
+        logger, exc,
         f"Unhandled exception: {type(exc).__name__}",
+        level="critical",
         exception_type=type(exc).__name__,
         exception_message=str(exc),
         request_path=str(request.url),
-        request_method=request.method,
-        traceback=traceback.format_exc()
+        request_method=request.method
     )
     
     return JSONResponse(
@@ -133,9 +303,7 @@ async def general_exception_handler(request: Request, exc: Exception):
             "error": {
                 "code": "INTERNAL_SERVER_ERROR",
                 "message": "An unexpected error occurred",
-                "timestamp": logger.logger.handlers[0].formatter.formatTime(
-                    logger.logger.handlers[0].formatter.converter()
-                )
+                "timestamp": _timestamp()
             }
         }
     )
@@ -157,6 +325,12 @@ def validate_metric_value(value: Any, metric_name: str) -> float:
     
     try:
         float_value = float(value)
+        if not math.isfinite(float_value):
+            raise ValidationError(
+                f"Metric value must be finite: {metric_name}",
+                field=metric_name,
+                details={"value": value, "metric_name": metric_name}
+            )
         if float_value < 0:
             raise ValidationError(
                 f"Metric value cannot be negative: {metric_name}",
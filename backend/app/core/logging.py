@@ -1,24 +1,54 @@
 """
 Centralized logging configuration for the monitoring application.
+
+Nothing touches the filesystem at import time. Every ``MonitoringLogger``
+carries one shared placeholder handler, and the ``logs/`` directory, file
+handlers and queue writer thread are created by ``configure_logging()``. The
+app lifespan calls it at startup; otherwise the first log record does.
 """
 
+import atexit
 import logging
+import queue
 import sys
-from datetime import datetime
-from typing import Dict, Any
-import json
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
-# Create logs directory if it doesn't exist
+from .config import settings
+from .serialization import dumps
+from app.monitoring.prometheus_metrics import LOG_RECORDS_QUEUED, LOG_RECORDS_DROPPED
+
 log_dir = Path("logs")
-log_dir.mkdir(exist_ok=True)
+
+CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
 class JSONFormatter(logging.Formatter):
-    """Custom JSON formatter for structured logging."""
+    """
+    Custom JSON formatter for structured logging.
+    
+    Timestamps are UTC with millisecond precision. Records arrive in bursts,
+    so the string for the current millisecond is built once and reused.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_timestamp: Tuple[int, str] = (-1, "")
+    
+    def _timestamp(self, created: float) -> str:
+        millis = int(created * 1000)
+        cached = self._last_timestamp
+        if cached[0] != millis:
+            seconds, fraction = divmod(millis, 1000)
+            text = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+            # One tuple assignment, so concurrent formatters never see a torn pair
+            cached = self._last_timestamp = (millis, f"{text}.{fraction:03d}")
+        return cached[1]
     
     def format(self, record: logging.LogRecord) -> str:
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -34,8 +64,217 @@ class JSONFormatter(logging.Formatter):
         # Add extra fields
         if hasattr(record, 'extra_fields'):
             log_entry.update(record.extra_fields)
+        
+        # Extra fields may hold arbitrary objects; log their str() rather than fail
+        return dumps(log_entry, default=str).decode()
+
+class BatchingQueueHandler(logging.Handler):
+    """
+    Queue-backed handler that moves formatting and I/O off the calling thread.
+    
+    Records are enqueued on the hot path; a background writer thread drains
+    them in batches, formats them with each target handler's formatter and
+    issues a single write and flush per target per batch.
+    """
+    
+    POLICIES = ("drop", "block")
+    
+    def __init__(self, handlers: List[logging.Handler], max_size: int = 10000,
+                 full_policy: str = "drop", block_timeout: float = 0.05,
+                 batch_size: int = 256, flush_interval: float = 0.5):
+        super().__init__()
+        if full_policy not in self.POLICIES:
+            raise ValueError(f"Unknown log queue policy: {full_policy}")
+        
+        self.handlers = handlers
+        self.full_policy = full_policy
+        self.block_timeout = block_timeout
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        
+        self.queued_count = 0
+        self.dropped_count = 0
+        
+        self._queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self._stop = object()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Skip the handler lock: the queue does its own locking.
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+    
+    def emit(self, record: logging.LogRecord):
+        if self._closed:
+            self._write_batch([record])
+            return
+        
+        try:
+            if self.full_policy == "block":
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_count += 1
+            LOG_RECORDS_DROPPED.inc()
+            return
+        
+        self.queued_count += 1
+        LOG_RECORDS_QUEUED.inc()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return queue counters."""
+        return {
+            "queued": self.queued_count,
+            "dropped": self.dropped_count,
+            "pending": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "policy": self.full_policy,
+            "running": self._thread.is_alive(),
+        }
+    
+    def _run(self):
+        while True:
+            try:
+                record = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
             
-        return json.dumps(log_entry)
+            batch = [record]
+            while len(batch) < self.batch_size and batch[-1] is not self._stop:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = batch[-1] is self._stop
+            records = batch[:-1] if stop else batch
+            if records:
+                self._write_batch(records)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+    
+    def _write_batch(self, batch: List[logging.LogRecord]):
+        for handler in self.handlers:
+            try:
+                lines = [
+                    handler.format(record)
+                    for record in batch
+                    if record.levelno >= handler.level
+                ]
+                if not lines:
+                    continue
+                terminator = getattr(handler, "terminator", "\n")
+                handler.acquire()
+                try:
+                    handler.stream.write(terminator.join(lines) + terminator)
+                    handler.flush()
+                finally:
+                    handler.release()
+            except Exception:
+                self.handleError(batch[-1])
+    
+    def flush(self):
+        """Block until every record enqueued so far has been written."""
+        if not self._closed and self._thread.is_alive():
+            self._queue.join()
+    
+    def close(self):
+        """Stop the writer thread after draining the queue, then close targets."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(self._stop)
+            self._thread.join(timeout=5)
+            for handler in self.handlers:
+                handler.close()
+        super().close()
+
+def _build_handlers() -> List[logging.Handler]:
+    """Build the console, application and error log handlers."""
+    
+    # Create logs directory if it doesn't exist
+    log_dir.mkdir(exist_ok=True)
+    
+    # Console handler with colored output
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    
+    # File handler with JSON format
+    file_handler = logging.FileHandler(
+        log_dir / "application.log",
+        mode='a'
+    )
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(JSONFormatter())
+    
+    # Error file handler
+    error_handler = logging.FileHandler(
+        log_dir / "errors.log",
+        mode='a'
+    )
+    error_handler.setLevel(logging.ERROR)
+    error_handler.setFormatter(JSONFormatter())
+    
+    return [console_handler, file_handler, error_handler]
+
+_handlers: Optional[List[logging.Handler]] = None
+_queue_handler: Optional[BatchingQueueHandler] = None
+_handlers_lock = threading.Lock()
+
+def configure_logging() -> List[logging.Handler]:
+    """Create the shared handlers on first call and return them."""
+    global _handlers, _queue_handler
+    
+    if _handlers is not None:
+        return _handlers
+    with _handlers_lock:
+        if _handlers is None:
+            handlers = _build_handlers()
+            if settings.LOG_QUEUE_ENABLED:
+                _queue_handler = BatchingQueueHandler(
+                    handlers,
+                    max_size=settings.LOG_QUEUE_MAX_SIZE,
+                    full_policy=settings.LOG_QUEUE_FULL_POLICY,
+                    block_timeout=settings.LOG_QUEUE_BLOCK_TIMEOUT,
+                    batch_size=settings.LOG_BATCH_SIZE,
+                    flush_interval=settings.LOG_FLUSH_INTERVAL,
+                )
+                atexit.register(shutdown_logging)
+                handlers = [_queue_handler]
+            _handlers = handlers
+        return _handlers
+
+class _DeferredHandler(logging.Handler):
+    """Forwards records to the shared handlers, creating them on first use."""
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        # No lock needed here: the target handlers do their own locking.
+        for handler in configure_logging():
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+_deferred_handler = _DeferredHandler()
+
+def get_log_queue_stats() -> Optional[Dict[str, Any]]:
+    """Return log queue counters, or None when queued logging is disabled."""
+    if _queue_handler is None:
+        return None
+    return _queue_handler.stats()
+
+def shutdown_logging():
+    """Flush pending log records and stop the background writer."""
+    if _queue_handler is not None:
+        _queue_handler.close()
 
 class MonitoringLogger:
     """Centralized logger for the monitoring application."""
@@ -45,40 +284,8 @@ class MonitoringLogger:
         self.logger.setLevel(logging.INFO)
         
         # Prevent duplicate handlers
-        if not self.logger.handlers:
-            self._setup_handlers()
-    
-    def _setup_handlers(self):
-        """Set up logging handlers."""
-        
-        # Console handler with colored output
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.INFO)
-        console_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_handler.setFormatter(console_formatter)
-        
-        # File handler with JSON format
-        file_handler = logging.FileHandler(
-            log_dir / "application.log",
-            mode='a'
-        )
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(JSONFormatter())
-        
-        # Error file handler
-        error_handler = logging.FileHandler(
-            log_dir / "errors.log",
-            mode='a'
-        )
-        error_handler.setLevel(logging.ERROR)
-        error_handler.setFormatter(JSONFormatter())
-        
-        # Add handlers
-        self.logger.addHandler(console_handler)
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(error_handler)
+        if _deferred_handler not in self.logger.handlers:
+            self.logger.addHandler(_deferred_handler)
     
     def info(self, message: str, **kwargs):
         """Log info message with optional extra fields."""
@@ -134,8 +341,13 @@ class MonitoringLogger:
 # Global logger instance
 logger = MonitoringLogger()
 
+_loggers: Dict[str, MonitoringLogger] = {}
+
 def get_logger(name: str = None) -> MonitoringLogger:
-    """Get a logger instance."""
-    if name:
-        return MonitoringLogger(name)
-    return logger
+    """Get the logger instance for ``name``, created once per name."""
+    if not name:
+        return logger
+    monitoring_logger = _loggers.get(name)
+    if monitoring_logger is None:
+        monitoring_logger = _loggers.setdefault(name, MonitoringLogger(name))
+    return monitoring_logger
@@ -0,0 +1,58 @@
+"""
+JSON encoding backend shared by API responses, log records and event streams.
+
+orjson is used when it is installed, otherwise the stdlib ``json`` module.
+``settings.JSON_BACKEND`` can force either one. Both backends produce compact
+UTF-8 output with non-ASCII characters kept as-is and non-string dict keys
+converted to strings, so callers get the same document from either. orjson
+also encodes datetimes, UUIDs, enums and dataclasses natively. The stdlib
+backend only does that when given ``default``.
+
+``FastJSONResponse`` renders with the selected backend and is the default
+response class of ``api_router``. Endpoints that return a ``FastJSONResponse``
+or pre-encoded bytes themselves also skip FastAPI's ``jsonable_encoder`` pass.
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+from fastapi.responses import JSONResponse
+
+from .config import settings
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+BACKENDS = ("auto", "orjson", "json")
+
+def _select_backend(name: str) -> str:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {name}")
+    if name == "auto":
+        return "orjson" if orjson is not None else "json"
+    if name == "orjson" and orjson is None:
+        raise ValueError("JSON_BACKEND is 'orjson' but orjson is not installed")
+    return name
+
+def _json_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=default).encode()
+
+def _orjson_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+
+backend = _select_backend(settings.JSON_BACKEND)
+
+if backend == "orjson":
+    dumps = _orjson_dumps
+    loads = orjson.loads
+else:
+    dumps = _json_dumps
+    loads = json.loads
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with the selected backend."""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,118 @@
+"""
+Async SQLAlchemy engine and session management for the inventory data layer.
+
+The engine is created on first use, so importing the app never opens a
+database connection. Plain ``postgresql://`` and ``sqlite://`` URLs are
+mapped to their async drivers; server databases get a bounded, pre-pinged
+connection pool whose checked-out connections are reported through the
+``DATABASE_CONNECTIONS`` gauge.
+"""
+
+import asyncio
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.exceptions import DatabaseConnectionError
+from app.core.logging import get_logger
+from app.monitoring.prometheus_metrics import DATABASE_CONNECTIONS
+from .models import Base
+
+logger = get_logger("database")
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker] = None
+_tables_ready = False
+# Serializes create_all; first-use callers otherwise race to create the same tables
+_tables_lock = asyncio.Lock()
+
+def async_database_url(url: str) -> str:
+    """Map a sync database URL to its async driver equivalent."""
+    scheme, sep, rest = url.partition("://")
+    return _ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+def create_engine(url: str) -> AsyncEngine:
+    """Create an async engine with pool settings suited to the backend."""
+    url = async_database_url(url)
+    
+    if url.startswith("sqlite"):
+        kwargs = {"connect_args": {"check_same_thread": False}}
+        if ":memory:" in url or url.endswith("://"):
+            # One shared connection, otherwise every session sees an empty database
+            kwargs["poolclass"] = StaticPool
+    else:
+        kwargs = {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": True,
+        }
+    
+    engine = create_async_engine(url, **kwargs)
+    
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DATABASE_CONNECTIONS.inc()
+    
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        DATABASE_CONNECTIONS.dec()
+    
+    return engine
+
+def get_engine() -> AsyncEngine:
+    """Return the process-wide engine, creating it on first use."""
+    global _engine, _session_factory
+    if _engine is None:
+        _engine = create_engine(settings.DATABASE_URL)
+        _session_factory = async_sessionmaker(_engine, expire_on_commit=False)
+    return _engine
+
+def pool_status() -> Optional[str]:
+    """Human-readable pool occupancy, or None before the engine exists."""
+    if _engine is None:
+        return None
+    return _engine.pool.status()
+
+async def init_models():
+    """Create missing tables once per process when DB_CREATE_TABLES is set."""
+    global _tables_ready
+    if _tables_ready or not settings.DB_CREATE_TABLES:
+        return
+    async with _tables_lock:
+        if _tables_ready:
+            return
+        async with get_engine().begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        _tables_ready = True
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency yielding a session bound to the shared pool."""
+    get_engine()
+    try:
+        await init_models()
+        async with _session_factory() as session:
+            yield session
+    except (OperationalError, OSError) as e:
+        logger.error("Database unavailable", error_message=str(e))
+        raise DatabaseConnectionError("Database unavailable", details={"error": type(e).__name__})
+
+async def dispose_engine():
+    """Close pooled connections on shutdown."""
+    global _engine, _session_factory, _tables_ready
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+        _session_factory = None
+        _tables_ready = False
@@ -0,0 +1,93 @@
+"""
+SQLAlchemy models for the inventory data layer.
+"""
+
+import uuid
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import Date, DateTime, Float, Index, Integer, String, func
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+def new_id() -> str:
+    return str(uuid.uuid4())
+
+class Base(DeclarativeBase):
+    pass
+
+class Product(Base):
+    __tablename__ = "products"
+    
+    product_id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_id)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    category: Mapped[str] = mapped_column(String(100), nullable=False, default="uncategorized")
+    price: Mapped[float] = mapped_column(Float, nullable=False)
+    rating: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    stock_quantity: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    
+    __table_args__ = (
+        # Keyset pagination order
+        Index("ix_products_name_product_id", "name", "product_id"),
+        Index("ix_products_category", "category"),
+    )
+
+class SaleEvent(Base):
+    __tablename__ = "sale_events"
+    
+    event_id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_id)
+    event_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    product_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True)
+    category: Mapped[str] = mapped_column(String(100), nullable=False)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    amount: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_sale_events_occurred_at", "occurred_at"),
+    )
+
+class User(Base):
+    __tablename__ = "users"
+    
+    user_id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_id)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    email: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    
+    __table_args__ = (
+        # Keyset pagination order
+        Index("ix_users_name_user_id", "name", "user_id"),
+    )
+
+class Expense(Base):
+    __tablename__ = "expenses"
+    
+    expense_id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_id)
+    category: Mapped[str] = mapped_column(String(100), nullable=False)
+    amount: Mapped[float] = mapped_column(Float, nullable=False)
+    incurred_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # Summary bucket, stored so the reconciliation GROUP BY is dialect-neutral
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_expenses_category_day", "category", "day"),
+    )
+
+class ExpenseCategorySummary(Base):
+    """Expense totals per category and day, maintained on every expense write."""
+    
+    __tablename__ = "expense_category_summaries"
+    
+    category: Mapped[str] = mapped_column(String(100), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    amount: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    expense_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+class SummaryCounter(Base):
+    """Named row counts (e.g. ``users``), maintained on every write."""
+    
+    __tablename__ = "summary_counters"
+    
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
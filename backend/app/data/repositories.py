@@ -0,0 +1,139 @@
+"""
+Query helpers for the inventory tables.
+
+List queries use keyset pagination: the cursor encodes the sort key of the
+last row returned and the next page starts strictly after it, so every page
+is an index range scan regardless of how deep the client pages.
+
+Writes to users and expenses also update their summary rows (see
+``summaries``) in the same transaction.
+"""
+
+import base64
+import json
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Expense, ExpenseCategorySummary, Product, User
+from .schemas import ExpenseCreate, ProductCreate, UserCreate
+from .summaries import USERS, bump_counter, bump_expense_summary, read_counter
+
+def encode_cursor(*key) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> list:
+    """Decode a cursor from ``encode_cursor``; raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(key, list):
+        raise ValueError("Invalid cursor")
+    return key
+
+class ProductRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def list_page(self, limit: int,
+                        cursor: Optional[str] = None) -> Tuple[List[Product], Optional[str]]:
+        """Return up to ``limit`` products ordered by name, and the next cursor."""
+        stmt = select(Product).order_by(Product.name, Product.product_id).limit(limit + 1)
+        
+        if cursor:
+            name, product_id = decode_cursor(cursor)
+            stmt = stmt.where(tuple_(Product.name, Product.product_id) > tuple_(name, product_id))
+        
+        products = list((await self.session.scalars(stmt)).all())
+        next_cursor = None
+        if len(products) > limit:
+            products = products[:limit]
+            last = products[-1]
+            next_cursor = encode_cursor(last.name, last.product_id)
+        return products, next_cursor
+    
+    async def get_many(self, product_ids: List[str]) -> List[Product]:
+        """Fetch products by id, in the order given."""
+        if not product_ids:
+            return []
+        stmt = select(Product).where(Product.product_id.in_(product_ids))
+        found = {product.product_id: product for product in await self.session.scalars(stmt)}
+        return [found[product_id] for product_id in product_ids if product_id in found]
+    
+    async def create(self, data: ProductCreate) -> Product:
+        product = Product(**data.model_dump())
+        self.session.add(product)
+        await self.session.commit()
+        return product
+
+class UserRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def list_page(self, limit: int,
+                        cursor: Optional[str] = None) -> Tuple[List[User], Optional[str]]:
+        """Return up to ``limit`` users ordered by name, and the next cursor."""
+        stmt = select(User).order_by(User.name, User.user_id).limit(limit + 1)
+        
+        if cursor:
+            name, user_id = decode_cursor(cursor)
+            stmt = stmt.where(tuple_(User.name, User.user_id) > tuple_(name, user_id))
+        
+        users = list((await self.session.scalars(stmt)).all())
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            last = users[-1]
+            next_cursor = encode_cursor(last.name, last.user_id)
+        return users, next_cursor
+    
+    async def count(self) -> int:
+        """Total users, from the maintained counter rather than COUNT(*)."""
+        return await read_counter(self.session, USERS)
+    
+    async def create(self, data: UserCreate) -> User:
+        user = User(**data.model_dump())
+        self.session.add(user)
+        await self.session.flush()
+        await bump_counter(self.session, USERS, 1)
+        await self.session.commit()
+        return user
+
+class ExpenseRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def summaries(self, category: Optional[str] = None, start: Optional[date] = None,
+                        end: Optional[date] = None) -> List[Tuple[str, date, float]]:
+        """(category, day, amount) totals, newest day first."""
+        stmt = select(
+            ExpenseCategorySummary.category, ExpenseCategorySummary.day, ExpenseCategorySummary.amount
+        ).order_by(
+            ExpenseCategorySummary.day.desc(), ExpenseCategorySummary.category
+        )
+        if category is not None:
+            stmt = stmt.where(ExpenseCategorySummary.category == category)
+        if start is not None:
+            stmt = stmt.where(ExpenseCategorySummary.day >= start)
+        if end is not None:
+            stmt = stmt.where(ExpenseCategorySummary.day <= end)
+        return [tuple(row) for row in await self.session.execute(stmt)]
+    
+    async def create(self, data: ExpenseCreate) -> Expense:
+        incurred_at = data.incurred_at or datetime.now(timezone.utc)
+        if incurred_at.tzinfo is not None:
+            # Stored as naive UTC, like the other DateTime columns
+            incurred_at = incurred_at.astimezone(timezone.utc).replace(tzinfo=None)
+        expense = Expense(
+            category=data.category, amount=data.amount,
+            incurred_at=incurred_at, day=incurred_at.date()
+        )
+        self.session.add(expense)
+        await self.session.flush()
+        await bump_expense_summary(self.session, expense.category, expense.day, expense.amount)
+        await self.session.commit()
+        return expense
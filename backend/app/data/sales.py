@@ -0,0 +1,359 @@
+"""
+Sales event ingestion.
+
+``POST /sales/events`` takes newline-delimited JSON, one event per line.
+Each line is validated with the shared ``validate_required_fields`` and
+``validate_metric_value`` helpers, and the valid events go into an in-memory
+buffer. A background task writes the buffer to the ``sale_events`` table in
+batches of ``batch_size`` rows, one transaction per batch. If the database
+is unreachable, the batch goes back on the buffer. Once the buffer is full,
+new submissions are rejected so that clients back off. Any other write error
+is blamed on the data. After ``max_attempts`` such failures, the batch is
+split in halves until the events that fail on their own are isolated. Those
+are dead-lettered, so one bad row cannot block everything behind it.
+
+Event timestamps must fall within ``max_event_age`` seconds before and
+``max_clock_skew`` seconds after the server clock. A millisecond epoch or a
+far-future value would otherwise open a bucket that evicts every real one
+from the tumbling windows.
+
+When events are accepted they are also added to tumbling-window totals
+(per minute, hour and day), which the dashboard reads without querying the
+database. The totals are kept per worker and cover the events that worker
+ingested.
+"""
+
+import asyncio
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from app.core.config import settings
+from app.core.exceptions import (
+    DatabaseConnectionError, ValidationError, validate_metric_value, validate_required_fields
+)
+from app.core.logging import get_logger
+from app.core.serialization import loads
+from app.monitoring.cardinality import SALES_VOLUME_GUARD
+from app.monitoring.prometheus_metrics import SALES_EVENTS_DEAD_LETTERED
+from .database import get_engine, init_models
+from .models import SaleEvent, new_id
+
+logger = get_logger("sales")
+
+PURCHASE, VISIT = "purchase", "visit"
+EVENT_TYPES = (PURCHASE, VISIT)
+
+# (event_type, product_id, category, quantity, amount, timestamp)
+Event = Tuple[str, Optional[str], str, int, float, float]
+Writer = Callable[[List[Event]], Awaitable[None]]
+
+# Write failures that say nothing about the events themselves
+UNAVAILABLE_ERRORS = (
+    OperationalError, InterfaceError, DatabaseConnectionError, OSError, asyncio.TimeoutError
+)
+
+def parse_event(line: bytes, now: float,
+                max_event_age: float = settings.SALES_MAX_EVENT_AGE_SECONDS,
+                max_clock_skew: float = settings.SALES_MAX_CLOCK_SKEW_SECONDS) -> Event:
+    """Parse and validate one NDJSON line; raises ValidationError."""
+    try:
+        data = loads(line)
+    except ValueError:
+        raise ValidationError("Invalid JSON")
+    if not isinstance(data, dict):
+        raise ValidationError("Event must be a JSON object")
+    
+    event_type = data.get("type", PURCHASE)
+    if event_type not in EVENT_TYPES:
+        raise ValidationError(f"type must be one of {', '.join(EVENT_TYPES)}", field="type")
+    
+    if event_type == PURCHASE:
+        validate_required_fields(data, ["category", "amount"])
+        amount = validate_metric_value(data["amount"], "amount")
+        quantity = validate_metric_value(data.get("quantity", 1), "quantity")
+    else:
+        validate_required_fields(data, ["category"])
+        amount = quantity = 0.0
+    
+    category = data["category"]
+    if not isinstance(category, str) or not category or len(category) > 100:
+        raise ValidationError("category must be a non-empty string of at most 100 characters", field="category")
+    product_id = data.get("productId")
+    if product_id is not None and not isinstance(product_id, str):
+        raise ValidationError("productId must be a string", field="productId")
+    
+    timestamp = data.get("timestamp")
+    if timestamp is None:
+        timestamp = now
+    else:
+        timestamp = validate_metric_value(timestamp, "timestamp")
+        if not now - max_event_age <= timestamp <= now + max_clock_skew:
+            raise ValidationError(
+                "timestamp must be Unix seconds within the accepted range of the server clock",
+                field="timestamp"
+            )
+    return event_type, product_id, category, int(quantity), amount, timestamp
+
+def parse_ndjson(body: bytes, now: Optional[float] = None,
+                 max_errors: int = 20) -> Tuple[List[Event], int, List[Dict[str, Any]]]:
+    """Parse an NDJSON body into valid events, the rejected count and the first errors."""
+    now = time.time() if now is None else now
+    events: List[Event] = []
+    rejected = 0
+    errors: List[Dict[str, Any]] = []
+    
+    for number, line in enumerate(body.split(b"\n"), 1):
+        if not line.strip():
+            continue
+        try:
+            events.append(parse_event(line, now))
+        except ValidationError as e:
+            rejected += 1
+            if len(errors) < max_errors:
+                errors.append({"line": number, "message": e.message})
+    return events, rejected, errors
+
+class TumblingWindow:
+    """Per-category totals in fixed, non-overlapping buckets of ``size`` seconds."""
+    
+    def __init__(self, size: float, retention: int):
+        self.size = size
+        self.retention = retention
+        # bucket index -> category -> [purchases, visits, units, revenue]
+        self._buckets: Dict[int, Dict[str, List[float]]] = {}
+        self._newest = 0
+    
+    def add(self, events: List[Event]):
+        size, buckets = self.size, self._buckets
+        oldest = self._newest - self.retention
+        for event_type, _, category, quantity, amount, timestamp in events:
+            index = int(timestamp // size)
+            if index <= oldest:
+                continue
+            bucket = buckets.get(index)
+            if bucket is None:
+                bucket = buckets[index] = {}
+                if index > self._newest:
+                    self._newest = index
+                    oldest = index - self.retention
+                    for stale in [key for key in buckets if key <= oldest]:
+                        del buckets[stale]
+            totals = bucket.get(category)
+            if totals is None:
+                totals = bucket[category] = [0, 0, 0, 0.0]
+            if event_type == PURCHASE:
+                totals[0] += 1
+                totals[2] += quantity
+                totals[3] += amount
+            else:
+                totals[1] += 1
+    
+    def totals(self, index: int) -> Dict[str, Any]:
+        """Totals of one bucket, overall and per category."""
+        by_category = {}
+        purchases = visits = units = 0
+        revenue = 0.0
+        for category, (c_purchases, c_visits, c_units, c_revenue) in self._buckets.get(index, {}).items():
+            purchases += c_purchases
+            visits += c_visits
+            units += c_units
+            revenue += c_revenue
+            by_category[category] = {
+                "purchases": c_purchases, "units": c_units, "revenue": round(c_revenue, 2)
+            }
+        return {
+            "start": datetime.fromtimestamp(index * self.size, timezone.utc).isoformat(),
+            "purchases": purchases,
+            "visits": visits,
+            "units": units,
+            "revenue": round(revenue, 2),
+            "conversion_rate": round(purchases / visits, 4) if visits else 0.0,
+            "by_category": by_category
+        }
+    
+    def current(self, now: Optional[float] = None) -> Dict[str, Any]:
+        now = time.time() if now is None else now
+        return self.totals(int(now // self.size))
+    
+    def series(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Totals of the retained buckets that saw events, newest first."""
+        indexes = sorted(self._buckets, reverse=True)[:limit]
+        return [self.totals(index) for index in indexes]
+
+async def database_writer(batch: List[Event]):
+    """Default writer: insert a batch into ``sale_events`` in one transaction."""
+    await init_models()
+    rows = [
+        {
+            "event_id": new_id(),
+            "event_type": event_type,
+            "product_id": product_id,
+            "category": category,
+            "quantity": quantity,
+            "amount": amount,
+            "occurred_at": datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None),
+        }
+        for event_type, product_id, category, quantity, amount, timestamp in batch
+    ]
+    async with get_engine().begin() as connection:
+        await connection.execute(insert(SaleEvent), rows)
+
+class SalesPipeline:
+    """Bounded buffer of sales events flushed to the store in batches."""
+    
+    def __init__(self, batch_size: int = 5000, flush_interval: float = 1.0,
+                 max_buffered: int = 200000, writer: Writer = database_writer,
+                 max_attempts: int = 5, dead_letter_size: int = 1000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.writer = writer
+        self.max_attempts = max_attempts
+        self.windows = {
+            "minute": TumblingWindow(60, 120),
+            "hour": TumblingWindow(3600, 48),
+            "day": TumblingWindow(86400, 31),
+        }
+        
+        self._buffer: List[Event] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        # Consecutive data-related failures of the batch at the head of the buffer
+        self._failures = 0
+        self.written = 0
+        # Most recent (event, error) pairs that could not be written
+        self.dead_letters: "deque[Tuple[Event, str]]" = deque(maxlen=dead_letter_size)
+    
+    @property
+    def buffered(self) -> int:
+        return len(self._buffer)
+    
+    def submit(self, events: List[Event]) -> bool:
+        """Buffer validated events; returns False when the buffer is full."""
+        self.start()
+        if len(self._buffer) + len(events) > self.max_buffered:
+            return False
+        self._buffer.extend(events)
+        
+        for window in self.windows.values():
+            window.add(events)
+        units: Dict[str, int] = defaultdict(int)
+        for event_type, _, category, quantity, _, _ in events:
+            if event_type == PURCHASE:
+                units[category] += quantity
+        for category, count in units.items():
+            SALES_VOLUME_GUARD.labels(product_category=category).inc(count)
+        
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+        return True
+    
+    def today(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Totals for the current UTC day."""
+        return self.windows["day"].current(now)
+    
+    async def flush(self):
+        """Write everything buffered, one transaction per batch."""
+        while self._buffer:
+            batch = self._buffer[:self.batch_size]
+            del self._buffer[:self.batch_size]
+            try:
+                await self.writer(batch)
+            except UNAVAILABLE_ERRORS as e:
+                # Put the batch back; the full-buffer check pushes back on clients
+                self._buffer[:0] = batch
+                logger.error("Sales batch write failed", error_message=str(e), events=len(batch))
+                return
+            except Exception as e:
+                self._failures += 1
+                if self._failures < self.max_attempts:
+                    self._buffer[:0] = batch
+                    logger.error(
+                        "Sales batch write failed", error_message=str(e), events=len(batch),
+                        attempt=self._failures
+                    )
+                    return
+                self._failures = 0
+                if not await self._write_isolating(batch):
+                    return
+                continue
+            self._failures = 0
+            self.written += len(batch)
+    
+    async def _write_isolating(self, batch: List[Event]) -> bool:
+        """
+        Write a batch that keeps failing by halves, dead-lettering the events
+        that fail on their own. Returns False, with the unwritten rest back on
+        the buffer, if the store becomes unavailable midway.
+        """
+        parts = [batch]
+        dropped = 0
+        error_message = ""
+        while parts:
+            part = parts.pop()
+            try:
+                await self.writer(part)
+            except UNAVAILABLE_ERRORS as e:
+                # parts is a stack: the next part to write is the last one
+                self._buffer[:0] = [event for rest in [part] + parts[::-1] for event in rest]
+                logger.error("Sales batch write failed", error_message=str(e), events=len(batch))
+                return False
+            except Exception as e:
+                if len(part) > 1:
+                    middle = len(part) // 2
+                    parts.extend((part[middle:], part[:middle]))
+                    continue
+                error_message = str(e)
+                self.dead_letters.append((part[0], error_message))
+                SALES_EVENTS_DEAD_LETTERED.inc()
+                dropped += 1
+                continue
+            self.written += len(part)
+        
+        if dropped:
+            logger.error(
+                "Dropped sales events that could not be written",
+                events=dropped, batch=len(batch), error_message=error_message
+            )
+        return True
+    
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+    
+    def start(self):
+        """Start the background flush task on the running loop, if not already running."""
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self):
+        """Stop the flush task and write what is still buffered."""
+        if self._task is not None:
+            # Not cancelled: wait_for can swallow a cancel that races the wakeup
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        if self._buffer:
+            logger.warning("Sales events not written before shutdown", pending=len(self._buffer))
+
+sales_pipeline = SalesPipeline(
+    batch_size=settings.SALES_BATCH_SIZE,
+    flush_interval=settings.SALES_FLUSH_INTERVAL,
+    max_buffered=settings.SALES_MAX_BUFFERED,
+    max_attempts=settings.SALES_WRITE_MAX_ATTEMPTS
+)
@@ -0,0 +1,56 @@
+"""
+Request and response schemas for the inventory API.
+
+Field names are camelCase on the wire to match the frontend's types.
+"""
+
+from datetime import date, datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.alias_generators import to_camel
+
+class CamelModel(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True, from_attributes=True)
+
+class ProductCreate(CamelModel):
+    name: str = Field(min_length=1, max_length=255)
+    price: float = Field(ge=0)
+    rating: Optional[float] = Field(default=None, ge=0, le=5)
+    stock_quantity: int = Field(ge=0)
+    category: str = Field(default="uncategorized", min_length=1, max_length=100)
+
+class ProductOut(CamelModel):
+    product_id: str
+    name: str
+    price: float
+    rating: Optional[float] = None
+    stock_quantity: int
+    category: str
+
+class UserCreate(CamelModel):
+    name: str = Field(min_length=1, max_length=255)
+    email: str = Field(min_length=3, max_length=255, pattern=r"^[^@\s]+@[^@\s]+$")
+
+class UserOut(CamelModel):
+    user_id: str
+    name: str
+    email: str
+
+class ExpenseCreate(CamelModel):
+    category: str = Field(min_length=1, max_length=100)
+    amount: float = Field(ge=0)
+    incurred_at: Optional[datetime] = None
+
+class ExpenseOut(CamelModel):
+    expense_id: str
+    category: str
+    amount: float
+    incurred_at: datetime
+
+class ExpenseByCategorySummaryOut(CamelModel):
+    expense_by_category_summary_id: str
+    category: str
+    # The frontend's ExpenseByCategorySummary declares amount as a string
+    amount: str
+    date: date
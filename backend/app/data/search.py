@@ -0,0 +1,263 @@
+"""
+In-memory product search.
+
+``ProductSearchIndex`` is an inverted index from the tokens of each product's
+name and category to the products containing them. Query terms match indexed
+tokens exactly, by prefix (binary search over the sorted vocabulary, so
+search-as-you-type works on partial words) or by substring (a trigram index
+over the vocabulary narrows the candidates). Products must match every query
+term and are ranked by match quality, name matches above category matches,
+then by name.
+
+Each worker keeps its own index. It is bulk-loaded from the database on the
+first search, updated in place by ``POST /products`` and topped up with
+products created elsewhere at most every ``SEARCH_SYNC_SECONDS``. The first
+build indexes into a fresh index in a worker thread and swaps it in, so the
+event loop is not blocked; searches arriving meanwhile wait for it.
+
+Product ids are random UUIDs, so syncs follow ``created_at`` instead. It is
+set when the inserting transaction starts and may have 1s resolution, so a
+product can commit after newer ones were indexed. Each incremental sync
+therefore re-reads ``SEARCH_SYNC_LOOKBACK_SECONDS`` before the newest
+indexed ``created_at`` and skips the ids it already knows.
+"""
+
+import asyncio
+import heapq
+import re
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from .models import Product
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+EXACT, PREFIX, SUBSTRING = 3.0, 2.0, 1.0
+FIELD_WEIGHTS = (("name", 2.0), ("category", 1.0))
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+def trigrams(token: str) -> Set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+class ProductSearchIndex:
+    """Inverted index with prefix and trigram matching over name and category."""
+    
+    # Attributes that hold the indexed documents, swapped in by a full build
+    _STATE = ("_ids", "_names", "_docs", "_order", "_postings", "_vocabulary",
+              "_known", "_trigrams")
+    
+    def __init__(self, max_expansions: int = 50):
+        self.max_expansions = max_expansions
+        
+        self._ids: List[str] = []
+        self._names: List[str] = []
+        self._docs: Dict[str, int] = {}
+        self._order: List[int] = []  # docs sorted by name
+        self._postings: Dict[str, Dict[str, Set[int]]] = {field: {} for field, _ in FIELD_WEIGHTS}
+        self._vocabulary: List[str] = []
+        self._known: Set[str] = set()
+        self._trigrams: Dict[str, Set[str]] = {}
+        
+        self._watermark: Optional[datetime] = None
+        self._synced_at = 0.0
+        self._sync_lock = asyncio.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def add(self, product_id: str, name: str, category: str):
+        """Index a product; re-adding a known product is a no-op."""
+        doc = self._add_doc(product_id, name, category)
+        if doc is not None:
+            self._insert_ordered(doc)
+    
+    def add_many(self, rows: Iterable[Tuple[str, str, str]]):
+        """Bulk-index ``(product_id, name, category)`` rows."""
+        added = [doc for doc in (self._add_doc(*row) for row in rows) if doc is not None]
+        if added:
+            self._order.extend(added)
+            names = self._names
+            self._order.sort(key=names.__getitem__)
+    
+    def _add_doc(self, product_id: str, name: str, category: str) -> Optional[int]:
+        if product_id in self._docs:
+            return None
+        doc = len(self._ids)
+        self._docs[product_id] = doc
+        self._ids.append(product_id)
+        self._names.append(name.lower())
+        
+        for field, text in (("name", name), ("category", category)):
+            postings = self._postings[field]
+            for token in tokenize(text):
+                if token not in self._known:
+                    self._add_token(token)
+                docs = postings.get(token)
+                if docs is None:
+                    docs = postings[token] = set()
+                docs.add(doc)
+        return doc
+    
+    def _insert_ordered(self, doc: int):
+        names, order = self._names, self._order
+        name = names[doc]
+        low, high = 0, len(order)
+        while low < high:
+            mid = (low + high) // 2
+            if names[order[mid]] <= name:
+                low = mid + 1
+            else:
+                high = mid
+        order.insert(low, doc)
+    
+    def _add_token(self, token: str):
+        self._known.add(token)
+        insort(self._vocabulary, token)
+        for trigram in trigrams(token):
+            self._trigrams.setdefault(trigram, set()).add(token)
+    
+    def _expand(self, term: str) -> Dict[str, float]:
+        """Vocabulary tokens matching ``term``, with their match weight."""
+        matches = {}
+        if term in self._known:
+            matches[term] = EXACT
+        
+        start = bisect_left(self._vocabulary, term)
+        for token in self._vocabulary[start:start + self.max_expansions + 1]:
+            if not token.startswith(term):
+                break
+            matches.setdefault(token, PREFIX)
+        
+        if len(term) >= 3 and len(matches) < self.max_expansions:
+            candidates = None
+            for trigram in trigrams(term):
+                tokens = self._trigrams.get(trigram)
+                if not tokens:
+                    candidates = None
+                    break
+                candidates = tokens if candidates is None else candidates & tokens
+            for token in sorted(candidates or ()):
+                if len(matches) >= self.max_expansions:
+                    break
+                if term in token:
+                    matches.setdefault(token, SUBSTRING)
+        return matches
+    
+    def _term_tiers(self, term: str) -> Dict[float, Set[int]]:
+        """Docs matching ``term`` grouped by their best score for it."""
+        tiers: Dict[float, Set[int]] = {}
+        for token, weight in self._expand(term).items():
+            for field, field_weight in FIELD_WEIGHTS:
+                docs = self._postings[field].get(token)
+                if docs:
+                    score = weight * field_weight
+                    tiers[score] = tiers[score] | docs if score in tiers else docs
+        
+        # A doc keeps only its best score
+        seen: Set[int] = set()
+        disjoint = {}
+        for score in sorted(tiers, reverse=True):
+            docs = tiers[score] - seen if seen else tiers[score]
+            if docs:
+                disjoint[score] = docs
+                seen = seen | docs
+        return disjoint
+    
+    def search(self, query: str, limit: int = 50, offset: int = 0) -> Tuple[List[str], int]:
+        """Return one page of ranked product ids and the total match count."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return [], 0
+        
+        # Set algebra over score tiers instead of per-document scoring
+        groups = self._term_tiers(terms[0])
+        for term in terms[1:]:
+            tiers = self._term_tiers(term)
+            combined: Dict[float, Set[int]] = {}
+            for score, docs in groups.items():
+                for term_score, term_docs in tiers.items():
+                    matched = docs & term_docs
+                    if matched:
+                        total = score + term_score
+                        combined[total] = combined[total] | matched if total in combined else matched
+            groups = combined
+            if not groups:
+                return [], 0
+        
+        total = sum(len(docs) for docs in groups.values())
+        needed = offset + limit
+        ranked: List[int] = []
+        for score in sorted(groups, reverse=True):
+            ranked.extend(self._first_by_name(groups[score], needed - len(ranked)))
+            if len(ranked) >= needed:
+                break
+        return [self._ids[doc] for doc in ranked[offset:needed]], total
+    
+    def _first_by_name(self, docs: Set[int], count: int) -> List[int]:
+        """The ``count`` docs of ``docs`` that come first by name."""
+        if len(docs) <= count:
+            return sorted(docs, key=self._names.__getitem__)
+        
+        # Walking the global name order costs about count * N / len(docs)
+        # membership tests; sorting the group costs len(docs) log len(docs).
+        if count * len(self._order) < len(docs) * len(docs):
+            found = []
+            for doc in self._order:
+                if doc in docs:
+                    found.append(doc)
+                    if len(found) == count:
+                        break
+            return found
+        return heapq.nsmallest(count, docs, key=self._names.__getitem__)
+    
+    def _fresh(self) -> bool:
+        return bool(self._synced_at) and time.monotonic() - self._synced_at < settings.SEARCH_SYNC_SECONDS
+    
+    async def sync(self, session: AsyncSession, force: bool = False):
+        """Index products created since the last sync, at most every SEARCH_SYNC_SECONDS."""
+        if not force and self._fresh():
+            return
+        async with self._sync_lock:
+            # Callers that waited on an in-flight sync reuse its result
+            if not force and self._fresh():
+                return
+            
+            watermark = self._watermark
+            stmt = select(Product.product_id, Product.name, Product.category, Product.created_at)
+            if watermark is not None:
+                # Known ids in the overlap are skipped by add_many()
+                lookback = timedelta(seconds=settings.SEARCH_SYNC_LOOKBACK_SECONDS)
+                stmt = stmt.where(Product.created_at >= watermark - lookback)
+            
+            # Indexed in one add_many: add() inserts into the name order one row
+            # at a time, which makes a full build quadratic
+            rows: List[Tuple[str, str, str]] = []
+            result = await session.stream(stmt.execution_options(yield_per=10000))
+            async for partition in result.partitions():
+                for product_id, name, category, created_at in partition:
+                    rows.append((product_id, name, category))
+                    if created_at is not None and (watermark is None or created_at > watermark):
+                        watermark = created_at
+            
+            if self._watermark is None:
+                # A full build takes seconds on a large catalog; build off the
+                # loop into a fresh index, then swap its documents in
+                built = ProductSearchIndex(self.max_expansions)
+                await run_in_threadpool(built.add_many, rows)
+                for name in self._STATE:
+                    setattr(self, name, getattr(built, name))
+            else:
+                self.add_many(rows)
+            self._watermark = watermark
+            self._synced_at = time.monotonic()
+
+product_search = ProductSearchIndex(max_expansions=settings.SEARCH_MAX_EXPANSIONS)
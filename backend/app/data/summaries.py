@@ -0,0 +1,170 @@
+"""
+Incrementally maintained summary tables.
+
+``/expenses`` and the user count read precomputed rows instead of grouping
+the base tables on every request. Each write that inserts an expense or a
+user also bumps its summary row in the same transaction, with an atomic
+``INSERT ... ON CONFLICT DO UPDATE SET x = x + delta``. Concurrent writers
+from any worker therefore never overwrite each other's increments, and a
+read costs one scan of the summary table regardless of how many base rows
+there are.
+
+A background reconciler repairs any drift, for example from rows written
+outside the API or from a failed deploy. It computes the difference between
+the base tables and the summaries in a single statement, so both sides come
+from one snapshot. It then applies that difference as another increment, so
+writes that commit during the repair are not lost.
+"""
+
+import asyncio
+import time
+from datetime import date
+from typing import Dict, Optional
+
+from sqlalchemy import delete, func, literal, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.monitoring.prometheus_metrics import SUMMARY_DRIFT_REPAIRS
+from .database import get_engine, init_models
+from .models import Expense, ExpenseCategorySummary, SummaryCounter, User
+
+logger = get_logger("summaries")
+
+USERS = "users"
+
+# Amounts are floats; smaller differences are rounding, not drift
+AMOUNT_TOLERANCE = 0.005
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def _insert(executor, table):
+    # AsyncConnection exposes the dialect, AsyncSession only through its bind
+    dialect = (getattr(executor, "dialect", None) or executor.bind.dialect).name
+    try:
+        return _INSERTS[dialect](table)
+    except KeyError:
+        raise NotImplementedError(f"Summary upserts are not supported on {dialect}")
+
+def _expense_upsert(executor):
+    stmt = _insert(executor, ExpenseCategorySummary)
+    return stmt.on_conflict_do_update(
+        index_elements=["category", "day"],
+        set_={
+            "amount": ExpenseCategorySummary.amount + stmt.excluded.amount,
+            "expense_count": ExpenseCategorySummary.expense_count + stmt.excluded.expense_count,
+        }
+    )
+
+async def bump_expense_summary(executor, category: str, day: date,
+                               amount: float, count: int = 1):
+    """Add ``amount`` and ``count`` to the (category, day) summary row."""
+    await executor.execute(
+        _expense_upsert(executor),
+        {"category": category, "day": day, "amount": amount, "expense_count": count}
+    )
+
+async def bump_counter(executor, name: str, delta: int = 1):
+    """Add ``delta`` to the named counter row."""
+    stmt = _insert(executor, SummaryCounter).values(name=name, value=delta)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"value": SummaryCounter.value + stmt.excluded.value}
+    )
+    await executor.execute(stmt)
+
+async def read_counter(session: AsyncSession, name: str) -> int:
+    value = await session.scalar(select(SummaryCounter.value).where(SummaryCounter.name == name))
+    return value or 0
+
+class SummaryReconciler:
+    """Periodically repairs drift between the base tables and their summaries."""
+    
+    def __init__(self, interval_seconds: float = 300.0):
+        self.interval_seconds = interval_seconds
+        self.last_run: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def reconcile(self) -> Dict[str, int]:
+        """Repair all summaries once; returns the number of rows repaired per summary."""
+        await init_models()
+        async with get_engine().begin() as connection:
+            expenses = await self._reconcile_expenses(connection)
+            users = await self._reconcile_counter(connection, USERS, User)
+        self.last_run = time.time()
+        
+        repaired = {"expense_category": expenses, USERS: users}
+        for summary, rows in repaired.items():
+            if rows:
+                SUMMARY_DRIFT_REPAIRS.labels(summary=summary).inc(rows)
+                logger.warning("Repaired summary drift", summary=summary, rows=rows)
+        return repaired
+    
+    async def _reconcile_expenses(self, connection: AsyncConnection) -> int:
+        # base rows minus summary rows, grouped: anything non-zero is drift
+        combined = union_all(
+            select(
+                Expense.category, Expense.day,
+                Expense.amount.label("amount"), literal(1).label("expense_count")
+            ),
+            select(
+                ExpenseCategorySummary.category, ExpenseCategorySummary.day,
+                (-ExpenseCategorySummary.amount).label("amount"),
+                (-ExpenseCategorySummary.expense_count).label("expense_count")
+            )
+        ).subquery()
+        amount = func.sum(combined.c.amount)
+        count = func.sum(combined.c.expense_count)
+        drift = (
+            select(combined.c.category, combined.c.day, amount, count)
+            .group_by(combined.c.category, combined.c.day)
+            .having((func.abs(amount) > AMOUNT_TOLERANCE) | (count != 0))
+        )
+        
+        rows = (await connection.execute(drift)).all()
+        if rows:
+            await connection.execute(_expense_upsert(connection), [
+                {"category": category, "day": day, "amount": amount_drift, "expense_count": count_drift}
+                for category, day, amount_drift, count_drift in rows
+            ])
+            await connection.execute(
+                delete(ExpenseCategorySummary).where(ExpenseCategorySummary.expense_count <= 0)
+            )
+        return len(rows)
+    
+    async def _reconcile_counter(self, connection: AsyncConnection, name: str, model) -> int:
+        stored = select(SummaryCounter.value).where(SummaryCounter.name == name).scalar_subquery()
+        drift = await connection.scalar(
+            select(select(func.count()).select_from(model).scalar_subquery() - func.coalesce(stored, 0))
+        )
+        if drift:
+            await bump_counter(connection, name, drift)
+            return 1
+        return 0
+    
+    async def _run(self):
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.warning("Summary reconciliation failed", error_message=str(e))
+            await asyncio.sleep(self.interval_seconds)
+    
+    def start(self):
+        """Start the background reconciliation task on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self):
+        """Cancel the background reconciliation task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+summary_reconciler = SummaryReconciler(interval_seconds=settings.SUMMARY_RECONCILE_SECONDS)
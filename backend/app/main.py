@@ -1,22 +1,70 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from app.api.v1.api import api_router
 from app.core.config import settings
-from app.core.logging import get_logger
+from app.core.logging import configure_logging, get_logger, shutdown_logging
 from app.core.exceptions import (
     MonitoringException,
     monitoring_exception_handler,
     http_exception_handler,
     general_exception_handler
 )
-from app.monitoring.middleware import PrometheusMiddleware
+from app.monitoring.middleware import PrometheusASGIMiddleware
+from app.monitoring.multiprocess import cleanup_dead_workers
+from app.monitoring.aggregator import dashboard_aggregator
+from app.monitoring.system_metrics import system_sampler
+from app.monitoring.loop_monitor import loop_monitor
+from app.monitoring.alert_queue import alert_queue
+from app.monitoring.inventory_exporter import inventory_exporter
+from app.monitoring.aws_collector import aws_collector
+from app.monitoring.aws_snapshot import aws_snapshot_store
+from app.monitoring.health import health_monitor
+from app.data.database import dispose_engine
+from app.data.sales import sales_pipeline
+from app.data.summaries import summary_reconciler
 
 logger = get_logger("main")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open log files before serving so the first request does not pay for it
+    configure_logging()
+    dead_workers = cleanup_dead_workers()
+    if dead_workers:
+        logger.info("Removed metric files of dead workers", pids=dead_workers)
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    system_sampler.start()
+    dashboard_aggregator.start()
+    alert_queue.start()
+    inventory_exporter.start()
+    sales_pipeline.start()
+    summary_reconciler.start()
+    if settings.AWS_COLLECTOR_ENABLED:
+        aws_snapshot_store.load()
+        aws_collector.start()
+    health_monitor.start()
+    yield
+    await health_monitor.stop()
+    await aws_collector.stop()
+    await summary_reconciler.stop()
+    await sales_pipeline.stop()
+    await inventory_exporter.stop()
+    await alert_queue.stop()
+    await dashboard_aggregator.stop()
+    await system_sampler.stop()
+    await loop_monitor.stop()
+    await dispose_engine()
+    # Flush queued log records before the worker exits
+    shutdown_logging()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    description="Monitoring and Observability Platform API"
+    description="Monitoring and Observability Platform API",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -25,9 +73,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
-app.add_middleware(PrometheusMiddleware)
+app.add_middleware(PrometheusASGIMiddleware)
 
 # Add exception handlers
 app.add_exception_handler(MonitoringException, monitoring_exception_handler)
@@ -43,5 +92,6 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    logger.info("Health check endpoint accessed")
-    return {"status": "healthy", "service": "monitoring-api"}
+    # Served from the last probe round, so frequent probes stay cheap
+    status_code, body = health_monitor.report()
+    return Response(body, status_code=status_code, media_type="application/json")
@@ -0,0 +1,184 @@
+"""
+Dashboard aggregation engine.
+
+A background task samples the Prometheus metrics on a fixed tick, keeps the
+cumulative values in fixed-size ring buffers covering the rolling window,
+and derives request rate and error rate from the window deltas; p95 latency
+comes from the streaming latency tracker, which the tick also refreshes, and
+the system block is the system sampler's latest sample. The dashboard
+endpoint only reads the last precomputed snapshot, so polling costs the same
+regardless of how much traffic the window covers. The JSON encoding of a
+snapshot is also cached, so polls between two ticks reuse the same bytes.
+
+``total_users`` is the maintained ``users`` summary counter, re-read every
+``users_refresh_seconds`` rather than on every tick, and ``null`` until the
+first read succeeds. ``active_users`` is the number of requests in flight.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.serialization import dumps
+from app.data.database import get_engine, init_models
+from app.data.sales import sales_pipeline
+from app.data.summaries import USERS, read_counter
+from .prometheus_metrics import (
+    REQUEST_COUNT, ERROR_COUNT, ACTIVE_CONNECTIONS
+)
+from .ringbuffer import RingBuffer
+from .quantiles import latency_tracker
+from .system_metrics import system_sampler
+
+logger = get_logger("aggregator")
+
+def _sample_sum(metric, suffix: str = "", **match) -> float:
+    """Sum the samples of a metric, optionally filtered by label prefix."""
+    total = 0.0
+    for family in metric.collect():
+        for sample in family.samples:
+            if suffix and not sample.name.endswith(suffix):
+                continue
+            if all(sample.labels.get(key, "").startswith(value) for key, value in match.items()):
+                total += sample.value
+    return total
+
+class DashboardAggregator:
+    """Maintains rolling windows of live metrics and a precomputed snapshot."""
+    
+    def __init__(self, tick_seconds: float = 1.0, window_seconds: float = 60.0,
+                 history_size: int = 300, users_refresh_seconds: float = 30.0):
+        self.tick_seconds = tick_seconds
+        self.window_seconds = window_seconds
+        self.users_refresh_seconds = users_refresh_seconds
+        self.total_users: Optional[int] = None
+        self._users_read_at: Optional[float] = None
+        
+        window = max(2, int(round(window_seconds / tick_seconds)) + 1)
+        
+        # Cumulative samples over the window
+        self._timestamps = RingBuffer(window)
+        self._requests = RingBuffer(window)
+        self._errors = RingBuffer(window)
+        
+        # Derived series, one point per tick
+        self.request_rate = RingBuffer(history_size)
+        self.response_time_p95 = RingBuffer(history_size)
+        self.error_rate = RingBuffer(history_size)
+        
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot_json: Optional[bytes] = None
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._task: Optional[asyncio.Task] = None
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the latest precomputed dashboard payload."""
+        if self._snapshot is None:
+            self.tick()
+        return self._snapshot
+    
+    def snapshot_json(self) -> bytes:
+        """The latest snapshot as JSON, encoded at most once per tick."""
+        encoded = self._snapshot_json
+        if encoded is None:
+            encoded = self._snapshot_json = dumps(self.snapshot())
+        return encoded
+    
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """Call ``listener`` with every new snapshot."""
+        self._listeners.append(listener)
+    
+    def tick(self, now: Optional[float] = None):
+        """Sample the metrics once and rebuild the snapshot."""
+        now = time.monotonic() if now is None else now
+        
+        requests = _sample_sum(REQUEST_COUNT, "_total")
+        server_errors = _sample_sum(REQUEST_COUNT, "_total", status="5")
+        exceptions = _sample_sum(ERROR_COUNT, "_total")
+        
+        self._timestamps.append(now)
+        self._requests.append(requests + exceptions)
+        self._errors.append(server_errors + exceptions)
+        
+        elapsed = self._timestamps.latest() - self._timestamps.oldest()
+        window_requests = self._requests.latest() - self._requests.oldest()
+        window_errors = self._errors.latest() - self._errors.oldest()
+        
+        latency_tracker.refresh(now)
+        
+        request_rate = window_requests / elapsed if elapsed > 0 else 0.0
+        p95 = latency_tracker.quantiles[0.95]
+        error_rate = window_errors / window_requests if window_requests > 0 else 0.0
+        
+        self.request_rate.append(request_rate)
+        self.response_time_p95.append(p95)
+        self.error_rate.append(error_rate)
+        
+        sales_today = sales_pipeline.today()
+        
+        self._snapshot_json = None
+        self._snapshot = {
+            "system_metrics": system_sampler.latest(),
+            "application_metrics": {
+                "request_rate": round(request_rate, 3),
+                "response_time_p95": round(p95, 4),
+                "error_rate": round(error_rate, 4),
+                "active_users": int(_sample_sum(ACTIVE_CONNECTIONS))
+            },
+            "business_metrics": {
+                "total_users": self.total_users,
+                "revenue_today": sales_today["revenue"],
+                "conversion_rate": sales_today["conversion_rate"]
+            }
+        }
+        
+        for listener in self._listeners:
+            listener(self._snapshot)
+    
+    async def refresh_users(self):
+        """Read the total user count from its summary counter."""
+        await init_models()
+        async with AsyncSession(get_engine()) as session:
+            self.total_users = await read_counter(session, USERS)
+    
+    async def _run(self):
+        while True:
+            now = time.monotonic()
+            if self._users_read_at is None or now - self._users_read_at >= self.users_refresh_seconds:
+                # Also advanced on failure, so an unreachable database is retried at the same pace
+                self._users_read_at = now
+                try:
+                    await self.refresh_users()
+                except Exception as e:
+                    logger.warning("Dashboard user count refresh failed", error_message=str(e))
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error("Dashboard aggregation tick failed", error_message=str(e))
+            await asyncio.sleep(self.tick_seconds)
+    
+    def start(self):
+        """Start the background tick task on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self):
+        """Cancel the background tick task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+dashboard_aggregator = DashboardAggregator(
+    tick_seconds=settings.DASHBOARD_TICK_SECONDS,
+    window_seconds=settings.DASHBOARD_WINDOW_SECONDS,
+    history_size=settings.DASHBOARD_HISTORY_SIZE,
+    users_refresh_seconds=settings.DASHBOARD_USERS_REFRESH_SECONDS
+)
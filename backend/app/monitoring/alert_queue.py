@@ -0,0 +1,210 @@
+"""
+Asynchronous AlertManager webhook ingestion.
+
+The webhook endpoint only validates and enqueues the payload, so AlertManager
+gets an immediate response and has no reason to retry during an alert storm.
+A bounded pool of worker tasks then processes the alerts. An alert is
+skipped when its status matches the last status recorded for its fingerprint
+within the dedup window, so only repeats of the current state are dropped
+and firing -> resolved -> firing always gets through. The remaining alerts
+go to the notifier in batches.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.exceptions import ValidationError, validate_required_fields
+from app.core.logging import get_logger
+from .prometheus_metrics import (
+    API_CALLS, ALERTS_RECEIVED, ALERTS_DEDUPLICATED, ALERT_QUEUE_DEPTH,
+    ALERT_PROCESSING_LATENCY
+)
+
+logger = get_logger("alerts")
+
+Notifier = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
+def validate_alert_payload(payload: Any) -> List[Dict[str, Any]]:
+    """Validate an AlertManager webhook payload and return its alerts."""
+    if not isinstance(payload, dict):
+        raise ValidationError("Webhook payload must be a JSON object")
+    validate_required_fields(payload, ["alerts"])
+    
+    alerts = payload["alerts"]
+    if not isinstance(alerts, list):
+        raise ValidationError("'alerts' must be a list", field="alerts")
+    for alert in alerts:
+        if not isinstance(alert, dict) or not isinstance(alert.get("labels", {}), dict):
+            raise ValidationError("Each alert must be an object with a 'labels' object", field="alerts")
+    return alerts
+
+def alert_fingerprint(alert: Dict[str, Any]) -> str:
+    """AlertManager's fingerprint, or a stable hash of the labels if absent."""
+    fingerprint = alert.get("fingerprint")
+    if fingerprint:
+        return fingerprint
+    labels = json.dumps(alert.get("labels", {}), sort_keys=True)
+    return hashlib.sha1(labels.encode()).hexdigest()[:16]
+
+async def log_notifier(batch: List[Dict[str, Any]]):
+    """Default notifier: one log line per batch."""
+    # Here you could integrate with external systems:
+    # - Send to Slack
+    # - Create JIRA tickets
+    # - Update status pages
+    # - Send SMS notifications
+    logger.info(
+        f"Alert notification batch: {len(batch)} alerts",
+        alerts=[alert.get("labels", {}).get("alertname", "unknown") for alert in batch]
+    )
+
+class AlertIngestQueue:
+    """Bounded queue of webhook payloads drained by a pool of worker tasks."""
+    
+    def __init__(self, max_size: int = 1000, workers: int = 4,
+                 dedup_window: float = 300.0, dedup_max_keys: int = 10000,
+                 batch_size: int = 50, batch_interval: float = 2.0,
+                 notifier: Notifier = log_notifier):
+        self.max_size = max_size
+        self.workers = workers
+        self.dedup_window = dedup_window
+        self.dedup_max_keys = dedup_max_keys
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.notifier = notifier
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # fingerprint -> (last recorded status, when it was recorded)
+        self._seen: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._batch: List[Dict[str, Any]] = []
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+    
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+    
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """Call ``listener`` with every alert that survives deduplication."""
+        self._listeners.append(listener)
+    
+    def submit(self, alerts: List[Dict[str, Any]]) -> bool:
+        """Enqueue validated alerts; returns False when the queue is full."""
+        self.start()
+        try:
+            self._queue.put_nowait((time.monotonic(), alerts))
+        except asyncio.QueueFull:
+            return False
+        ALERT_QUEUE_DEPTH.set(self._queue.qsize())
+        return True
+    
+    def start(self):
+        """Start the worker pool on the running loop, if not already running."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(loop.create_task(self._flush_periodically()))
+    
+    async def stop(self, timeout: float = 5.0):
+        """Drain queued payloads (up to ``timeout``), flush, then stop the workers."""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Alert queue not drained before shutdown", pending=self.depth)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._flush()
+    
+    async def _worker(self):
+        while True:
+            enqueued_at, alerts = await self._queue.get()
+            try:
+                for alert in alerts:
+                    await self._process(alert)
+            except Exception as e:
+                logger.error("Error processing alerts", error_message=str(e))
+            finally:
+                self._queue.task_done()
+                ALERT_QUEUE_DEPTH.set(self._queue.qsize())
+                ALERT_PROCESSING_LATENCY.observe(time.monotonic() - enqueued_at)
+    
+    async def _process(self, alert: Dict[str, Any]):
+        labels = alert.get("labels", {})
+        alert_name = labels.get("alertname", "unknown")
+        severity = labels.get("severity", "unknown")
+        status = alert.get("status", "unknown")
+        
+        ALERTS_RECEIVED.labels(status=status).inc()
+        API_CALLS.labels(service="webhook", endpoint="/webhook").inc()
+        
+        if self._is_duplicate(alert_fingerprint(alert), status):
+            ALERTS_DEDUPLICATED.inc()
+            return
+        
+        logger.info(
+            f"Alert: {alert_name}, Severity: {severity}, Status: {status}",
+            alert_name=alert_name,
+            alert_severity=severity,
+            alert_status=status
+        )
+        if severity == "critical" and status == "firing":
+            logger.critical(f"CRITICAL ALERT: {alert_name}")
+        
+        for listener in self._listeners:
+            listener(alert)
+        
+        self._batch.append(alert)
+        if len(self._batch) >= self.batch_size:
+            await self._flush()
+    
+    def _is_duplicate(self, fingerprint: str, status: str) -> bool:
+        now = time.monotonic()
+        seen = self._seen
+        
+        # Entries are in recorded order, so expired ones are at the front
+        while seen:
+            _, (_, recorded_at) = next(iter(seen.items()))
+            if now - recorded_at < self.dedup_window and len(seen) < self.dedup_max_keys:
+                break
+            seen.popitem(last=False)
+        
+        last = seen.get(fingerprint)
+        if last is not None and last[0] == status:
+            return True
+        seen[fingerprint] = (status, now)
+        seen.move_to_end(fingerprint)
+        return False
+    
+    async def _flush(self):
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        try:
+            await self.notifier(batch)
+        except Exception as e:
+            logger.error("Alert notification failed", error_message=str(e), alerts=len(batch))
+    
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.batch_interval)
+            await self._flush()
+
+alert_queue = AlertIngestQueue(
+    max_size=settings.ALERT_QUEUE_MAX_SIZE,
+    workers=settings.ALERT_WORKERS,
+    dedup_window=settings.ALERT_DEDUP_WINDOW_SECONDS,
+    dedup_max_keys=settings.ALERT_DEDUP_MAX_KEYS,
+    batch_size=settings.ALERT_NOTIFY_BATCH_SIZE,
+    batch_interval=settings.ALERT_NOTIFY_INTERVAL_SECONDS
+)
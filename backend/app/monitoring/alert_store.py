@@ -0,0 +1,256 @@
+"""
+In-memory store of AlertManager alert state.
+
+Alerts are keyed by fingerprint. Secondary indexes map each value of the
+``alertname``, ``severity`` and ``team`` labels to the fingerprints carrying
+it, and per-severity counts of firing alerts are maintained on every
+transition, so queries touch only the matching alerts. Resolved alerts are
+kept for a retention period in resolution order and evicted from the front.
+
+A firing alert whose resolve never arrives must not stay forever. It is
+resolved by the store once its ``endsAt`` has passed, or once AlertManager
+has not re-sent it for ``firing_stale_after`` seconds. Beyond ``firing_max``
+firing alerts, the least recently updated ones are dropped.
+"""
+
+import heapq
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from .alert_queue import alert_queue, alert_fingerprint
+
+INDEXED_LABELS = ("alertname", "severity", "team")
+
+FIRING = "firing"
+RESOLVED = "resolved"
+
+def parse_ends_at(value: Optional[str]) -> Optional[float]:
+    """Unix time of an AlertManager ``endsAt``, or None when unset or unparseable."""
+    if not value:
+        return None
+    try:
+        ends_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    # Firing alerts without an end carry the zero time 0001-01-01T00:00:00Z
+    if ends_at.year <= 1 or ends_at.tzinfo is None:
+        return None
+    return ends_at.timestamp()
+
+class AlertRecord:
+    """Current state of one alert."""
+    
+    __slots__ = ("fingerprint", "status", "labels", "annotations",
+                 "starts_at", "ends_at", "ends_at_ts", "updated_at")
+    
+    def __init__(self, fingerprint: str, labels: Dict[str, str]):
+        self.fingerprint = fingerprint
+        self.labels = labels
+        self.status: Optional[str] = None
+        self.annotations: Dict[str, str] = {}
+        self.starts_at: Optional[str] = None
+        self.ends_at: Optional[str] = None
+        self.ends_at_ts: Optional[float] = None
+        self.updated_at = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "status": self.status,
+            "labels": self.labels,
+            "annotations": self.annotations,
+            "starts_at": self.starts_at,
+            "ends_at": self.ends_at,
+            "updated_at": self.updated_at,
+        }
+
+class AlertStore:
+    """Firing and recently resolved alerts with label indexes."""
+    
+    def __init__(self, resolved_retention: float = 3600.0, resolved_max: int = 10000,
+                 firing_stale_after: float = 16200.0, firing_max: int = 10000):
+        self.resolved_retention = resolved_retention
+        self.resolved_max = resolved_max
+        self.firing_stale_after = firing_stale_after
+        self.firing_max = firing_max
+        
+        self._alerts: Dict[str, AlertRecord] = {}
+        self._firing: Dict[str, None] = {}  # insertion-ordered set
+        # Firing fingerprints, least recently updated first
+        self._firing_updated: "OrderedDict[str, float]" = OrderedDict()
+        # (endsAt, fingerprint) of firing alerts; entries made stale by later
+        # updates are skipped when they reach the top
+        self._firing_ends: List[Tuple[float, str]] = []
+        self._resolved: "OrderedDict[str, float]" = OrderedDict()
+        self._index: Dict[str, Dict[str, Set[str]]] = {label: {} for label in INDEXED_LABELS}
+        self._firing_by_severity: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self._alerts)
+    
+    def upsert(self, alert: Dict[str, Any], now: Optional[float] = None):
+        """Apply one AlertManager alert to the store."""
+        now = time.time() if now is None else now
+        fingerprint = alert_fingerprint(alert)
+        labels = alert.get("labels", {})
+        status = RESOLVED if alert.get("status") == RESOLVED else FIRING
+        
+        record = self._alerts.get(fingerprint)
+        if record is None:
+            record = self._alerts[fingerprint] = AlertRecord(fingerprint, labels)
+            self._index_add(record)
+        
+        self._transition(record, status, now)
+        record.annotations = alert.get("annotations", record.annotations)
+        record.starts_at = alert.get("startsAt", record.starts_at)
+        if "endsAt" in alert:
+            record.ends_at = alert["endsAt"]
+            record.ends_at_ts = parse_ends_at(record.ends_at)
+        record.updated_at = now
+        
+        if status == FIRING:
+            self._firing_updated[fingerprint] = now
+            self._firing_updated.move_to_end(fingerprint)
+            if record.ends_at_ts is not None:
+                heapq.heappush(self._firing_ends, (record.ends_at_ts, fingerprint))
+        
+        self.evict(now)
+    
+    def _transition(self, record: AlertRecord, status: str, now: float):
+        if record.status == status:
+            return
+        severity = record.labels.get("severity", "unknown")
+        
+        if record.status == FIRING:
+            del self._firing[record.fingerprint]
+            del self._firing_updated[record.fingerprint]
+            self._firing_by_severity[severity] -= 1
+        elif record.status == RESOLVED:
+            del self._resolved[record.fingerprint]
+        
+        if status == FIRING:
+            self._firing[record.fingerprint] = None
+            self._firing_by_severity[severity] = self._firing_by_severity.get(severity, 0) + 1
+        else:
+            self._resolved[record.fingerprint] = now
+        record.status = status
+    
+    def evict(self, now: Optional[float] = None):
+        """
+        Resolve firing alerts past their ``endsAt`` or not updated for
+        ``firing_stale_after``, drop the least recently updated firing alerts
+        beyond ``firing_max``, then drop resolved alerts past retention or
+        beyond their size cap.
+        """
+        now = time.time() if now is None else now
+        
+        ends = self._firing_ends
+        while ends and ends[0][0] <= now:
+            ends_at, fingerprint = heapq.heappop(ends)
+            record = self._alerts.get(fingerprint)
+            if record is not None and record.status == FIRING and record.ends_at_ts == ends_at:
+                self._transition(record, RESOLVED, now)
+        
+        updated = self._firing_updated
+        while updated:
+            fingerprint, updated_at = next(iter(updated.items()))
+            if now - updated_at < self.firing_stale_after:
+                break
+            self._transition(self._alerts[fingerprint], RESOLVED, now)
+        
+        while len(updated) > self.firing_max:
+            fingerprint = next(iter(updated))
+            record = self._alerts.pop(fingerprint)
+            self._transition(record, RESOLVED, now)
+            del self._resolved[fingerprint]
+            self._index_remove(record)
+        
+        resolved = self._resolved
+        while resolved:
+            fingerprint, resolved_at = next(iter(resolved.items()))
+            if now - resolved_at < self.resolved_retention and len(resolved) <= self.resolved_max:
+                break
+            resolved.popitem(last=False)
+            self._index_remove(self._alerts.pop(fingerprint))
+    
+    def _index_add(self, record: AlertRecord):
+        for label in INDEXED_LABELS:
+            value = record.labels.get(label)
+            if value is not None:
+                self._index[label].setdefault(value, set()).add(record.fingerprint)
+    
+    def _index_remove(self, record: AlertRecord):
+        for label in INDEXED_LABELS:
+            value = record.labels.get(label)
+            if value is None:
+                continue
+            fingerprints = self._index[label].get(value)
+            if fingerprints is not None:
+                fingerprints.discard(record.fingerprint)
+                if not fingerprints:
+                    del self._index[label][value]
+    
+    def get(self, fingerprint: str) -> Optional[AlertRecord]:
+        return self._alerts.get(fingerprint)
+    
+    def active(self, limit: Optional[int] = None) -> List[AlertRecord]:
+        """Firing alerts, oldest first."""
+        return self._records(self._firing, limit)
+    
+    def query(self, status: Optional[str] = None, limit: Optional[int] = None,
+              **labels: Optional[str]) -> List[AlertRecord]:
+        """
+        Alerts matching every given indexed label value, optionally restricted
+        to ``firing`` or ``resolved``.
+        """
+        candidates: Optional[Set[str]] = None
+        for label, value in labels.items():
+            if value is None:
+                continue
+            if label not in self._index:
+                raise ValueError(f"Label is not indexed: {label}")
+            matches = self._index[label].get(value, set())
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+        
+        if candidates is None:
+            if status == FIRING:
+                return self.active(limit)
+            if status == RESOLVED:
+                return self._records(self._resolved, limit)
+            return self._records(self._alerts, limit)
+        
+        if status is not None:
+            candidates = (c for c in candidates if self._alerts[c].status == status)
+        return self._records(candidates, limit)
+    
+    def _records(self, fingerprints: Iterable[str], limit: Optional[int]) -> List[AlertRecord]:
+        records = []
+        for fingerprint in fingerprints:
+            if limit is not None and len(records) >= limit:
+                break
+            records.append(self._alerts[fingerprint])
+        return records
+    
+    def counts_by_severity(self) -> Dict[str, int]:
+        """Number of firing alerts per severity."""
+        return {severity: count for severity, count in self._firing_by_severity.items() if count}
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "total": len(self._alerts),
+            "firing": len(self._firing),
+            "resolved": len(self._resolved),
+        }
+
+alert_store = AlertStore(
+    resolved_retention=settings.ALERT_RESOLVED_RETENTION_SECONDS,
+    resolved_max=settings.ALERT_RESOLVED_MAX,
+    firing_stale_after=settings.ALERT_FIRING_STALE_SECONDS,
+    firing_max=settings.ALERT_FIRING_MAX
+)
+alert_queue.add_listener(alert_store.upsert)
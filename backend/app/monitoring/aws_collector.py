@@ -0,0 +1,349 @@
+"""
+AWS inventory collector.
+
+Every ``interval`` seconds the collector lists EC2 instances, RDS instances
+and Lambda functions in each configured account and region, and S3 buckets
+once per account. Every (account, region, resource type) scan is a separate
+job on a bounded thread pool. Each job pages through the results with
+boto3 paginators. Clients use botocore's adaptive retry mode, which backs
+off and rate-limits the client when AWS throttles it.
+
+Scans are incremental where AWS offers a change marker: S3 bucket locations
+and Lambda function configurations are fetched only for buckets and functions
+that are new or whose ``CreationDate`` / ``RevisionId`` changed since the
+last cycle. If a scan fails, its previous results are kept until it succeeds
+again. After each cycle, resource counts by account, region, type and state
+are published to ``AWS_RESOURCES``.
+
+Nothing here needs real AWS: the collector takes a ``session_factory``
+returning any object with a boto3-style ``client(service, region_name=,
+config=)``, so it runs against moto, botocore ``Stubber`` clients or the
+fakes in ``benchmarks/bench_aws_collector.py``.
+
+botocore is imported on the first collection cycle, so workers that run with
+the collector disabled never load it.
+"""
+
+import asyncio
+import threading
+import time
+from collections import Counter as Tally
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from .prometheus_metrics import AWS_RESOURCES, AWS_SCAN_ERRORS, AWS_COLLECTION_DURATION
+
+logger = get_logger("aws_collector")
+
+EC2, RDS, S3, LAMBDA = "ec2", "rds", "s3", "lambda"
+RESOURCE_TYPES = (EC2, RDS, S3, LAMBDA)
+GLOBAL_REGION = "global"
+DEFAULT_ACCOUNT = "default"
+
+# Refresh assumed-role credentials this long before they expire
+CREDENTIAL_MARGIN_SECONDS = 300
+
+ScanKey = Tuple[str, str, str]  # (account, region, resource type)
+
+class AwsResource:
+    """One inventoried resource."""
+    
+    __slots__ = ("account", "region", "resource_type", "resource_id", "state", "kind", "version")
+    
+    def __init__(self, account: str, region: str, resource_type: str, resource_id: str,
+                 state: str, kind: str = "", version: str = ""):
+        self.account = account
+        self.region = region
+        self.resource_type = resource_type
+        self.resource_id = resource_id
+        self.state = state
+        # Instance class, DB engine or runtime
+        self.kind = kind
+        # Change marker for incremental detail fetches
+        self.version = version
+    
+    def to_dict(self) -> Dict[str, str]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+def account_label(role_arn: str) -> str:
+    """Account id of an ``arn:aws:iam::<account>:role/...`` ARN."""
+    parts = role_arn.split(":")
+    return parts[4] if len(parts) > 4 and parts[4] else role_arn
+
+class Boto3SessionFactory:
+    """boto3 sessions for the default credentials or an assumed role."""
+    
+    def __call__(self, role_arn: Optional[str]) -> Tuple[Any, Optional[float]]:
+        """Return a session and the unix time its credentials expire, if they do."""
+        # Imported here so the app does not pay for boto3 unless collection is on
+        import boto3
+        
+        if role_arn is None:
+            return boto3.Session(), None
+        
+        credentials = boto3.client("sts").assume_role(
+            RoleArn=role_arn, RoleSessionName="aws-inventory-collector"
+        )["Credentials"]
+        session = boto3.Session(
+            aws_access_key_id=credentials["AccessKeyId"],
+            aws_secret_access_key=credentials["SecretAccessKey"],
+            aws_session_token=credentials["SessionToken"],
+        )
+        return session, credentials["Expiration"].timestamp()
+
+class AwsInventoryCollector:
+    """Concurrent, incremental inventory scans across accounts and regions."""
+    
+    def __init__(self, regions: List[str], role_arns: Optional[List[str]] = None,
+                 max_workers: int = 16, interval: float = 300.0, max_attempts: int = 10,
+                 session_factory: Optional[Callable[[Optional[str]], Tuple[Any, Optional[float]]]] = None):
+        self.regions = list(regions)
+        # None stands for the default credentials' own account
+        self.role_arns: List[Optional[str]] = list(role_arns) if role_arns else [None]
+        self.max_workers = max_workers
+        self.interval = interval
+        self.session_factory = session_factory or Boto3SessionFactory()
+        self.max_attempts = max_attempts
+        self._client_config = None
+        
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._sessions: Dict[Optional[str], Tuple[Any, Optional[float]]] = {}
+        self._clients: Dict[Tuple[Optional[str], str, str], Any] = {}
+        self._client_lock = threading.Lock()
+        self._results: Dict[ScanKey, List[AwsResource]] = {}
+        # (account, resource type, resource id) -> (change marker, fetched detail)
+        self._details: Dict[Tuple[str, str, str], Tuple[str, Any]] = {}
+        self._published: set = set()
+        self._listeners: List[Callable[[Dict[ScanKey, List[AwsResource]]], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.last_duration = 0.0
+        # Wall time the last cycle finished, and its scans and failed scans
+        self.last_completed_at: Optional[float] = None
+        self.last_scans = 0
+        self.last_failed_scans = 0
+        self.detail_fetches = 0
+    
+    def add_listener(self, listener: Callable[[Dict[ScanKey, List[AwsResource]]], None]):
+        """Call ``listener`` with the results of every completed cycle."""
+        self._listeners.append(listener)
+    
+    def results(self) -> Dict[ScanKey, List[AwsResource]]:
+        """Latest resources per scan. S3 scans are keyed by region ``global``."""
+        return dict(self._results)
+    
+    def resources(self) -> Iterator[AwsResource]:
+        for resources in list(self._results.values()):
+            yield from resources
+    
+    def _scan_jobs(self) -> List[Tuple[Optional[str], str, str]]:
+        jobs = []
+        for role_arn in self.role_arns:
+            for region in self.regions:
+                for resource_type in (EC2, RDS, LAMBDA):
+                    jobs.append((role_arn, region, resource_type))
+            jobs.append((role_arn, GLOBAL_REGION, S3))
+        return jobs
+    
+    def _client(self, role_arn: Optional[str], region: str, service: str):
+        # boto3 sessions are not thread-safe, so clients are created under a lock;
+        # the clients themselves are.
+        if region == GLOBAL_REGION:
+            region = self.regions[0]
+        with self._client_lock:
+            session, expires_at = self._sessions.get(role_arn, (None, None))
+            if session is None or (expires_at is not None
+                                   and expires_at - time.time() < CREDENTIAL_MARGIN_SECONDS):
+                session, expires_at = self.session_factory(role_arn)
+                self._sessions[role_arn] = (session, expires_at)
+                self._clients = {key: client for key, client in self._clients.items() if key[0] != role_arn}
+            
+            key = (role_arn, region, service)
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = session.client(
+                    service, region_name=region, config=self._config()
+                )
+            return client
+    
+    def _config(self):
+        if self._client_config is None:
+            from botocore.config import Config
+            
+            self._client_config = Config(
+                retries={"mode": "adaptive", "max_attempts": self.max_attempts},
+                max_pool_connections=self.max_workers
+            )
+        return self._client_config
+    
+    def collect_once(self) -> Dict[ScanKey, List[AwsResource]]:
+        """Run one blocking collection cycle on the thread pool."""
+        from botocore.exceptions import BotoCoreError, ClientError
+        
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="aws-collector")
+        
+        started = time.perf_counter()
+        jobs = self._scan_jobs()
+        futures = [self._executor.submit(self._scan, *job) for job in jobs]
+        failed = 0
+        for (role_arn, region, resource_type), future in zip(jobs, futures):
+            key = (account_label(role_arn) if role_arn else DEFAULT_ACCOUNT, region, resource_type)
+            try:
+                self._results[key] = future.result()
+            except Exception as e:
+                # One scanner failing, AWS error or unexpected response shape,
+                # must not stop the other scans from publishing
+                failed += 1
+                code = e.response["Error"]["Code"] if isinstance(e, ClientError) else type(e).__name__
+                AWS_SCAN_ERRORS.labels(resource_type=resource_type, error=code).inc()
+                log = logger.warning if isinstance(e, (BotoCoreError, ClientError)) else logger.error
+                log(
+                    "AWS inventory scan failed, keeping previous results",
+                    account=key[0], region=region, resource_type=resource_type, error=code,
+                    error_message=str(e)
+                )
+        
+        self._prune_details()
+        self._publish()
+        self.last_duration = time.perf_counter() - started
+        self.last_completed_at = time.time()
+        self.last_scans, self.last_failed_scans = len(jobs), failed
+        AWS_COLLECTION_DURATION.set(self.last_duration)
+        
+        results = self.results()
+        for listener in self._listeners:
+            listener(results)
+        return results
+    
+    async def collect(self) -> Dict[ScanKey, List[AwsResource]]:
+        """Run one collection cycle without blocking the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.collect_once)
+    
+    def _scan(self, role_arn: Optional[str], region: str, resource_type: str) -> List[AwsResource]:
+        account = account_label(role_arn) if role_arn else DEFAULT_ACCOUNT
+        scanner = getattr(self, f"_scan_{resource_type}")
+        return scanner(self._client(role_arn, region, resource_type), account, region)
+    
+    def _scan_ec2(self, client, account: str, region: str) -> List[AwsResource]:
+        resources = []
+        for page in client.get_paginator("describe_instances").paginate():
+            for reservation in page["Reservations"]:
+                for instance in reservation["Instances"]:
+                    resources.append(AwsResource(
+                        account, region, EC2, instance["InstanceId"],
+                        instance["State"]["Name"], instance.get("InstanceType", "")
+                    ))
+        return resources
+    
+    def _scan_rds(self, client, account: str, region: str) -> List[AwsResource]:
+        resources = []
+        for page in client.get_paginator("describe_db_instances").paginate():
+            for db in page["DBInstances"]:
+                resources.append(AwsResource(
+                    account, region, RDS, db["DBInstanceIdentifier"],
+                    db["DBInstanceStatus"], db.get("Engine", "")
+                ))
+        return resources
+    
+    def _scan_lambda(self, client, account: str, region: str) -> List[AwsResource]:
+        resources = []
+        for page in client.get_paginator("list_functions").paginate():
+            for function in page["Functions"]:
+                name = function["FunctionName"]
+                version = function.get("RevisionId") or function.get("LastModified", "")
+                # list_functions does not reliably include State
+                configuration = self._detail(
+                    account, LAMBDA, f"{region}/{name}", version,
+                    lambda: client.get_function_configuration(FunctionName=name)
+                )
+                resources.append(AwsResource(
+                    account, region, LAMBDA, name, configuration.get("State", "Active"),
+                    function.get("Runtime", ""), version
+                ))
+        return resources
+    
+    def _scan_s3(self, client, account: str, region: str) -> List[AwsResource]:
+        resources = []
+        # ListBuckets returns every bucket in one response
+        for bucket in client.list_buckets()["Buckets"]:
+            name = bucket["Name"]
+            version = str(bucket.get("CreationDate", ""))
+            location = self._detail(
+                account, S3, name, version, lambda: client.get_bucket_location(Bucket=name)
+            )
+            # us-east-1 buckets report no LocationConstraint
+            resources.append(AwsResource(
+                account, location.get("LocationConstraint") or "us-east-1", S3, name,
+                "available", "", version
+            ))
+        return resources
+    
+    def _detail(self, account: str, resource_type: str, resource_id: str, version: str,
+                fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """A per-resource detail call, skipped while the change marker is unchanged."""
+        key = (account, resource_type, resource_id)
+        cached = self._details.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        detail = fetch()
+        self._details[key] = (version, detail)
+        self.detail_fetches += 1
+        return detail
+    
+    def _prune_details(self):
+        live = set()
+        for (account, region, resource_type), resources in self._results.items():
+            for resource in resources:
+                if resource_type == LAMBDA:
+                    live.add((account, LAMBDA, f"{region}/{resource.resource_id}"))
+                else:
+                    live.add((account, resource_type, resource.resource_id))
+        for key in [key for key in self._details if key not in live]:
+            del self._details[key]
+    
+    def _publish(self):
+        counts = Tally(
+            (resource.account, resource.region, resource.resource_type, resource.state)
+            for resource in self.resources()
+        )
+        for labels in self._published - counts.keys():
+            AWS_RESOURCES.remove(*labels)
+        for labels, count in counts.items():
+            AWS_RESOURCES.labels(*labels).set(count)
+        self._published = set(counts)
+    
+    async def _run(self):
+        while True:
+            try:
+                await self.collect()
+            except Exception as e:
+                logger.error("AWS inventory collection failed", error_message=str(e))
+            await asyncio.sleep(self.interval)
+    
+    def start(self):
+        """Start the background collection task on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self):
+        """Cancel the background collection task and release the thread pool."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+aws_collector = AwsInventoryCollector(
+    regions=settings.AWS_REGIONS,
+    role_arns=settings.AWS_ACCOUNT_ROLE_ARNS,
+    max_workers=settings.AWS_COLLECTOR_MAX_WORKERS,
+    interval=settings.AWS_COLLECT_INTERVAL_SECONDS,
+    max_attempts=settings.AWS_MAX_ATTEMPTS
+)
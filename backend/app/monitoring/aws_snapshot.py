@@ -0,0 +1,259 @@
+"""
+In-memory snapshot of the AWS inventory.
+
+The store keeps the collector's latest results grouped by (account, region,
+resource type), so the API never calls AWS while handling a request. After
+each collection cycle, ``update`` diffs every group against the previous
+snapshot and records the resources that were added, removed or changed. The
+snapshot version only increases when something actually changed.
+
+Each group carries a digest of its records. A query's ETag is derived from
+the digests of the groups it reads, so an ``If-None-Match`` request gets a
+304 until one of those groups changes.
+
+Snapshots are persisted to a file in a columnar layout: a JSON header, a
+table of distinct strings, then one uint32 column per record field that
+holds string indexes. A restarted worker memory-maps the file and rebuilds
+the records from it, so it can serve the inventory before its first
+collection cycle finishes.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from .aws_collector import AwsResource, ScanKey, aws_collector
+
+logger = get_logger("aws_snapshot")
+
+MAGIC = b"AWSSNAP1"
+FIELDS = AwsResource.__slots__
+
+class ResourceDelta:
+    """What changed in one group between two snapshots."""
+    
+    __slots__ = ("key", "added", "removed", "changed")
+    
+    def __init__(self, key: ScanKey, added: List[str], removed: List[str], changed: List[str]):
+        self.key = key
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+    
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        account, region, resource_type = self.key
+        return {
+            "account": account, "region": region, "resource_type": resource_type,
+            "added": self.added, "removed": self.removed, "changed": self.changed
+        }
+
+def _record(resource: AwsResource) -> Tuple[str, ...]:
+    return tuple(getattr(resource, field) for field in FIELDS)
+
+def _group(result_lists: Iterable[List[AwsResource]]) -> Dict[ScanKey, Dict[str, AwsResource]]:
+    groups: Dict[ScanKey, Dict[str, AwsResource]] = {}
+    # S3 scans are per account; file buckets under their own region
+    for resources in result_lists:
+        for resource in resources:
+            key = (resource.account, resource.region, resource.resource_type)
+            groups.setdefault(key, {})[resource.resource_id] = resource
+    return groups
+
+def _digest(group: Dict[str, AwsResource]) -> str:
+    h = hashlib.blake2b(digest_size=8)
+    for resource_id in sorted(group):
+        h.update("\x1f".join(_record(group[resource_id])).encode())
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+class AwsSnapshotStore:
+    """Latest AWS inventory per (account, region, resource type), with deltas."""
+    
+    def __init__(self, path: str = "", history: int = 50):
+        self.path = path
+        self.version = 0
+        self.updated_at: Optional[float] = None
+        # (groups, group digests), replaced wholesale so readers never see a
+        # half-applied cycle
+        self._state: Tuple[Dict[ScanKey, Dict[str, AwsResource]], Dict[ScanKey, str]] = ({}, {})
+        self._history: "deque[Tuple[int, List[ResourceDelta]]]" = deque(maxlen=history)
+        self._write_lock = threading.Lock()
+    
+    def update(self, results: Dict[ScanKey, List[AwsResource]]) -> List[ResourceDelta]:
+        """Replace the snapshot with a collection cycle's results and return the deltas."""
+        groups = _group(resources for resources in results.values())
+        
+        with self._write_lock:
+            previous, previous_digests = self._state
+            deltas = []
+            digests = {}
+            for key in previous.keys() | groups.keys():
+                old, new = previous.get(key, {}), groups.get(key, {})
+                delta = ResourceDelta(
+                    key,
+                    sorted(new.keys() - old.keys()),
+                    sorted(old.keys() - new.keys()),
+                    sorted(
+                        resource_id for resource_id in new.keys() & old.keys()
+                        if _record(new[resource_id]) != _record(old[resource_id])
+                    )
+                )
+                if key in groups:
+                    digests[key] = previous_digests[key] if key in previous_digests and not delta else _digest(new)
+                if delta:
+                    deltas.append(delta)
+            
+            self._state = (groups, digests)
+            self.updated_at = time.time()
+            if deltas:
+                self.version += 1
+                self._history.append((self.version, deltas))
+                if self.path:
+                    self._save()
+        return deltas
+    
+    @staticmethod
+    def _select(groups: Dict[ScanKey, Any], account: Optional[str], region: Optional[str],
+                resource_type: Optional[str]) -> List[ScanKey]:
+        return sorted(
+            key for key in groups
+            if (account is None or key[0] == account)
+            and (region is None or key[1] == region)
+            and (resource_type is None or key[2] == resource_type)
+        )
+    
+    def etag(self, account: Optional[str] = None, region: Optional[str] = None,
+             resource_type: Optional[str] = None) -> str:
+        """Strong ETag of the records a query with these filters returns."""
+        groups, digests = self._state
+        h = hashlib.blake2b(digest_size=8)
+        for key in self._select(groups, account, region, resource_type):
+            h.update("/".join(key).encode())
+            h.update(digests[key].encode())
+        return f'"{h.hexdigest()}"'
+    
+    def query(self, account: Optional[str] = None, region: Optional[str] = None,
+              resource_type: Optional[str] = None) -> List[AwsResource]:
+        groups = self._state[0]
+        resources = []
+        for key in self._select(groups, account, region, resource_type):
+            resources.extend(groups[key].values())
+        return resources
+    
+    def summary(self) -> List[Dict[str, Any]]:
+        """Resource counts per group."""
+        return [
+            {"account": key[0], "region": key[1], "resource_type": key[2], "count": len(group)}
+            for key, group in sorted(self._state[0].items())
+        ]
+    
+    def changes_since(self, version: int) -> Optional[List[Dict[str, Any]]]:
+        """Deltas after ``version``, or None if they are no longer retained."""
+        if version >= self.version:
+            return []
+        if not self._history or self._history[0][0] > version + 1:
+            return None
+        return [
+            {"version": delta_version, "deltas": [delta.to_dict() for delta in deltas]}
+            for delta_version, deltas in self._history if delta_version > version
+        ]
+    
+    def _save(self):
+        strings: Dict[str, int] = {}
+        columns = [array("I") for _ in FIELDS]
+        for group in self._state[0].values():
+            for resource in group.values():
+                for column, value in zip(columns, _record(resource)):
+                    index = strings.get(value)
+                    if index is None:
+                        index = strings[value] = len(strings)
+                    column.append(index)
+        
+        table = json.dumps(list(strings)).encode()
+        table += b" " * (-len(table) % 4)
+        header = json.dumps({
+            "version": self.version,
+            "updated_at": self.updated_at,
+            "rows": len(columns[0]),
+            "fields": list(FIELDS),
+            "strings_bytes": len(table),
+            "byteorder": sys.byteorder,
+        }).encode()
+        header += b" " * (-len(header) % 4)
+        
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(MAGIC + struct.pack("<I", len(header)) + header + table)
+                for column in columns:
+                    column.tofile(f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not persist AWS snapshot", path=self.path, error_message=str(e))
+    
+    def load(self) -> bool:
+        """Warm the store from the persisted snapshot; False if there is none to use."""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                resources = self._read(mm)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable AWS snapshot", path=self.path, error_message=str(e))
+            return False
+        if resources is None:
+            return False
+        
+        version, updated_at, records = resources
+        groups = _group([records])
+        digests = {key: _digest(group) for key, group in groups.items()}
+        with self._write_lock:
+            if self.version:
+                return False  # a live cycle already landed
+            self._state = (groups, digests)
+            self.version, self.updated_at = version, updated_at
+        logger.info("Loaded AWS snapshot", path=self.path, resources=len(records), version=version)
+        return True
+    
+    def _read(self, mm) -> Optional[Tuple[int, float, List[AwsResource]]]:
+        if mm[:len(MAGIC)] != MAGIC:
+            raise ValueError("not an AWS snapshot file")
+        offset = len(MAGIC)
+        (header_len,) = struct.unpack_from("<I", mm, offset)
+        offset += 4
+        header = json.loads(mm[offset:offset + header_len])
+        offset += header_len
+        if header["fields"] != list(FIELDS) or header["byteorder"] != sys.byteorder:
+            return None
+        
+        strings = json.loads(mm[offset:offset + header["strings_bytes"]])
+        offset += header["strings_bytes"]
+        
+        rows = header["rows"]
+        columns = []
+        for _ in FIELDS:
+            column = array("I")
+            column.frombytes(mm[offset:offset + rows * 4])
+            columns.append([strings[index] for index in column])
+            offset += rows * 4
+        records = [AwsResource(*values) for values in zip(*columns)]
+        return header["version"], header["updated_at"], records
+
+aws_snapshot_store = AwsSnapshotStore(path=settings.AWS_SNAPSHOT_PATH)
+aws_collector.add_listener(aws_snapshot_store.update)
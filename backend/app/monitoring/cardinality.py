@@ -0,0 +1,91 @@
+"""
+Label cardinality guard for Prometheus metrics.
+
+Every distinct label value creates a new series that lives for the lifetime
+of the process and is rendered on every scrape. ``CardinalityLimiter`` caps
+the number of distinct values admitted for selected labels of a metric and
+folds anything beyond the cap into a single ``other`` value.
+"""
+
+import threading
+from typing import Dict, Iterable, Set, Tuple
+
+from app.core.config import settings
+from .prometheus_metrics import (
+    REQUEST_COUNT, ERROR_COUNT, ERROR_FINGERPRINTS, REQUEST_CPU_SECONDS, METRIC_SERIES,
+    SALES_VOLUME
+)
+
+OVERFLOW_LABEL = "other"
+
+class CardinalityLimiter:
+    """Wraps a labeled metric and bounds the values of the given labels."""
+    
+    def __init__(self, metric, family: str, limited_labels: Iterable[str],
+                 max_values: int):
+        self.metric = metric
+        self.family = family
+        self.limited_labels = tuple(limited_labels)
+        self.max_values = max_values
+        self._values: Dict[str, Set[str]] = {name: set() for name in self.limited_labels}
+        self._series: Set[Tuple[str, ...]] = set()
+        self._lock = threading.Lock()
+    
+    def labels(self, **labels):
+        """Return the metric child for ``labels`` with overflow values folded."""
+        for name in self.limited_labels:
+            labels[name] = self._admit(name, str(labels[name]))
+        
+        key = tuple(sorted((name, str(value)) for name, value in labels.items()))
+        if key not in self._series:
+            with self._lock:
+                self._series.add(key)
+                METRIC_SERIES.labels(metric=self.family).set(len(self._series))
+        
+        return self.metric.labels(**labels)
+    
+    def _admit(self, name: str, value: str) -> str:
+        seen = self._values[name]
+        if value in seen:
+            return value
+        
+        with self._lock:
+            if len(seen) < self.max_values:
+                seen.add(value)
+                return value
+        return OVERFLOW_LABEL
+    
+    @property
+    def series_count(self) -> int:
+        return len(self._series)
+    
+    @property
+    def saturated(self) -> bool:
+        """True once a limited label is at its cap and new values fold into ``other``."""
+        return any(len(seen) >= self.max_values for seen in self._values.values())
+
+REQUEST_COUNT_GUARD = CardinalityLimiter(
+    REQUEST_COUNT, "http_requests_total", ["endpoint"],
+    settings.METRICS_MAX_LABEL_VALUES
+)
+
+ERROR_COUNT_GUARD = CardinalityLimiter(
+    ERROR_COUNT, "http_errors_total", ["endpoint", "error_type"],
+    settings.METRICS_MAX_LABEL_VALUES
+)
+
+REQUEST_CPU_GUARD = CardinalityLimiter(
+    REQUEST_CPU_SECONDS, "http_request_cpu_seconds_total", ["endpoint"],
+    settings.METRICS_MAX_LABEL_VALUES
+)
+
+ERROR_FINGERPRINT_GUARD = CardinalityLimiter(
+    ERROR_FINGERPRINTS, "application_errors_total", ["fingerprint"],
+    settings.METRICS_MAX_LABEL_VALUES
+)
+
+# Categories come from clients of the sales ingestion endpoint
+SALES_VOLUME_GUARD = CardinalityLimiter(
+    SALES_VOLUME, "sales_volume_total", ["product_category"],
+    settings.METRICS_MAX_LABEL_VALUES
+)
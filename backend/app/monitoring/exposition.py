@@ -0,0 +1,95 @@
+"""
+Cached Prometheus exposition for the /metrics endpoint.
+
+Rendering the registry walks every series, so scrapes share one rendered
+payload for ``ttl`` seconds. Renders run in a worker thread to keep the event
+loop free, and concurrent scrapes that miss the cache wait on the same render
+instead of starting their own.
+"""
+
+import asyncio
+import gzip
+import time
+from typing import Dict, Optional
+
+from prometheus_client import REGISTRY, generate_latest
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from .inventory_exporter import inventory_exporter
+from .multiprocess import build_registry
+
+class Exposition:
+    """A rendered registry, plain and gzip-compressed."""
+    
+    __slots__ = ("data", "gzipped", "rendered_at")
+    
+    def __init__(self, data: bytes, gzipped: bytes, rendered_at: float):
+        self.data = data
+        self.gzipped = gzipped
+        self.rendered_at = rendered_at
+
+class ExpositionCache:
+    """TTL cache of the rendered registry with single-flight rendering."""
+    
+    def __init__(self, registry=REGISTRY, ttl: float = 1.0, compresslevel: int = 6):
+        self.registry = registry
+        self.ttl = ttl
+        self.compresslevel = compresslevel
+        self.renders = 0
+        self._current: Optional[Exposition] = None
+        self._inflight: Optional[asyncio.Future] = None
+    
+    async def get(self) -> Exposition:
+        """Return a payload no older than ``ttl`` seconds."""
+        current = self._current
+        if current is not None and time.monotonic() - current.rendered_at < self.ttl:
+            return current
+        
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._refresh())
+        # Shield so one cancelled scrape does not cancel the shared render
+        return await asyncio.shield(self._inflight)
+    
+    async def _refresh(self) -> Exposition:
+        try:
+            self._current = await run_in_threadpool(self._render)
+            return self._current
+        finally:
+            self._inflight = None
+    
+    def _render(self) -> Exposition:
+        data = generate_latest(self.registry)
+        gzipped = gzip.compress(data, compresslevel=self.compresslevel, mtime=0)
+        self.renders += 1
+        return Exposition(data, gzipped, time.monotonic())
+    
+    def invalidate(self):
+        """Force the next scrape to render."""
+        self._current = None
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Return True if an Accept-Encoding header allows a gzip response."""
+    # An explicit gzip entry takes precedence over *, wherever either appears
+    qvalues: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, *params = part.split(";")
+        coding = coding.strip().lower()
+        if coding not in ("gzip", "*"):
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        qvalues[coding] = q
+    q = qvalues.get("gzip", qvalues.get("*", 0.0))
+    return q > 0
+
+exposition_cache = ExpositionCache(
+    registry=build_registry(collectors=[inventory_exporter]),
+    ttl=settings.METRICS_CACHE_TTL
+)
@@ -0,0 +1,326 @@
+"""
+Dependency health probes with cached results.
+
+Each probe checks one dependency and returns a status and a detail dict.
+``ok`` means healthy, ``degraded`` means working with reduced headroom, and
+``failing`` means unusable. A background task runs all probes concurrently
+every ``interval`` seconds. Each probe has its own timeout, and a probe that
+raises or times out counts as failing. After each round the reports are
+encoded once, so the health, readiness and liveness endpoints only read
+cached bytes. However often the kubelet or a load balancer polls, the
+dependencies see one probe per round.
+
+The full report keeps the original ``/health`` contract: it is always served
+with 200, carries ``status``, ``service`` and ``timestamp``, and ``status``
+is ``healthy``, ``degraded`` or ``unhealthy`` (``starting`` before the first
+round, ``stale`` when rounds stopped). Per-probe results are under
+``checks``. Readiness and liveness carry the status codes for orchestrators.
+
+A worker is ready once a round has completed, no critical probe is failing
+and the last round is recent. Only the database probe is critical; the
+metrics registry, log queue and AWS collector probes report trouble without
+taking the worker out of rotation. Liveness only checks that rounds keep
+completing, so a failing dependency takes the worker out of rotation but
+does not get it restarted.
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.logging import get_log_queue_stats, get_logger
+from app.core.serialization import dumps
+from app.data.database import get_engine
+from .aws_collector import aws_collector
+from .cardinality import (
+    REQUEST_COUNT_GUARD, ERROR_COUNT_GUARD, REQUEST_CPU_GUARD, ERROR_FINGERPRINT_GUARD,
+    SALES_VOLUME_GUARD
+)
+from .exposition import exposition_cache
+from .multiprocess import multiprocess_dir
+from .prometheus_metrics import HEALTH_CHECK_UP, HEALTH_CHECK_DURATION
+
+logger = get_logger("health")
+
+OK, DEGRADED, FAILING = "ok", "degraded", "failing"
+_UP = {OK: 1.0, DEGRADED: 0.5, FAILING: 0.0}
+# Overall report status for the worst probe status, as /health always reported it
+_OVERALL = {OK: "healthy", DEGRADED: "degraded", FAILING: "unhealthy"}
+
+ProbeCheck = Callable[[], Awaitable[Tuple[str, Dict[str, Any]]]]
+
+class Probe:
+    """A registered dependency check."""
+    
+    __slots__ = ("name", "check", "timeout", "critical")
+    
+    def __init__(self, name: str, check: ProbeCheck, timeout: float, critical: bool):
+        self.name = name
+        self.check = check
+        self.timeout = timeout
+        self.critical = critical
+
+class ProbeResult:
+    """Outcome of one probe in one round."""
+    
+    __slots__ = ("name", "status", "critical", "duration", "detail")
+    
+    def __init__(self, name: str, status: str, critical: bool, duration: float,
+                 detail: Dict[str, Any]):
+        self.name = name
+        self.status = status
+        self.critical = critical
+        self.duration = duration
+        self.detail = detail
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "critical": self.critical,
+            "duration_ms": round(self.duration * 1000, 2),
+            **self.detail
+        }
+
+class HealthMonitor:
+    """Runs the registered probes on a schedule and serves their cached results."""
+    
+    def __init__(self, interval: float = 10.0, default_timeout: float = 2.0,
+                 service: str = "monitoring-api"):
+        self.interval = interval
+        self.default_timeout = default_timeout
+        self.service = service
+        self._probes: Dict[str, Probe] = {}
+        self._results: Dict[str, ProbeResult] = {}
+        self._started_at = time.monotonic()
+        self._completed_at: Optional[float] = None
+        # Age after which the last round no longer vouches for the worker
+        self.stale_after = 3 * interval
+        self._checked_at: Optional[str] = None
+        # Encoded (status code, body) pairs, replaced after every round
+        self._report: Tuple[int, bytes] = (200, b"")
+        self._readiness: Tuple[int, bytes] = (503, b"")
+        self._task: Optional[asyncio.Task] = None
+        self.rounds = 0
+        self._publish([])
+    
+    def register(self, name: str, check: ProbeCheck, timeout: Optional[float] = None,
+                 critical: bool = True):
+        """Add a probe; non-critical probes never make the worker unready."""
+        probe = Probe(name, check, self.default_timeout if timeout is None else timeout, critical)
+        self._probes[name] = probe
+        self.stale_after = max(self.stale_after, 3 * self.interval + probe.timeout)
+    
+    def _stale(self) -> bool:
+        last = self._completed_at if self._completed_at is not None else self._started_at
+        return time.monotonic() - last > self.stale_after
+    
+    def report(self) -> Tuple[int, bytes]:
+        """Status code and body of the full report from the last round; always 200."""
+        if self._stale():
+            return 200, self._stale_body()
+        return self._report
+    
+    def readiness(self) -> Tuple[int, bytes]:
+        if self._stale():
+            return 503, self._stale_body()
+        return self._readiness
+    
+    def liveness(self) -> Tuple[int, bytes]:
+        if self._stale():
+            return 503, self._stale_body()
+        return 200, b'{"status":"alive"}'
+    
+    def _stale_body(self) -> bytes:
+        return dumps({
+            "status": "stale",
+            "service": self.service,
+            "timestamp": self._checked_at,
+            "stale_after": self.stale_after
+        })
+    
+    async def _run_probe(self, probe: Probe) -> ProbeResult:
+        started = time.perf_counter()
+        try:
+            status, detail = await asyncio.wait_for(probe.check(), probe.timeout)
+        except asyncio.TimeoutError:
+            status, detail = FAILING, {"error": f"timed out after {probe.timeout}s"}
+        except Exception as e:
+            status, detail = FAILING, {"error": f"{type(e).__name__}: {e}"}
+        return ProbeResult(probe.name, status, probe.critical, time.perf_counter() - started, detail)
+    
+    async def run_once(self) -> List[ProbeResult]:
+        """Run every probe concurrently and publish the results."""
+        results = await asyncio.gather(*(self._run_probe(probe) for probe in self._probes.values()))
+        
+        for result in results:
+            previous = self._results.get(result.name)
+            if previous is not None and previous.status != result.status:
+                log = logger.info if result.status == OK else logger.warning
+                log(
+                    f"Health check {result.name} is {result.status}",
+                    check=result.name, previous_status=previous.status, **result.detail
+                )
+            HEALTH_CHECK_UP.labels(check=result.name).set(_UP[result.status])
+            HEALTH_CHECK_DURATION.labels(check=result.name).set(result.duration)
+        
+        self._results = {result.name: result for result in results}
+        self._completed_at = time.monotonic()
+        self.rounds += 1
+        self._publish(results)
+        return results
+    
+    def _publish(self, results: List[ProbeResult]):
+        completed = self._completed_at is not None
+        ready = completed and not any(
+            result.critical and result.status == FAILING for result in results
+        )
+        if not completed:
+            status = "starting"
+        elif not ready:
+            status = _OVERALL[FAILING]
+        else:
+            # Non-critical failures only degrade the overall status
+            status = _OVERALL[DEGRADED if any(result.status != OK for result in results) else OK]
+        
+        self._checked_at = datetime.now(timezone.utc).isoformat() if completed else None
+        self._report = (200, dumps({
+            "status": status,
+            "ready": ready,
+            "service": self.service,
+            "timestamp": self._checked_at,
+            "checks": {result.name: result.to_dict() for result in results}
+        }))
+        self._readiness = (200 if ready else 503, dumps({
+            "status": "ready" if ready else "not ready",
+            "timestamp": self._checked_at,
+            "failing": [result.name for result in results if result.status == FAILING]
+        }))
+    
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error("Health probe round failed", error_message=str(e))
+            await asyncio.sleep(self.interval)
+    
+    def start(self):
+        """Start the background probe task on the running event loop."""
+        if self._task is None:
+            self._started_at = time.monotonic()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self):
+        """Cancel the background probe task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+async def check_database() -> Tuple[str, Dict[str, Any]]:
+    """Round trip on a pooled connection; degraded without one when the pool is exhausted."""
+    engine = get_engine()
+    pool = engine.pool
+    detail: Dict[str, Any] = {"pool": pool.status()}
+    # Only QueuePool has a bound; a negative overflow means unbounded
+    max_overflow = getattr(pool, "_max_overflow", -1)
+    if max_overflow >= 0:
+        detail["checked_out"] = pool.checkedout()
+        detail["capacity"] = pool.size() + max_overflow
+        if detail["checked_out"] >= detail["capacity"]:
+            # A round trip would only queue behind the requests for a connection
+            return DEGRADED, detail
+    
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    return OK, detail
+
+async def check_metrics_registry() -> Tuple[str, Dict[str, Any]]:
+    """Render (or reuse) the exposition and look for guards folding new label values."""
+    exposition = await exposition_cache.get()
+    detail: Dict[str, Any] = {
+        "bytes": len(exposition.data),
+        "age_seconds": round(time.monotonic() - exposition.rendered_at, 3)
+    }
+    
+    directory = multiprocess_dir()
+    if directory and not os.access(directory, os.W_OK):
+        detail["error"] = f"multiprocess directory {directory} is not writable"
+        return FAILING, detail
+    
+    saturated = [
+        guard.family for guard in
+        (REQUEST_COUNT_GUARD, ERROR_COUNT_GUARD, REQUEST_CPU_GUARD, ERROR_FINGERPRINT_GUARD,
+         SALES_VOLUME_GUARD)
+        if guard.saturated
+    ]
+    if saturated:
+        detail["saturated_label_guards"] = saturated
+        return DEGRADED, detail
+    return OK, detail
+
+class _LogQueueProbe:
+    """Writer thread liveness, queue headroom and records dropped since the last round."""
+    
+    def __init__(self, high_water: float = 0.9):
+        self.high_water = high_water
+        self._dropped = 0
+    
+    async def __call__(self) -> Tuple[str, Dict[str, Any]]:
+        stats = get_log_queue_stats()
+        if stats is None:
+            return OK, {"queued": False}
+        
+        dropped = stats["dropped"] - self._dropped
+        self._dropped = stats["dropped"]
+        detail = {
+            "pending": stats["pending"],
+            "capacity": stats["capacity"],
+            "dropped_since_last_check": dropped
+        }
+        if not stats["running"]:
+            detail["error"] = "log writer thread is not running"
+            return FAILING, detail
+        if dropped or stats["pending"] >= self.high_water * stats["capacity"]:
+            return DEGRADED, detail
+        return OK, detail
+
+async def check_aws_collector() -> Tuple[str, Dict[str, Any]]:
+    """Age and scan failures of the last completed collection cycle."""
+    completed_at = aws_collector.last_completed_at
+    if completed_at is None:
+        return DEGRADED, {"error": "no completed collection cycle yet"}
+    
+    age = time.time() - completed_at
+    detail = {
+        "age_seconds": round(age, 1),
+        "scans": aws_collector.last_scans,
+        "failed_scans": aws_collector.last_failed_scans
+    }
+    # A cycle may take a while on top of the sleep between cycles
+    if age > 2 * aws_collector.interval + 60:
+        detail["error"] = "collection cycles stopped completing"
+        return FAILING, detail
+    if aws_collector.last_failed_scans and aws_collector.last_failed_scans == aws_collector.last_scans:
+        return FAILING, detail
+    if aws_collector.last_failed_scans:
+        return DEGRADED, detail
+    return OK, detail
+
+health_monitor = HealthMonitor(
+    interval=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+    default_timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS
+)
+health_monitor.register("database", check_database)
+health_monitor.register("metrics_registry", check_metrics_registry, critical=False)
+health_monitor.register("log_queue", _LogQueueProbe(), critical=False)
+if settings.AWS_COLLECTOR_ENABLED:
+    health_monitor.register("aws_collector", check_aws_collector, critical=False)
@@ -0,0 +1,145 @@
+"""
+Inventory metrics exporter.
+
+One gauge series per product makes every scrape grow with the catalog, so
+stock levels are exported in bounded form instead: per-category aggregates
+plus only the ``top_n`` lowest-stock products. A background task refreshes
+them with two bulk reads (a ``GROUP BY category`` and an ``ORDER BY
+stock_quantity LIMIT top_n``) every ``refresh_seconds``, and the collector
+yields the last precomputed samples at scrape time without touching the
+database.
+
+Lowest-stock products keep the ``inventory_levels{product_id, category}``
+series the ``LowInventory`` alert evaluates.
+"""
+
+import asyncio
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import case, func, select
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.data.database import get_engine, init_models
+from app.data.models import Product
+
+logger = get_logger("inventory_exporter")
+
+class InventorySnapshot:
+    """Stock levels read in one refresh."""
+    
+    __slots__ = ("categories", "lowest", "refreshed_at")
+    
+    def __init__(self, categories: Dict[str, Tuple[int, int, int]],
+                 lowest: List[Tuple[str, str, int]], refreshed_at: float):
+        # category -> (products, units in stock, products below the low-stock threshold)
+        self.categories = categories
+        # (product_id, category, stock_quantity), lowest stock first
+        self.lowest = lowest
+        self.refreshed_at = refreshed_at
+
+class InventoryExporter:
+    """Custom collector serving periodically refreshed inventory aggregates."""
+    
+    def __init__(self, refresh_seconds: float = 30.0, top_n: int = 20,
+                 low_stock_threshold: int = 10):
+        self.refresh_seconds = refresh_seconds
+        self.top_n = top_n
+        self.low_stock_threshold = low_stock_threshold
+        self._snapshot: Optional[InventorySnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def refresh(self):
+        """Read stock levels in bulk and replace the snapshot."""
+        await init_models()
+        low = case((Product.stock_quantity < self.low_stock_threshold, 1), else_=0)
+        by_category = select(
+            Product.category,
+            func.count(),
+            func.coalesce(func.sum(Product.stock_quantity), 0),
+            func.sum(low),
+        ).group_by(Product.category)
+        lowest = select(
+            Product.product_id, Product.category, Product.stock_quantity
+        ).order_by(Product.stock_quantity, Product.product_id).limit(self.top_n)
+        
+        async with get_engine().connect() as connection:
+            categories = {
+                category: (count, int(units), int(low_count or 0))
+                for category, count, units, low_count in await connection.execute(by_category)
+            }
+            lowest_rows = [tuple(row) for row in await connection.execute(lowest)]
+        
+        self._snapshot = InventorySnapshot(categories, lowest_rows, time.time())
+    
+    def describe(self) -> List[GaugeMetricFamily]:
+        # Lets the registry check names on register() without a collect()
+        return list(self._families(None))
+    
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        return self._families(self._snapshot)
+    
+    def _families(self, snapshot: Optional[InventorySnapshot]) -> Iterator[GaugeMetricFamily]:
+        products = GaugeMetricFamily(
+            'inventory_category_products', 'Products per category', labels=['category']
+        )
+        units = GaugeMetricFamily(
+            'inventory_category_stock_units', 'Units in stock per category', labels=['category']
+        )
+        low_stock = GaugeMetricFamily(
+            'inventory_category_low_stock_products',
+            'Products per category below the low-stock threshold',
+            labels=['category']
+        )
+        levels = GaugeMetricFamily(
+            'inventory_levels',
+            'Current inventory levels of the lowest-stock products',
+            labels=['product_id', 'category']
+        )
+        refreshed = GaugeMetricFamily(
+            'inventory_last_refresh_timestamp_seconds',
+            'Unix time of the last successful inventory refresh'
+        )
+        
+        if snapshot is not None:
+            for category, (count, stock, low_count) in snapshot.categories.items():
+                products.add_metric([category], count)
+                units.add_metric([category], stock)
+                low_stock.add_metric([category], low_count)
+            for product_id, category, quantity in snapshot.lowest:
+                levels.add_metric([product_id, category], quantity)
+            refreshed.add_metric([], snapshot.refreshed_at)
+        
+        yield from (products, units, low_stock, levels, refreshed)
+    
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Keep serving the last snapshot; its timestamp shows the staleness
+                logger.warning("Inventory metrics refresh failed", error_message=str(e))
+            await asyncio.sleep(self.refresh_seconds)
+    
+    def start(self):
+        """Start the background refresh task on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self):
+        """Cancel the background refresh task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+inventory_exporter = InventoryExporter(
+    refresh_seconds=settings.INVENTORY_REFRESH_SECONDS,
+    top_n=settings.INVENTORY_TOP_N,
+    low_stock_threshold=settings.INVENTORY_LOW_STOCK_THRESHOLD
+)
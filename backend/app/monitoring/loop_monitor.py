@@ -0,0 +1,193 @@
+"""
+Event-loop lag and slow-callback instrumentation.
+
+A ticker task wakes up every ``interval`` seconds. The delay between its
+scheduled and actual wakeup is the event-loop lag, and it is observed into
+``EVENT_LOOP_LAG_HISTOGRAM``. A lag that crosses ``threshold`` means some
+callback held the loop for that long without yielding.
+
+The ticker cannot see who is blocking, because it only runs after the loop
+is free again. A watchdog thread therefore checks the ticker's heartbeat.
+Once the heartbeat is ``threshold`` seconds overdue, the watchdog captures
+the loop thread's stack while the offending callback is still running. When
+the ticker next wakes up, it completes that record with the measured lag.
+The most recent offenders are kept in a bounded buffer for
+``/api/v1/metrics/debug/slow``.
+
+``cpu_timed`` measures the CPU time a coroutine spends on the loop thread.
+Time spent in other tasks while it is suspended is not counted. The ASGI
+middleware uses it for the per-endpoint CPU counter.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from .prometheus_metrics import EVENT_LOOP_LAG_HISTOGRAM, SLOW_CALLBACKS
+
+logger = get_logger("loop_monitor")
+
+MAX_STACK_FRAMES = 30
+
+class SlowCallback:
+    """One episode of the loop being blocked for longer than the threshold."""
+    
+    __slots__ = ("detected_at", "duration", "stack")
+    
+    def __init__(self, detected_at: float, stack: List[str]):
+        self.detected_at = detected_at
+        self.duration: Optional[float] = None  # None while still blocking
+        self.stack = stack
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "detected_at": datetime.fromtimestamp(self.detected_at, timezone.utc).isoformat(),
+            "duration": round(self.duration, 4) if self.duration is not None else None,
+            "stack": self.stack
+        }
+
+class _CpuTimed:
+    """Awaitable wrapper that accumulates the thread CPU time of each step of ``coro``."""
+    
+    __slots__ = ("coro", "cpu_seconds")
+    
+    def __init__(self, coro: Awaitable):
+        self.coro = coro
+        self.cpu_seconds = 0.0
+    
+    def __await__(self):
+        steps = self.coro.__await__()
+        value, error = None, None
+        while True:
+            start = time.thread_time()
+            try:
+                yielded = steps.throw(error) if error is not None else steps.send(value)
+            except StopIteration as stop:
+                self.cpu_seconds += time.thread_time() - start
+                return stop.value
+            except BaseException:
+                self.cpu_seconds += time.thread_time() - start
+                raise
+            self.cpu_seconds += time.thread_time() - start
+            
+            try:
+                value, error = (yield yielded), None
+            except GeneratorExit:
+                steps.close()
+                raise
+            except BaseException as e:
+                value, error = None, e
+
+def cpu_timed(coro: Awaitable) -> _CpuTimed:
+    """Wrap ``coro``; read ``cpu_seconds`` from the wrapper after awaiting it."""
+    return _CpuTimed(coro)
+
+class LoopMonitor:
+    """Ticker plus watchdog thread measuring lag and catching blocking callbacks."""
+    
+    def __init__(self, interval: float = 0.02, threshold: float = 0.1, max_offenders: int = 50):
+        self.interval = interval
+        self.threshold = threshold
+        self._offenders: "deque[SlowCallback]" = deque(maxlen=max_offenders)
+        self._pending: Optional[SlowCallback] = None
+        self._lock = threading.Lock()
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self.max_lag = 0.0
+    
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The most recent slow callbacks, newest first."""
+        with self._lock:
+            offenders = list(self._offenders)
+        offenders.reverse()
+        return [offender.to_dict() for offender in offenders[:limit]]
+    
+    async def _tick(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - scheduled, 0.0)
+            self._heartbeat = time.monotonic()
+            
+            EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
+            if lag > self.max_lag:
+                self.max_lag = lag
+            if lag >= self.threshold:
+                self._record(lag)
+    
+    def _record(self, lag: float):
+        SLOW_CALLBACKS.inc()
+        with self._lock:
+            offender, self._pending = self._pending, None
+            if offender is None:
+                # Blocked and released between two watchdog checks; no stack
+                offender = SlowCallback(time.time() - lag, [])
+                self._offenders.append(offender)
+            offender.duration = lag
+        logger.warning(
+            "Event loop blocked",
+            duration=round(lag, 4),
+            stack=offender.stack[-5:]
+        )
+    
+    def _watch(self):
+        check_every = min(self.interval, self.threshold / 2)
+        while not self._stopped.wait(check_every):
+            overdue = time.monotonic() - self._heartbeat - self.interval
+            if overdue < self.threshold or self._pending is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = [
+                f"{entry.filename}:{entry.lineno} in {entry.name}"
+                for entry in traceback.extract_stack(frame)[-MAX_STACK_FRAMES:]
+            ]
+            del frame
+            with self._lock:
+                # Re-check under the lock: the ticker may have caught up meanwhile
+                if time.monotonic() - self._heartbeat - self.interval >= self.threshold:
+                    self._pending = SlowCallback(time.time() - overdue, stack)
+                    self._offenders.append(self._pending)
+    
+    def start(self):
+        """Start the ticker on the running loop and the watchdog thread."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+    
+    async def stop(self):
+        """Stop the ticker and the watchdog thread."""
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._watchdog.join(timeout=1.0)
+        self._watchdog = None
+
+loop_monitor = LoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL,
+    threshold=settings.LOOP_SLOW_THRESHOLD,
+    max_offenders=settings.LOOP_SLOW_BUFFER_SIZE
+)
@@ -1,12 +1,27 @@
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import time
-import traceback
-from .prometheus_metrics import REQUEST_COUNT, REQUEST_DURATION, ERROR_COUNT
+from .prometheus_metrics import REQUEST_DURATION, ACTIVE_CONNECTIONS
+from .cardinality import REQUEST_COUNT_GUARD, ERROR_COUNT_GUARD, REQUEST_CPU_GUARD
+from .loop_monitor import cpu_timed
+from .quantiles import latency_tracker
+from app.core.exceptions import error_aggregator
 from app.core.logging import get_logger
 
 logger = get_logger("middleware")
 
+UNMATCHED_ROUTE = "unmatched"
+
+def route_template(scope: Scope) -> str:
+    """
+    Return the matched route template (e.g. ``/items/{item_id}``) for metric
+    labels. Raw paths are unbounded, so requests that matched no route share
+    a single label value.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
 class PrometheusMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         start_time = time.time()
@@ -27,13 +42,14 @@ class PrometheusMiddleware(BaseHTTPMiddleware):
             duration = time.time() - start_time
             
             # Record success metrics
-            REQUEST_COUNT.labels(
+            REQUEST_COUNT_GUARD.labels(
                 method=request.method,
-                endpoint=request.url.path,
+                endpoint=route_template(request.scope),
                 status=response.status_code
             ).inc()
             
             REQUEST_DURATION.observe(duration)
+            latency_tracker.observe(route_template(request.scope), duration)
             
             # Log successful request
             logger.log_api_request(
@@ -50,23 +66,128 @@ class PrometheusMiddleware(BaseHTTPMiddleware):
             duration = time.time() - start_time
             
             # Record error metrics
-            ERROR_COUNT.labels(
+            ERROR_COUNT_GUARD.labels(
                 method=request.method,
-                endpoint=request.url.path,
+                endpoint=route_template(request.scope),
                 error_type=type(e).__name__
             ).inc()
             
-            # Log error
-            logger.error(
+            # Log error; repeats of the same failure are counted, not re-logged
+            error_aggregator.report(
+                logger, e,
                 f"Request failed: {request.method} {request.url.path}",
                 request_id=request_id,
                 method=request.method,
                 path=request.url.path,
                 error_type=type(e).__name__,
                 error_message=str(e),
-                response_time=duration,
-                traceback=traceback.format_exc()
+                response_time=duration
+            )
+            
+            # Re-raise the exception to be handled by exception handlers
+            raise
+
+class PrometheusASGIMiddleware:
+    """
+    Pure ASGI equivalent of PrometheusMiddleware.
+
+    Metrics are recorded from the ``http.response.start`` and final
+    ``http.response.body`` messages as they pass through ``send``, so
+    responses are never buffered or wrapped in an extra task and streaming
+    responses work unchanged. ``ACTIVE_CONNECTIONS`` counts the requests in
+    flight, including open dashboard streams.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_ns = time.perf_counter_ns()
+        request_id = id(scope)
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        user_agent = None
+        for key, value in scope["headers"]:
+            if key == b"user-agent":
+                user_agent = value.decode("latin-1")
+                break
+        
+        # Log incoming request
+        logger.info(
+            f"Request started: {method} {path}",
+            request_id=request_id,
+            method=method,
+            path=path,
+            client_ip=client[0] if client else None,
+            user_agent=user_agent
+        )
+        
+        status_code = None
+        
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            
+            await send(message)
+            
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                duration = (time.perf_counter_ns() - start_ns) / 1e9
+                
+                # Record success metrics
+                endpoint = route_template(scope)
+                REQUEST_COUNT_GUARD.labels(
+                    method=method,
+                    endpoint=endpoint,
+                    status=status_code
+                ).inc()
+                
+                REQUEST_DURATION.observe(duration)
+                latency_tracker.observe(endpoint, duration)
+                
+                # Log successful request
+                logger.log_api_request(
+                    method=method,
+                    path=path,
+                    status_code=status_code,
+                    response_time=duration,
+                    request_id=request_id
+                )
+        
+        timed = cpu_timed(self.app(scope, receive, send_wrapper))
+        ACTIVE_CONNECTIONS.inc()
+        try:
+            await timed
+        except Exception as e:
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
+            
+            # Record error metrics
+            ERROR_COUNT_GUARD.labels(
+                method=method,
+                endpoint=route_template(scope),
+                error_type=type(e).__name__
+            ).inc()
+            
+            # Log error; repeats of the same failure are counted, not re-logged
+            error_aggregator.report(
+                logger, e,
+                f"Request failed: {method} {path}",
+                request_id=request_id,
+                method=method,
+                path=path,
+                error_type=type(e).__name__,
+                error_message=str(e),
+                response_time=duration
             )
             
             # Re-raise the exception to be handled by exception handlers
             raise
+        finally:
+            ACTIVE_CONNECTIONS.dec()
+            REQUEST_CPU_GUARD.labels(endpoint=route_template(scope)).inc(timed.cpu_seconds)
@@ -0,0 +1,69 @@
+"""
+Multi-process (several uvicorn/gunicorn workers) metrics support.
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set, every worker writes its metric
+values to its own mmap'd ``*_<pid>.db`` files in that directory and a scrape
+of any worker aggregates all of them. Gauges declare how values from
+different workers combine through their ``multiprocess_mode``.
+"""
+
+import glob
+import os
+import re
+from typing import Iterable, List
+
+from prometheus_client import REGISTRY, CollectorRegistry, multiprocess
+
+_PID_RE = re.compile(r"_(\d+)\.db$")
+
+def multiprocess_dir() -> str:
+    """Return the metrics directory, or an empty string in single-process mode."""
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR", "")
+
+def build_registry(collectors: Iterable = ()) -> CollectorRegistry:
+    """
+    Return the registry to expose: an aggregating one in multi-process mode.
+    
+    ``collectors`` are custom collectors that compute their samples at scrape
+    time; they are registered on whichever registry is returned.
+    """
+    if not multiprocess_dir():
+        registry = REGISTRY
+    else:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    
+    for collector in collectors:
+        registry.register(collector)
+    return registry
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def cleanup_dead_workers() -> List[int]:
+    """
+    Drop the live-gauge files of workers that no longer exist.
+
+    Counter and histogram files are kept so totals do not go backwards when a
+    worker is recycled; only ``live*`` gauges are per-process state.
+    """
+    path = multiprocess_dir()
+    if not path:
+        return []
+    
+    pids = set()
+    for filename in glob.glob(os.path.join(path, "*.db")):
+        match = _PID_RE.search(filename)
+        if match:
+            pids.add(int(match.group(1)))
+    
+    dead = sorted(pid for pid in pids if not _pid_alive(pid))
+    for pid in dead:
+        multiprocess.mark_process_dead(pid, path)
+    return dead
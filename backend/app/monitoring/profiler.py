@@ -0,0 +1,116 @@
+"""
+On-demand sampling profiler.
+
+``SamplingProfiler.run`` samples the stacks of every other thread in the
+worker from a background thread, ``rate`` times per second for ``seconds``
+seconds, via ``sys._current_frames()``. The profiled code is not traced or
+slowed down between samples; each sample costs one frame walk per thread.
+Identical stacks are counted, and the result is rendered in the collapsed
+format that flamegraph.pl, speedscope and inferno read: one line per stack,
+``thread;outer;...;inner count``.
+
+Only one session runs at a time per worker; ``run`` raises
+``ProfilerBusy`` while another session is in progress.
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict
+
+from app.core.config import settings
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a profiling session is already running."""
+
+class ProfileResult:
+    """Aggregated stacks of one profiling session."""
+    
+    __slots__ = ("stacks", "samples", "duration", "rate")
+    
+    def __init__(self, stacks: Counter, samples: int, duration: float, rate: float):
+        self.stacks = stacks
+        self.samples = samples
+        self.duration = duration
+        self.rate = rate
+    
+    def collapsed(self) -> str:
+        """Collapsed-stack text, heaviest stacks first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+class SamplingProfiler:
+    """Stack-sampling profiler with a single-session guard."""
+    
+    def __init__(self, max_seconds: float = 60.0, max_rate: float = 1000.0):
+        self.max_seconds = max_seconds
+        self.max_rate = max_rate
+        self._session = threading.Lock()
+        self._labels: Dict[object, str] = {}
+    
+    @property
+    def busy(self) -> bool:
+        return self._session.locked()
+    
+    def run(self, seconds: float, rate: float = 100.0) -> ProfileResult:
+        """Sample for ``seconds`` at ``rate`` Hz, blocking the calling thread."""
+        if not 0 < seconds <= self.max_seconds:
+            raise ValueError(f"seconds must be in (0, {self.max_seconds}]")
+        if not 0 < rate <= self.max_rate:
+            raise ValueError(f"rate must be in (0, {self.max_rate}]")
+        if not self._session.acquire(blocking=False):
+            raise ProfilerBusy("A profiling session is already running")
+        try:
+            return self._sample(seconds, rate)
+        finally:
+            # Drop the label cache so it does not keep code objects alive
+            self._labels = {}
+            self._session.release()
+    
+    def _sample(self, seconds: float, rate: float) -> ProfileResult:
+        own_id = threading.get_ident()
+        interval = 1.0 / rate
+        stacks: Counter = Counter()
+        samples = 0
+        
+        start = time.monotonic()
+        deadline = start + seconds
+        next_sample = start
+        frame = None
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stacks[self._collapse(names.get(thread_id, str(thread_id)), frame)] += 1
+            del frame
+            samples += 1
+            
+            # Fixed schedule so slow samples do not stretch the interval
+            next_sample += interval
+            now = time.monotonic()
+            if next_sample >= deadline:
+                break
+            if next_sample > now:
+                time.sleep(next_sample - now)
+        
+        return ProfileResult(stacks, samples, time.monotonic() - start, rate)
+    
+    def _collapse(self, thread_name: str, frame) -> str:
+        labels = self._labels
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            label = labels.get(code)
+            if label is None:
+                label = labels[code] = f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+            parts.append(label)
+            frame = frame.f_back
+        parts.append(thread_name.replace(";", ":"))
+        parts.reverse()
+        return ";".join(parts)
+
+profiler = SamplingProfiler(
+    max_seconds=settings.PROFILER_MAX_SECONDS,
+    max_rate=settings.PROFILER_MAX_RATE
+)
@@ -1,3 +1,12 @@
+import os
+from app.core.config import settings
+
+# prometheus_client picks its value storage at import time, so multi-process
+# mode has to be switched on before the first import.
+if settings.PROMETHEUS_MULTIPROC_DIR:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.PROMETHEUS_MULTIPROC_DIR)
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
 from prometheus_client import Counter, Histogram, Gauge, start_http_server
 import time
 
@@ -13,15 +22,65 @@ REQUEST_DURATION = Histogram(
     'HTTP request duration'
 )
 
+ERROR_COUNT = Counter(
+    'http_errors_total',
+    'Total HTTP requests that raised an unhandled exception',
+    ['method', 'endpoint', 'error_type']
+)
+
+ERROR_FINGERPRINTS = Counter(
+    'application_errors_total',
+    'Handled exceptions by fingerprint (exception type and call site)',
+    ['fingerprint', 'exception_type']
+)
+
 # System Metrics
 ACTIVE_CONNECTIONS = Gauge(
     'active_connections', 
-    'Number of active connections'
+    'HTTP requests in flight, including open streams',
+    multiprocess_mode='livesum'
 )
 
 DATABASE_CONNECTIONS = Gauge(
     'database_connections_active', 
-    'Active database connections'
+    'Active database connections',
+    multiprocess_mode='livesum'
+)
+
+# Worker Process Metrics
+WORKER_RESIDENT_MEMORY = Gauge(
+    'worker_resident_memory_bytes',
+    'Resident memory of the worker process',
+    multiprocess_mode='liveall'
+)
+
+WORKER_OPEN_FDS = Gauge(
+    'worker_open_fds',
+    'Open file descriptors of the worker process',
+    multiprocess_mode='liveall'
+)
+
+EVENT_LOOP_LAG = Gauge(
+    'event_loop_lag_seconds',
+    'Delay of the last system sampler wakeup behind schedule',
+    multiprocess_mode='liveall'
+)
+
+EVENT_LOOP_LAG_HISTOGRAM = Histogram(
+    'event_loop_lag_histogram_seconds',
+    'Event-loop lag measured by the high-resolution loop monitor ticker',
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+SLOW_CALLBACKS = Counter(
+    'event_loop_slow_callbacks_total',
+    'Times the event loop was blocked for longer than the slow-callback threshold'
+)
+
+REQUEST_CPU_SECONDS = Counter(
+    'http_request_cpu_seconds_total',
+    'CPU time spent on the event loop thread handling requests',
+    ['endpoint']
 )
 
 # Business Metrics
@@ -38,31 +97,154 @@ API_CALLS = Counter(
 
 ERROR_RATE = Gauge(
     'error_rate_percentage', 
-    'Error rate percentage'
+    'Error rate percentage',
+    multiprocess_mode='livemax'
 )
 
 # Application Metrics
-INVENTORY_LEVELS = Gauge(
-    'inventory_levels', 
-    'Current inventory levels', 
-    ['product_id', 'category']
-)
-
+# Inventory levels are exported by app.monitoring.inventory_exporter
 SALES_VOLUME = Counter(
     'sales_volume_total', 
     'Total sales volume', 
     ['product_category']
 )
 
+SALES_EVENTS_DEAD_LETTERED = Counter(
+    'sales_events_dead_lettered_total',
+    'Sales events dropped because they could not be written to the store'
+)
+
+SUMMARY_DRIFT_REPAIRS = Counter(
+    'summary_drift_repairs_total',
+    'Summary rows corrected by the reconciliation job',
+    ['summary']
+)
+
 # Performance Metrics
+RESPONSE_TIME_P50 = Gauge(
+    'response_time_p50_seconds',
+    'Median response time over the latency window',
+    multiprocess_mode='livemax'
+)
+
 RESPONSE_TIME_P95 = Gauge(
     'response_time_p95_seconds',
-    '95th percentile response time'
+    '95th percentile response time',
+    multiprocess_mode='livemax'
+)
+
+RESPONSE_TIME_P99 = Gauge(
+    'response_time_p99_seconds',
+    '99th percentile response time over the latency window',
+    multiprocess_mode='livemax'
+)
+
+ROUTE_LATENCY = Gauge(
+    'route_response_time_seconds',
+    'Response time quantiles per route over the latency window',
+    ['endpoint', 'quantile'],
+    multiprocess_mode='livemax'
 )
 
 THROUGHPUT = Gauge(
     'requests_per_second',
-    'Current requests per second'
+    'Current requests per second',
+    multiprocess_mode='livesum'
+)
+
+# Alert Ingestion Metrics
+ALERTS_RECEIVED = Counter(
+    'alerts_received_total',
+    'Alerts received from AlertManager',
+    ['status']
+)
+
+ALERTS_DEDUPLICATED = Counter(
+    'alerts_deduplicated_total',
+    'Alerts skipped as duplicates of a recently processed fingerprint and status'
+)
+
+ALERT_PAYLOADS_REJECTED = Counter(
+    'alert_payloads_rejected_total',
+    'AlertManager webhook payloads rejected before processing',
+    ['reason']
+)
+
+ALERT_QUEUE_DEPTH = Gauge(
+    'alert_queue_depth',
+    'Webhook payloads waiting to be processed',
+    multiprocess_mode='livesum'
+)
+
+ALERT_PROCESSING_LATENCY = Histogram(
+    'alert_processing_latency_seconds',
+    'Time from webhook receipt to the end of alert processing'
+)
+
+# Dashboard Streaming Metrics
+DASHBOARD_SUBSCRIBERS = Gauge(
+    'dashboard_stream_subscribers',
+    'Clients subscribed to the live dashboard stream',
+    multiprocess_mode='livesum'
+)
+
+DASHBOARD_FRAMES_DROPPED = Counter(
+    'dashboard_stream_frames_dropped_total',
+    'Stale dashboard stream frames replaced before a slow client read them'
+)
+
+# AWS Inventory Metrics
+AWS_RESOURCES = Gauge(
+    'aws_resources',
+    'Inventoried AWS resources',
+    ['account', 'region', 'resource_type', 'state'],
+    multiprocess_mode='livemax'
+)
+
+AWS_SCAN_ERRORS = Counter(
+    'aws_scan_errors_total',
+    'AWS inventory scans that failed after retries',
+    ['resource_type', 'error']
+)
+
+AWS_COLLECTION_DURATION = Gauge(
+    'aws_collection_duration_seconds',
+    'Duration of the last AWS inventory collection cycle',
+    multiprocess_mode='livemax'
+)
+
+# Metrics about the metrics
+METRIC_SERIES = Gauge(
+    'metric_series',
+    'Current number of label series per guarded metric family',
+    ['metric'],
+    multiprocess_mode='livemax'
+)
+
+# Logging Metrics
+LOG_RECORDS_QUEUED = Counter(
+    'log_records_queued_total',
+    'Log records accepted by the background log writer'
+)
+
+LOG_RECORDS_DROPPED = Counter(
+    'log_records_dropped_total',
+    'Log records dropped because the log queue was full'
+)
+
+# Health Metrics
+HEALTH_CHECK_UP = Gauge(
+    'health_check_up',
+    'Result of the last health probe round per check: 1 ok, 0.5 degraded, 0 failing',
+    ['check'],
+    multiprocess_mode='liveall'
+)
+
+HEALTH_CHECK_DURATION = Gauge(
+    'health_check_duration_seconds',
+    'Duration of the last health probe per check',
+    ['check'],
+    multiprocess_mode='liveall'
 )
 
 def start_metrics_server(port: int = 8001):
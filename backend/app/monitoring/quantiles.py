@@ -0,0 +1,184 @@
+"""
+In-process streaming latency quantiles.
+
+``LatencyHistogram`` is an HDR-style log-linear histogram: values are
+bucketed by power of two, each power split into 32 linear sub-buckets, so
+any recorded latency is reproduced within ~3% using a fixed 7 KB array
+(896 buckets of 8-byte counts).
+Histograms merge by adding counts, which makes per-route histograms
+combinable into an overall one and makes time windows cheap: a
+``WindowedHistogram`` keeps one histogram per time slot and drops slots as
+they age out.
+
+``LatencyTracker`` keeps a windowed histogram per route, fed by the
+middleware, and periodically publishes p50/p95/p99 and requests per second
+to the Prometheus gauges so dashboards and alerts can read them directly
+instead of running ``histogram_quantile`` over buckets.
+"""
+
+import math
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from .cardinality import OVERFLOW_LABEL
+from .prometheus_metrics import (
+    RESPONSE_TIME_P50, RESPONSE_TIME_P95, RESPONSE_TIME_P99, THROUGHPUT, ROUTE_LATENCY
+)
+
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_VALUE_US = (1 << 32) - 1  # ~71 minutes
+BUCKET_COUNT = (32 - SUB_BUCKET_BITS + 1) * SUB_BUCKETS
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+def _bucket_index(value_us: int) -> int:
+    if value_us < SUB_BUCKETS:
+        return value_us
+    shift = value_us.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1) * SUB_BUCKETS + (value_us >> shift) - SUB_BUCKETS
+
+def _bucket_value(index: int) -> float:
+    """Midpoint of a bucket, in microseconds."""
+    if index < SUB_BUCKETS:
+        return float(index)
+    shift = index // SUB_BUCKETS - 1
+    sub = index % SUB_BUCKETS + SUB_BUCKETS
+    return ((sub << shift) + ((sub + 1) << shift) - 1) / 2
+
+class LatencyHistogram:
+    """Fixed-size log-linear histogram of durations."""
+    
+    __slots__ = ("counts", "count", "total")
+    
+    def __init__(self):
+        self.counts = array("L", bytes(BUCKET_COUNT * array("L").itemsize))
+        self.count = 0
+        self.total = 0.0
+    
+    def observe(self, seconds: float):
+        value_us = min(max(int(seconds * 1e6), 0), MAX_VALUE_US)
+        self.counts[_bucket_index(value_us)] += 1
+        self.count += 1
+        self.total += seconds
+    
+    def merge(self, other: "LatencyHistogram"):
+        """Add ``other``'s observations into this histogram."""
+        if not other.count:
+            return
+        counts = self.counts
+        for index, value in enumerate(other.counts):
+            if value:
+                counts[index] += value
+        self.count += other.count
+        self.total += other.total
+    
+    def reset(self):
+        if self.count:
+            self.counts = array("L", bytes(len(self.counts) * self.counts.itemsize))
+            self.count = 0
+            self.total = 0.0
+    
+    def quantiles(self, qs: Iterable[float] = QUANTILES) -> List[float]:
+        """Return the requested quantiles in seconds, in a single pass."""
+        qs = list(qs)
+        results = [0.0] * len(qs)
+        if not self.count:
+            return results
+        
+        order = sorted(range(len(qs)), key=lambda i: qs[i])
+        ranks = [max(1, math.ceil(qs[i] * self.count)) for i in order]
+        position = 0
+        seen = 0
+        for index, value in enumerate(self.counts):
+            if not value:
+                continue
+            seen += value
+            while position < len(order) and seen >= ranks[position]:
+                results[order[position]] = _bucket_value(index) / 1e6
+                position += 1
+            if position == len(order):
+                break
+        return results
+
+class WindowedHistogram:
+    """Sliding window of ``slots`` histograms covering ``window_seconds``."""
+    
+    __slots__ = ("slot_seconds", "_slots", "_epochs")
+    
+    def __init__(self, window_seconds: float = 60.0, slots: int = 6):
+        self.slot_seconds = window_seconds / slots
+        self._slots = [LatencyHistogram() for _ in range(slots)]
+        self._epochs = [-1] * slots
+    
+    def observe(self, seconds: float, now: Optional[float] = None):
+        epoch = int((time.monotonic() if now is None else now) // self.slot_seconds)
+        index = epoch % len(self._slots)
+        if self._epochs[index] != epoch:
+            self._slots[index].reset()
+            self._epochs[index] = epoch
+        self._slots[index].observe(seconds)
+    
+    def merged(self, now: Optional[float] = None, into: Optional[LatencyHistogram] = None) -> LatencyHistogram:
+        """Merge the slots still inside the window."""
+        epoch = int((time.monotonic() if now is None else now) // self.slot_seconds)
+        result = into if into is not None else LatencyHistogram()
+        oldest = epoch - len(self._slots) + 1
+        for slot_epoch, histogram in zip(self._epochs, self._slots):
+            if slot_epoch >= oldest:
+                result.merge(histogram)
+        return result
+
+class LatencyTracker:
+    """Per-route windowed latency histograms driving the latency gauges."""
+    
+    def __init__(self, window_seconds: float = 60.0, slots: int = 6, max_routes: int = 200):
+        self.window_seconds = window_seconds
+        self.slots = slots
+        self.max_routes = max_routes
+        self.routes: Dict[str, WindowedHistogram] = {}
+        self.quantiles: Dict[float, float] = {q: 0.0 for q in QUANTILES}
+        self.requests_per_second = 0.0
+        self._started = time.monotonic()
+    
+    def observe(self, route: str, seconds: float, now: Optional[float] = None):
+        histogram = self.routes.get(route)
+        if histogram is None:
+            if len(self.routes) >= self.max_routes:
+                route = OVERFLOW_LABEL
+                histogram = self.routes.get(route)
+            if histogram is None:
+                histogram = self.routes[route] = WindowedHistogram(self.window_seconds, self.slots)
+        histogram.observe(seconds, now)
+    
+    def refresh(self, now: Optional[float] = None):
+        """Recompute the windowed quantiles and publish them to the gauges."""
+        now = time.monotonic() if now is None else now
+        overall = LatencyHistogram()
+        
+        for route, windowed in self.routes.items():
+            histogram = windowed.merged(now)
+            overall.merge(histogram)
+            for q, value in zip(QUANTILES, histogram.quantiles()):
+                ROUTE_LATENCY.labels(endpoint=route, quantile=str(q)).set(value)
+        
+        self.quantiles = dict(zip(QUANTILES, overall.quantiles()))
+        # The merged slots cover the full older slots plus the elapsed part
+        # of the current one, not the whole window
+        slot_seconds = self.window_seconds / self.slots
+        covered = (self.slots - 1) * slot_seconds + now % slot_seconds
+        covered = min(covered, now - self._started) or slot_seconds
+        self.requests_per_second = overall.count / covered
+        
+        RESPONSE_TIME_P50.set(self.quantiles[0.5])
+        RESPONSE_TIME_P95.set(self.quantiles[0.95])
+        RESPONSE_TIME_P99.set(self.quantiles[0.99])
+        THROUGHPUT.set(self.requests_per_second)
+
+latency_tracker = LatencyTracker(
+    window_seconds=settings.LATENCY_WINDOW_SECONDS,
+    slots=settings.LATENCY_WINDOW_SLOTS,
+    max_routes=settings.METRICS_MAX_LABEL_VALUES
+)
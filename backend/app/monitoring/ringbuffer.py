@@ -0,0 +1,49 @@
+"""
+Fixed-size numeric ring buffer for rolling metric windows.
+"""
+
+from array import array
+from typing import List
+
+class RingBuffer:
+    """Circular buffer of floats; appending past capacity overwrites the oldest."""
+    
+    __slots__ = ("_data", "_size", "_next", "_count")
+    
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("RingBuffer size must be at least 1")
+        self._data = array("d", [0.0]) * size
+        self._size = size
+        self._next = 0
+        self._count = 0
+    
+    def append(self, value: float):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self._size
+        if self._count < self._size:
+            self._count += 1
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @property
+    def capacity(self) -> int:
+        return self._size
+    
+    def latest(self, default: float = 0.0) -> float:
+        if not self._count:
+            return default
+        return self._data[self._next - 1]
+    
+    def oldest(self, default: float = 0.0) -> float:
+        if not self._count:
+            return default
+        return self._data[(self._next - self._count) % self._size]
+    
+    def values(self) -> List[float]:
+        """Return the buffered values, oldest first."""
+        start = (self._next - self._count) % self._size
+        if start + self._count <= self._size:
+            return self._data[start:start + self._count].tolist()
+        return (self._data[start:] + self._data[:self._next]).tolist()
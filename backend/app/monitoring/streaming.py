@@ -0,0 +1,109 @@
+"""
+Server-Sent Events fan-out of the dashboard snapshot.
+
+Each aggregator tick is encoded once and handed to every subscriber. Frames
+are delta-encoded against the previous tick; a subscriber that has not read
+its previous frame by the next tick gets that stale frame replaced by a full
+snapshot, so slow readers never queue up frames and always resync to the
+current state.
+"""
+
+import asyncio
+from typing import Any, Dict, Optional, Set
+
+from app.core.config import settings
+from app.core.serialization import dumps
+from .aggregator import dashboard_aggregator
+from .prometheus_metrics import DASHBOARD_SUBSCRIBERS, DASHBOARD_FRAMES_DROPPED
+
+def diff_snapshot(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the nested keys of ``current`` whose values differ from ``previous``."""
+    delta = {}
+    for key, value in current.items():
+        old = previous.get(key)
+        if isinstance(value, dict) and isinstance(old, dict):
+            nested = diff_snapshot(old, value)
+            if nested:
+                delta[key] = nested
+        elif value != old:
+            delta[key] = value
+    return delta
+
+def encode_event(event: str, sequence: int, data: Dict[str, Any]) -> bytes:
+    return f"id: {sequence}\nevent: {event}\ndata: ".encode() + dumps(data) + b"\n\n"
+
+class Subscriber:
+    """Single-slot mailbox for one streaming client."""
+    
+    __slots__ = ("_frame", "_event", "dropped")
+    
+    def __init__(self, initial: Optional[bytes] = None):
+        self._frame = initial
+        self._event = asyncio.Event()
+        self.dropped = 0
+        if initial is not None:
+            self._event.set()
+    
+    def offer(self, delta_frame: bytes, snapshot_frame: bytes):
+        if self._frame is not None:
+            # The client missed a delta, so only a full snapshot is still valid
+            self._frame = snapshot_frame
+            self.dropped += 1
+            DASHBOARD_FRAMES_DROPPED.inc()
+        else:
+            self._frame = delta_frame
+        self._event.set()
+    
+    async def next_frame(self, timeout: float) -> Optional[bytes]:
+        """Wait for the next frame; return None on timeout."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        frame, self._frame = self._frame, None
+        self._event.clear()
+        return frame
+
+class SnapshotBroadcaster:
+    """Fans snapshots out to subscribers as snapshot/delta SSE frames."""
+    
+    def __init__(self, max_subscribers: int = 10000):
+        self.max_subscribers = max_subscribers
+        self.sequence = 0
+        self._snapshot: Dict[str, Any] = {}
+        self._snapshot_frame: Optional[bytes] = None
+        self._subscribers: Set[Subscriber] = set()
+    
+    def __len__(self) -> int:
+        return len(self._subscribers)
+    
+    def subscribe(self) -> Optional[Subscriber]:
+        """Register a client; returns None when the subscriber limit is reached."""
+        if len(self._subscribers) >= self.max_subscribers:
+            return None
+        subscriber = Subscriber(self._snapshot_frame)
+        self._subscribers.add(subscriber)
+        DASHBOARD_SUBSCRIBERS.inc()
+        return subscriber
+    
+    def unsubscribe(self, subscriber: Subscriber):
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+            DASHBOARD_SUBSCRIBERS.dec()
+    
+    def publish(self, snapshot: Dict[str, Any]):
+        """Encode ``snapshot`` once and offer it to every subscriber."""
+        delta = diff_snapshot(self._snapshot, snapshot)
+        if not delta and self._snapshot_frame is not None:
+            return
+        
+        self.sequence += 1
+        self._snapshot = snapshot
+        self._snapshot_frame = encode_event("snapshot", self.sequence, snapshot)
+        delta_frame = encode_event("delta", self.sequence, delta)
+        
+        for subscriber in self._subscribers:
+            subscriber.offer(delta_frame, self._snapshot_frame)
+
+dashboard_broadcaster = SnapshotBroadcaster(settings.DASHBOARD_STREAM_MAX_SUBSCRIBERS)
+dashboard_aggregator.add_listener(dashboard_broadcaster.publish)
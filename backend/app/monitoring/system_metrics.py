@@ -0,0 +1,220 @@
+"""
+Host and worker-process metrics sampler.
+
+A background task reads ``/proc/stat``, ``/proc/meminfo``, ``/proc/net/dev``
+and ``statvfs`` once per tick. It turns the kernel's cumulative CPU and
+network counters into per-tick utilisation and rates, and keeps a few minutes
+of history in fixed-size ring buffers. The ``/proc`` files are opened once
+and re-read with ``pread`` at offset 0, so a tick does not open or close any
+files. The parsers only slice the few fields they need out of the raw bytes.
+
+The same tick sets the worker gauges (resident memory, open file descriptors)
+and measures event-loop lag as the delay between when the tick should have
+woken up and when it did. The dashboard reads ``latest()``, a dict built on
+the tick, so its request path makes no syscalls.
+
+On systems without ``/proc`` the host values read as zero.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from .prometheus_metrics import WORKER_RESIDENT_MEMORY, WORKER_OPEN_FDS, EVENT_LOOP_LAG
+from .ringbuffer import RingBuffer
+
+logger = get_logger("system_metrics")
+
+_READ_SIZE = 1 << 16
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def parse_cpu(stat: bytes) -> Tuple[int, int]:
+    """Total and idle (idle + iowait) jiffies from the aggregate ``cpu`` line."""
+    fields = stat[:stat.find(b"\n")].split()
+    # user nice system idle iowait irq softirq steal; guest time is already in user
+    values = [int(value) for value in fields[1:9]]
+    return sum(values), values[3] + values[4]
+
+def parse_meminfo_field(meminfo: bytes, key: bytes) -> int:
+    """A ``/proc/meminfo`` value in bytes, or 0 if the key is missing."""
+    start = meminfo.find(key)
+    if start < 0:
+        return 0
+    end = meminfo.find(b"kB", start)
+    return int(meminfo[start + len(key):end]) * 1024
+
+def parse_net(netdev: bytes) -> Tuple[int, int]:
+    """Received and transmitted bytes summed over non-loopback interfaces."""
+    rx = tx = 0
+    # Two header lines, then "iface: rx_bytes packets ... tx_bytes ..."
+    for line in netdev.split(b"\n")[2:]:
+        name, sep, counters = line.partition(b":")
+        if not sep or name.strip() == b"lo":
+            continue
+        fields = counters.split()
+        rx += int(fields[0])
+        tx += int(fields[8])
+    return rx, tx
+
+class _ProcFile:
+    """A ``/proc`` file kept open and re-read from offset 0."""
+    
+    __slots__ = ("path", "fd")
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.fd: Optional[int] = None
+    
+    def read(self) -> bytes:
+        if self.fd is None:
+            try:
+                self.fd = os.open(self.path, os.O_RDONLY)
+            except OSError:
+                return b""
+        try:
+            return os.pread(self.fd, _READ_SIZE, 0)
+        except OSError:
+            self.close()
+            return b""
+    
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+class SystemSampler:
+    """Samples host and process metrics on a fixed tick into ring buffers."""
+    
+    def __init__(self, tick_seconds: float = 1.0, history_seconds: float = 300.0,
+                 disk_path: str = "/"):
+        self.tick_seconds = tick_seconds
+        self.disk_path = disk_path
+        size = max(2, int(round(history_seconds / tick_seconds)))
+        
+        self.timestamps = RingBuffer(size)
+        self.cpu_usage = RingBuffer(size)
+        self.memory_usage = RingBuffer(size)
+        self.disk_usage = RingBuffer(size)
+        self.network_rx = RingBuffer(size)
+        self.network_tx = RingBuffer(size)
+        self.loop_lag = RingBuffer(size)
+        
+        self._stat = _ProcFile("/proc/stat")
+        self._meminfo = _ProcFile("/proc/meminfo")
+        self._netdev = _ProcFile("/proc/net/dev")
+        self._statm = _ProcFile("/proc/self/statm")
+        self._fd_dir = "/proc/self/fd"
+        
+        self._previous: Optional[Tuple[float, int, int, int, int]] = None
+        self._latest: Dict[str, Any] = {
+            "cpu_usage": 0.0, "memory_usage": 0.0, "disk_usage": 0.0, "network_io": 0.0
+        }
+        self._task: Optional[asyncio.Task] = None
+    
+    def latest(self) -> Dict[str, Any]:
+        """The most recent sample, as precomputed on the last tick."""
+        return self._latest
+    
+    def tick(self, now: Optional[float] = None, lag: float = 0.0):
+        """Take one sample and update the history, gauges and latest values."""
+        now = time.monotonic() if now is None else now
+        
+        stat = self._stat.read()
+        total, idle = parse_cpu(stat) if stat else (0, 0)
+        netdev = self._netdev.read()
+        rx, tx = parse_net(netdev) if netdev else (0, 0)
+        
+        cpu = rx_rate = tx_rate = 0.0
+        if self._previous is not None:
+            last_now, last_total, last_idle, last_rx, last_tx = self._previous
+            elapsed = now - last_now
+            if total > last_total:
+                cpu = (1 - (idle - last_idle) / (total - last_total)) * 100
+            if elapsed > 0:
+                # Counters reset when an interface goes away
+                rx_rate = max(rx - last_rx, 0) / elapsed
+                tx_rate = max(tx - last_tx, 0) / elapsed
+        self._previous = (now, total, idle, rx, tx)
+        
+        meminfo = self._meminfo.read()
+        memory = 0.0
+        if meminfo:
+            mem_total = parse_meminfo_field(meminfo, b"MemTotal:")
+            mem_available = parse_meminfo_field(meminfo, b"MemAvailable:")
+            if mem_total:
+                memory = (1 - mem_available / mem_total) * 100
+        
+        disk = 0.0
+        try:
+            fs = os.statvfs(self.disk_path)
+            if fs.f_blocks:
+                disk = (1 - fs.f_bavail / fs.f_blocks) * 100
+        except OSError:
+            pass
+        
+        self.timestamps.append(now)
+        self.cpu_usage.append(cpu)
+        self.memory_usage.append(memory)
+        self.disk_usage.append(disk)
+        self.network_rx.append(rx_rate)
+        self.network_tx.append(tx_rate)
+        self.loop_lag.append(lag)
+        
+        self._sample_process()
+        EVENT_LOOP_LAG.set(lag)
+        
+        self._latest = {
+            "cpu_usage": round(cpu, 2),
+            "memory_usage": round(memory, 2),
+            "disk_usage": round(disk, 2),
+            # MB/s received plus transmitted, as the dashboard labels it
+            "network_io": round((rx_rate + tx_rate) / (1024 * 1024), 2)
+        }
+    
+    def _sample_process(self):
+        statm = self._statm.read()
+        if statm:
+            # size resident shared ... in pages
+            WORKER_RESIDENT_MEMORY.set(int(statm.split(None, 2)[1]) * _PAGE_SIZE)
+        try:
+            WORKER_OPEN_FDS.set(len(os.listdir(self._fd_dir)))
+        except OSError:
+            pass
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            # How late this wakeup is: time the loop spent on other callbacks
+            lag = max(loop.time() - deadline, 0.0)
+            try:
+                self.tick(lag=lag)
+            except Exception as e:
+                logger.error("System metrics sample failed", error_message=str(e))
+            deadline = loop.time() + self.tick_seconds
+            await asyncio.sleep(self.tick_seconds)
+    
+    def start(self):
+        """Start the background sampling task on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self):
+        """Cancel the background sampling task and close the /proc files."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for proc_file in (self._stat, self._meminfo, self._netdev, self._statm):
+            proc_file.close()
+
+system_sampler = SystemSampler(
+    tick_seconds=settings.SYSTEM_SAMPLE_SECONDS,
+    history_seconds=settings.SYSTEM_HISTORY_SECONDS
+)
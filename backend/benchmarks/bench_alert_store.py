@@ -0,0 +1,112 @@
+"""
+AlertStore ingest and query benchmark.
+
+Loads N alerts (default 100k) spread over alert names, severities and teams,
+resolves a share of them, then times indexed queries against a naive scan
+over a plain list of alert dicts answering the same questions.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_alert_store [--alerts N]
+"""
+
+import argparse
+import random
+import time
+
+from app.monitoring.alert_store import AlertStore
+
+SEVERITIES = ["critical", "warning", "info"]
+TEAMS = ["backend", "infrastructure", "business"]
+
+
+def make_alerts(count: int, names: int):
+    rng = random.Random(42)
+    alerts = []
+    for index in range(count):
+        alerts.append({
+            "status": "firing",
+            "fingerprint": f"{index:016x}",
+            "labels": {
+                "alertname": f"Alert{rng.randrange(names)}",
+                "severity": rng.choice(SEVERITIES),
+                "team": rng.choice(TEAMS),
+                "instance": f"host-{index}",
+            },
+        })
+    return alerts
+
+
+def timed(fn, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1e6, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--alerts", type=int, default=100000)
+    parser.add_argument("--names", type=int, default=500)
+    parser.add_argument("--resolved-fraction", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    alerts = make_alerts(args.alerts, args.names)
+    store = AlertStore(resolved_retention=3600, resolved_max=args.alerts)
+
+    start = time.perf_counter()
+    for alert in alerts:
+        store.upsert(alert)
+    resolved = alerts[: int(args.alerts * args.resolved_fraction)]
+    for alert in resolved:
+        alert["status"] = "resolved"
+        store.upsert(alert)
+    elapsed = time.perf_counter() - start
+    updates = args.alerts + len(resolved)
+    print(f"ingest: {updates} updates in {elapsed:.2f}s ({updates / elapsed:,.0f}/s)")
+    print(f"store:  {store.stats()}")
+
+    by_fingerprint = {alert["fingerprint"]: alert for alert in alerts}
+    rows = list(by_fingerprint.values())
+
+    def scan(status=None, **labels):
+        return [
+            row for row in rows
+            if (status is None or row["status"] == status)
+            and all(row["labels"].get(key) == value for key, value in labels.items())
+        ]
+
+    def scan_counts():
+        counts = {}
+        for row in rows:
+            if row["status"] == "firing":
+                severity = row["labels"]["severity"]
+                counts[severity] = counts.get(severity, 0) + 1
+        return counts
+
+    queries = [
+        ("alertname=Alert7 (firing)",
+         lambda: store.query(status="firing", alertname="Alert7"),
+         lambda: scan(status="firing", alertname="Alert7")),
+        ("alertname=Alert7, severity=critical",
+         lambda: store.query(alertname="Alert7", severity="critical"),
+         lambda: scan(alertname="Alert7", severity="critical")),
+        ("team=backend, severity=critical (firing, limit 100)",
+         lambda: store.query(status="firing", limit=100, team="backend", severity="critical"),
+         lambda: scan(status="firing", team="backend", severity="critical")[:100]),
+        ("counts by severity",
+         store.counts_by_severity,
+         scan_counts),
+    ]
+
+    print(f"\n{'query':<52} {'indexed us':>11} {'scan us':>11} {'speedup':>8}")
+    for name, indexed, naive in queries:
+        indexed_us, indexed_result = timed(indexed, args.repeat)
+        naive_us, naive_result = timed(naive, max(1, args.repeat // 10))
+        assert len(indexed_result) == len(naive_result), name
+        print(f"{name:<52} {indexed_us:>11.1f} {naive_us:>11.1f} {naive_us / indexed_us:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
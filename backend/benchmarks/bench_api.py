@@ -0,0 +1,127 @@
+"""
+In-process load test of the API's hot endpoints.
+
+Drives ``app.main:app`` through httpx's ASGI transport (no sockets) with the
+application lifespan running, so the dashboard aggregator, alert queue and
+metrics middleware behave as they do in a worker. For each endpoint,
+``--concurrency`` client tasks issue ``--requests`` requests between them.
+The run reports throughput and latency percentiles, and ``--output`` saves
+them for ``benchmarks.compare``.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_api [--requests N] [--concurrency N] [--output FILE]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+
+from app.main import app
+from benchmarks.results import latency_summary, print_table, save
+
+WEBHOOK_PAYLOAD = {
+    "version": "4",
+    "status": "firing",
+    "receiver": "web.hook",
+    "groupKey": "{}:{alertname=\"HighErrorRate\"}",
+    "alerts": [
+        {
+            "status": "firing",
+            "labels": {
+                "alertname": "HighErrorRate",
+                "severity": "critical",
+                "team": "backend",
+                "instance": f"api-{index}",
+            },
+            "annotations": {"summary": "Error rate above 5%"},
+            "startsAt": "2024-01-01T00:00:00Z",
+            "fingerprint": f"{index:016x}",
+        }
+        for index in range(5)
+    ],
+}
+
+ENDPOINTS = [
+    ("GET /health", "GET", "/health", None),
+    ("GET /api/v1/dashboard/metrics", "GET", "/api/v1/dashboard/metrics", None),
+    ("GET /api/v1/metrics/", "GET", "/api/v1/metrics/", None),
+    ("POST /api/v1/webhook/webhook", "POST", "/api/v1/webhook/webhook", WEBHOOK_PAYLOAD),
+]
+
+
+async def load(client: httpx.AsyncClient, method: str, path: str, payload,
+               requests: int, concurrency: int):
+    latencies = []
+    statuses = {}
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await client.request(method, path, json=payload)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return latencies, elapsed, statuses
+
+
+async def run(args):
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, method, path, payload in ENDPOINTS:
+                await load(client, method, path, payload, args.warmup, args.concurrency)
+                latencies, elapsed, statuses = await load(
+                    client, method, path, payload, args.requests, args.concurrency
+                )
+                unexpected = {status: count for status, count in statuses.items() if status >= 400}
+                if unexpected:
+                    print(f"warning: {name} returned {unexpected}")
+                results[name] = {
+                    "rps": round(len(latencies) / elapsed, 1),
+                    **latency_summary(latencies),
+                    # 4xx/5xx responses, e.g. 503s once the alert queue applies backpressure
+                    "errors": sum(unexpected.values()),
+                }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument(
+        "--with-logging", action="store_true",
+        help="keep per-request logging enabled"
+    )
+    args = parser.parse_args()
+
+    if not args.with_logging:
+        for name in ("middleware", "main", "webhook", "alerts"):
+            logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    results = asyncio.run(run(args))
+    print_table(results)
+    if args.output:
+        params = {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "with_logging": args.with_logging,
+        }
+        save(args.output, "api", results, params)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Error-storm benchmark of the exception path.
+
+Builds an app wired like ``app.main`` (pure ASGI metrics middleware plus the
+exception handlers) whose only endpoint raises, and drives ``--requests``
+failing requests through its ASGI interface as fast as possible with real
+logging enabled (log files in a scratch directory, console to /dev/null).
+Failures are spread over ``--fingerprints`` distinct exception types.
+
+It compares a zero log window, where every failure formats and logs its
+traceback (the behaviour before error aggregation), with the configured
+window, where each fingerprint is logged once per window. It reports
+throughput, cost per request, log records written, and the CPU cores a
+worker would need to absorb 10k failing requests per second.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_error_storm [--requests N] [--fingerprints N]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from fastapi import FastAPI, HTTPException
+
+from app.core.exceptions import (
+    MonitoringException,
+    error_aggregator,
+    general_exception_handler,
+    http_exception_handler,
+    monitoring_exception_handler,
+)
+from app.core.logging import configure_logging, get_log_queue_stats, shutdown_logging
+from app.monitoring.middleware import PrometheusASGIMiddleware
+from benchmarks.bench_middleware import make_scope
+
+STORM_RATE = 10000
+
+
+def build_app(fingerprints: int) -> FastAPI:
+    errors = [type(f"StormError{index}", (RuntimeError,), {}) for index in range(fingerprints)]
+    app = FastAPI()
+
+    @app.get("/fail/{index}")
+    async def fail(index: int):
+        raise errors[index % fingerprints]("backend unavailable")
+
+    app.add_middleware(PrometheusASGIMiddleware)
+    app.add_exception_handler(MonitoringException, monitoring_exception_handler)
+    app.add_exception_handler(HTTPException, http_exception_handler)
+    app.add_exception_handler(Exception, general_exception_handler)
+    return app
+
+
+async def drive(app, requests: int) -> float:
+    async def send(message):
+        pass
+
+    async def call(index):
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await asyncio.Event().wait()
+
+        try:
+            await app(make_scope(f"/fail/{index}"), receive, send)
+        except Exception:
+            # Starlette re-raises after the handler has sent the 500
+            pass
+
+    start = time.perf_counter()
+    for index in range(requests):
+        await call(index)
+    return time.perf_counter() - start
+
+
+def run(app, requests: int, window: float):
+    error_aggregator.window_seconds = window
+    error_aggregator._groups.clear()
+    queued = get_log_queue_stats()["queued"]
+    cpu = time.process_time()
+    elapsed = asyncio.run(drive(app, requests))
+    cpu = time.process_time() - cpu
+    logged = get_log_queue_stats()["queued"] - queued
+    return requests / elapsed, cpu / requests * 1e6, logged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--fingerprints", type=int, default=5)
+    parser.add_argument("--window", type=float, default=60.0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="error-storm-")
+    os.chdir(workdir)
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        configure_logging()
+    finally:
+        sys.stdout = stdout
+    if get_log_queue_stats() is None:
+        sys.exit("This benchmark needs LOG_QUEUE_ENABLED=true to count log records")
+
+    app = build_app(args.fingerprints)
+    asyncio.run(drive(app, 200))
+
+    print(f"{'log window':<22} {'req/s':>9} {'cpu us/req':>11} {'log records':>12} {'cores @10k/s':>13}")
+    for label, window in (("every failure (0 s)", 0.0), (f"aggregated ({args.window:g} s)", args.window)):
+        rate, cpu_us, logged = run(app, args.requests, window)
+        cores = cpu_us * STORM_RATE / 1e6
+        print(f"{label:<22} {rate:>9,.0f} {cpu_us:>11.1f} {logged:>12,} {cores:>13.2f}")
+
+    shutdown_logging()
+    print(f"\nlogs written to {workdir}")
+
+
+if __name__ == "__main__":
+    main()
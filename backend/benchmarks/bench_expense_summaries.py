@@ -0,0 +1,124 @@
+"""
+Expense summary read latency against data size.
+
+Fills an in-memory SQLite database with N expenses spread over categories
+and a year of days, in growing steps (default 10k, 100k, 1M rows). At each
+size the reconciler builds or repairs the summary table, and the benchmark
+times ``GET /expenses``'s summary read against the naive ``GROUP BY
+category, day`` over the expenses table that it replaces. Finally it reports
+the cost of the write path, which inserts an expense and bumps its summary
+row in one transaction.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_expense_summaries [--sizes 10000,100000,1000000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["DB_CREATE_TABLES"] = "true"
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.data.database import dispose_engine, get_engine, init_models
+from app.data.models import Expense
+from app.data.repositories import ExpenseRepository
+from app.data.schemas import ExpenseCreate
+from app.data.summaries import SummaryReconciler
+
+CATEGORIES = [
+    "office", "travel", "salaries", "marketing", "utilities", "rent", "software",
+    "hardware", "training", "legal", "insurance", "shipping", "maintenance",
+    "meals", "consulting", "taxes", "licenses", "advertising", "events", "other",
+]
+START_DAY = date(2024, 1, 1)
+BATCH = 10000
+
+
+def make_rows(rng: random.Random, count: int):
+    rows = []
+    for _ in range(count):
+        day = START_DAY + timedelta(days=rng.randrange(365))
+        rows.append({
+            "expense_id": f"{rng.getrandbits(64):016x}",
+            "category": rng.choice(CATEGORIES),
+            "amount": round(rng.uniform(1, 500), 2),
+            "incurred_at": datetime(day.year, day.month, day.day, rng.randrange(24)),
+            "day": day,
+        })
+    return rows
+
+
+async def timed(fn, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = await fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+async def run(args):
+    await init_models()
+    engine = get_engine()
+    reconciler = SummaryReconciler()
+    rng = random.Random(42)
+
+    print(f"{'expenses':>10} {'summary rows':>13} {'reconcile ms':>13} "
+          f"{'summary read ms':>16} {'GROUP BY ms':>12} {'speedup':>8}")
+    loaded = 0
+    for size in args.sizes:
+        while loaded < size:
+            count = min(BATCH, size - loaded)
+            async with engine.begin() as connection:
+                await connection.execute(insert(Expense), make_rows(rng, count))
+            loaded += count
+
+        start = time.perf_counter()
+        await reconciler.reconcile()
+        reconcile_ms = (time.perf_counter() - start) * 1000
+
+        naive = (
+            select(Expense.category, Expense.day, func.sum(Expense.amount), func.count())
+            .group_by(Expense.category, Expense.day)
+            .order_by(Expense.day.desc(), Expense.category)
+        )
+        async with AsyncSession(engine) as session:
+            repository = ExpenseRepository(session)
+            summary_ms, summaries = await timed(repository.summaries, args.repeat)
+            naive_ms, grouped = await timed(lambda: session.execute(naive), args.repeat)
+        assert len(summaries) == len(grouped.all())
+
+        print(f"{size:>10,} {len(summaries):>13,} {reconcile_ms:>13.1f} "
+              f"{summary_ms:>16.2f} {naive_ms:>12.2f} {naive_ms / summary_ms:>7.1f}x")
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        repository = ExpenseRepository(session)
+        start = time.perf_counter()
+        for index in range(args.writes):
+            await repository.create(ExpenseCreate(category=CATEGORIES[index % len(CATEGORIES)], amount=10.0))
+        write_us = (time.perf_counter() - start) / args.writes * 1e6
+    print(f"\nwrite path (insert + summary bump, one transaction): {write_us:.0f} us/expense")
+
+    await dispose_engine()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", default="10000,100000,1000000",
+        type=lambda value: [int(size) for size in value.split(",")]
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--writes", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Readiness endpoint load test: cached probe results against probing per request.
+
+Registers ``--probes`` fake dependency probes on a private ``HealthMonitor``.
+Each probe waits ``--probe-latency`` ms, like a network round trip, and
+counts its calls. Two readiness routes are then polled through httpx's ASGI
+transport. One serves the cached result of the background rounds, as the
+API does. The other runs a probe round on every request, as a naive
+readiness check would. The run reports throughput, latency percentiles and
+how many probe calls reached the fake dependencies.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_health [--requests N] [--concurrency N] [--output FILE]
+"""
+
+import argparse
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+from app.monitoring.health import OK, HealthMonitor
+from benchmarks.bench_api import load
+from benchmarks.results import latency_summary, print_table, save
+
+
+def build_app(monitor: HealthMonitor) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ready")
+    async def ready():
+        status_code, body = monitor.readiness()
+        return Response(body, status_code=status_code, media_type="application/json")
+
+    @app.get("/ready-probing")
+    async def ready_probing():
+        await monitor.run_once()
+        status_code, body = monitor.readiness()
+        return Response(body, status_code=status_code, media_type="application/json")
+
+    return app
+
+
+async def run(args):
+    calls = {"count": 0}
+    latency = args.probe_latency / 1000
+
+    async def probe():
+        calls["count"] += 1
+        await asyncio.sleep(latency)
+        return OK, {}
+
+    monitor = HealthMonitor(interval=args.interval, default_timeout=1.0)
+    for index in range(args.probes):
+        monitor.register(f"dependency-{index}", probe)
+    monitor.start()
+    app = build_app(monitor)
+
+    results = {}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            await monitor.run_once()
+            for name, path in (("cached", "/ready"), ("probe per request", "/ready-probing")):
+                before = calls["count"]
+                latencies, elapsed, statuses = await load(
+                    client, "GET", path, None, args.requests, args.concurrency
+                )
+                results[name] = {
+                    "rps": round(len(latencies) / elapsed, 1),
+                    **latency_summary(latencies),
+                    "probe_calls": calls["count"] - before,
+                    "errors": sum(count for status, count in statuses.items() if status >= 400),
+                }
+    finally:
+        await monitor.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--probes", type=int, default=4)
+    parser.add_argument("--probe-latency", type=float, default=5.0, help="simulated ms per probe")
+    parser.add_argument("--interval", type=float, default=10.0, help="seconds between probe rounds")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_table(results)
+    if args.output:
+        params = {"requests": args.requests, "concurrency": args.concurrency, "probes": args.probes,
+                  "probe_latency": args.probe_latency, "interval": args.interval}
+        save(args.output, "health", results, params)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Micro-benchmarks of the monitoring hot paths.
+
+- ``JSONFormatter.format`` on a record with the middleware's extra fields
+- ``PrometheusMiddleware.dispatch`` around a trivial ``call_next``
+- ``generate_latest`` on a private registry shaped like ours (request
+  counter, error counter and per-route histogram) at several series counts
+
+Each case reports the mean cost per call and calls per second. ``--output``
+saves the results for ``benchmarks.compare``.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_micro [--series 1000,10000] [--output FILE]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.logging import JSONFormatter
+from app.monitoring.middleware import PrometheusMiddleware
+from benchmarks.bench_middleware import make_scope
+from benchmarks.results import print_table, save
+
+METHODS = ["GET", "POST", "PUT", "DELETE"]
+STATUSES = [200, 201, 204, 400, 404, 500]
+
+
+def timed(fn, calls: int):
+    for _ in range(min(calls // 10, 1000)):
+        fn()
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        fn()
+    per_call = (time.perf_counter_ns() - start) / calls / 1000
+    return {"us_per_call": round(per_call, 3), "calls_per_s": round(1e6 / per_call, 1)}
+
+
+def bench_formatter(calls: int):
+    formatter = JSONFormatter()
+    record = logging.makeLogRecord({
+        "name": "middleware",
+        "levelno": logging.INFO,
+        "levelname": "INFO",
+        "msg": "API Request: GET /api/v1/dashboard/metrics - 200",
+        "module": "middleware",
+        "funcName": "send_wrapper",
+        "lineno": 150,
+        "extra_fields": {
+            "request_method": "GET",
+            "request_path": "/api/v1/dashboard/metrics",
+            "status_code": 200,
+            "response_time_ms": 1.734,
+            "request_id": 140234567890,
+        },
+    })
+    return timed(lambda: formatter.format(record), calls)
+
+
+def bench_dispatch(calls: int):
+    middleware = PrometheusMiddleware(app=None)
+    response = Response(b"{}", media_type="application/json")
+
+    async def call_next(request):
+        return response
+
+    async def run():
+        scope = make_scope("/api/v1/dashboard/metrics")
+        for _ in range(min(calls // 10, 1000)):
+            await middleware.dispatch(Request(scope), call_next)
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            await middleware.dispatch(Request(scope), call_next)
+        return (time.perf_counter_ns() - start) / calls / 1000
+
+    per_call = asyncio.run(run())
+    return {"us_per_call": round(per_call, 3), "calls_per_s": round(1e6 / per_call, 1)}
+
+
+def build_registry(series: int) -> CollectorRegistry:
+    """A registry with about ``series`` exposed samples, mostly request counters."""
+    registry = CollectorRegistry()
+    requests = Counter(
+        "http_requests", "Total HTTP requests", ["method", "endpoint", "status"], registry=registry
+    )
+    errors = Counter(
+        "http_errors", "Unhandled errors", ["method", "endpoint", "error_type"], registry=registry
+    )
+    latency = Histogram("route_latency_seconds", "Route latency", ["endpoint"], registry=registry)
+
+    # A labelled histogram child exposes its buckets plus _count, _sum and _created
+    histogram_samples = len(Histogram.DEFAULT_BUCKETS) + 3
+    routes = max(series // (2 * len(METHODS) * len(STATUSES)), 1)
+    for route in range(routes):
+        endpoint = f"/api/v1/resource{route}/{{item_id}}"
+        for method in METHODS:
+            for status in STATUSES:
+                requests.labels(method, endpoint, status).inc(route + 1)
+            errors.labels(method, endpoint, "ValueError").inc()
+    for route in range(max(series // 4 // histogram_samples, 1)):
+        latency.labels(f"/api/v1/resource{route}/{{item_id}}").observe(0.01 * (route % 50))
+    return registry
+
+
+def bench_exposition(series: int, calls: int):
+    registry = build_registry(series)
+    samples = sum(len(family.samples) for family in registry.collect())
+    payload = generate_latest(registry)
+    result = timed(lambda: generate_latest(registry), calls)
+    return {"samples": samples, "bytes": len(payload), **result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--series", default="1000,10000,50000", help="comma-separated series counts")
+    parser.add_argument("--renders", type=int, default=20, help="generate_latest calls per series count")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument(
+        "--with-logging", action="store_true",
+        help="keep the middleware request logging enabled"
+    )
+    args = parser.parse_args()
+
+    if not args.with_logging:
+        logging.getLogger("middleware").setLevel(logging.CRITICAL)
+
+    results = {
+        "JSONFormatter.format": bench_formatter(args.calls),
+        "PrometheusMiddleware.dispatch": bench_dispatch(args.calls),
+    }
+    series_counts = [int(count) for count in args.series.split(",")]
+    for series in series_counts:
+        results[f"generate_latest {series} series"] = bench_exposition(series, args.renders)
+
+    print_table(results)
+    if args.output:
+        params = {"calls": args.calls, "series": series_counts, "renders": args.renders,
+                  "with_logging": args.with_logging}
+        save(args.output, "micro", results, params)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Per-request overhead of the Prometheus middlewares.
+
+Drives a minimal FastAPI app directly through its ASGI interface (no
+network, no HTTP client) with no middleware, the BaseHTTPMiddleware-based
+PrometheusMiddleware and the pure ASGI PrometheusASGIMiddleware, and
+reports the mean cost per request.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_middleware [--requests N] [--with-logging]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI
+
+from app.monitoring.middleware import PrometheusMiddleware, PrometheusASGIMiddleware
+
+
+def build_app(middleware=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+def make_scope(path: str = "/ping") -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"user-agent", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def run(app, requests: int) -> float:
+    async def send(message):
+        pass
+
+    # Warm up routing, pydantic and the lifespan-free startup paths
+    for _ in range(200):
+        await call(app, send)
+
+    start = time.perf_counter_ns()
+    for _ in range(requests):
+        await call(app, send)
+    return (time.perf_counter_ns() - start) / requests / 1000
+
+
+async def call(app, send):
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # Never disconnect: park like a real server would
+        await asyncio.Event().wait()
+
+    await app(make_scope(), receive, send)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument(
+        "--with-logging", action="store_true",
+        help="keep the middleware request logging enabled"
+    )
+    args = parser.parse_args()
+
+    if not args.with_logging:
+        logging.getLogger("middleware").setLevel(logging.CRITICAL)
+
+    variants = [
+        ("no middleware", None),
+        ("PrometheusMiddleware (BaseHTTPMiddleware)", PrometheusMiddleware),
+        ("PrometheusASGIMiddleware (pure ASGI)", PrometheusASGIMiddleware),
+    ]
+
+    results = {}
+    for name, middleware in variants:
+        results[name] = asyncio.run(run(build_app(middleware), args.requests))
+
+    baseline = results["no middleware"]
+    print(f"{'variant':<45} {'us/request':>12} {'overhead us':>12}")
+    for name, per_request in results.items():
+        print(f"{name:<45} {per_request:>12.1f} {per_request - baseline:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Product search benchmark: in-memory index vs. a LIKE '%term%' scan.
+
+Builds a synthetic catalog (default 1M products), indexes it with
+ProductSearchIndex, and loads the same rows into an in-memory SQLite table.
+Then it times a set of typical search-box queries against both: the index
+search and ``WHERE name LIKE '%term%' OR category LIKE '%term%'`` with the
+same page size.
+
+``--sync-products`` rows are also loaded into an aiosqlite database, and
+``ProductSearchIndex.sync`` is timed on them, as the first search request
+runs it: a full build, with the longest event loop stall it caused, then
+an incremental sync after another 1% of products is added.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_product_search [--products N] [--sync-products N]
+"""
+
+import argparse
+import asyncio
+import random
+import sqlite3
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.data.database import create_engine
+from app.data.models import Base, Product
+from app.data.search import ProductSearchIndex
+
+ADJECTIVES = [
+    "blue", "red", "green", "black", "white", "silver", "compact", "deluxe", "heavy",
+    "light", "mini", "pro", "ultra", "classic", "modern", "rugged", "smart", "eco",
+    "premium", "basic", "portable", "wireless", "digital", "vintage", "industrial",
+]
+MATERIALS = [
+    "steel", "oak", "bamboo", "cotton", "leather", "ceramic", "glass", "copper",
+    "aluminium", "walnut", "nylon", "carbon", "granite", "linen", "wool",
+]
+NOUNS = [
+    "widget", "hammer", "wrench", "kettle", "lamp", "chair", "table", "backpack",
+    "bottle", "speaker", "keyboard", "monitor", "drill", "saw", "ladder", "blender",
+    "toaster", "mug", "notebook", "pen", "jacket", "boot", "helmet", "tent", "stove",
+    "camera", "router", "cable", "charger", "headphones", "watch", "wallet", "belt",
+    "scarf", "glove", "pillow", "blanket", "mirror", "clock", "vase", "shelf", "desk",
+    "stool", "bench", "bucket", "shovel", "rake", "hose", "sprinkler", "grill",
+]
+CATEGORIES = [
+    "tools", "kitchen", "furniture", "outdoor", "electronics", "office", "apparel",
+    "garden", "home decor", "sports", "storage", "lighting", "audio", "travel",
+]
+QUERIES = [
+    "widget", "wid", "hammer steel", "blue kettle", "lamp", "ceram", "ladder oak",
+    "wireless head", "garden hose", "xk42", "premium walnut desk", "alumin",
+]
+
+
+def make_catalog(count: int):
+    rng = random.Random(7)
+    for _ in range(count):
+        name = " ".join([
+            rng.choice(ADJECTIVES), rng.choice(MATERIALS), rng.choice(NOUNS),
+            f"{rng.choice('abcdefghjkmnpqrstuvwxyz')}{rng.choice('kmxz')}{rng.randrange(100)}",
+        ]).title()
+        yield str(uuid.uuid4()), name, rng.choice(CATEGORIES)
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def bench_sync(rows, chunk=10000):
+    engine = create_engine("sqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async def load(batch, created_at):
+        # One product a second, the last one at created_at
+        first = created_at - timedelta(seconds=len(batch))
+        async with engine.begin() as connection:
+            for start in range(0, len(batch), chunk):
+                await connection.execute(insert(Product), [
+                    {"product_id": product_id, "name": name, "category": category, "price": 1.0,
+                     "created_at": first + timedelta(seconds=start + offset)}
+                    for offset, (product_id, name, category) in enumerate(batch[start:start + chunk])
+                ])
+
+    stalls = [0.0]
+
+    async def ticker(interval=0.01):
+        # Longest gap between ticks: how long the loop was blocked
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            stalls[0] = max(stalls[0], now - last - interval)
+            last = now
+
+    initial = len(rows) * 100 // 101
+    now = datetime.utcnow()
+    await load(rows[:initial], now - timedelta(seconds=len(rows) - initial))
+    index = ProductSearchIndex()
+    async with AsyncSession(engine) as session:
+        task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        await index.sync(session, force=True)
+        full = time.perf_counter() - start
+        # Let the ticker observe a stall at the very end of the build
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        await load(rows[initial:], now)
+        start = time.perf_counter()
+        await index.sync(session, force=True)
+        incremental = time.perf_counter() - start
+    await engine.dispose()
+    print(f"sync: full build of {initial:,} products {full:.2f}s "
+          f"(longest loop stall {stalls[0] * 1000:.0f}ms), "
+          f"incremental {len(rows) - initial:,} more {incremental:.2f}s, indexed {len(index):,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--sync-products", type=int, default=200000,
+                        help="products loaded into SQLite for the sync benchmark; 0 skips it")
+    args = parser.parse_args()
+
+    rows = list(make_catalog(args.products))
+    if args.sync_products:
+        asyncio.run(bench_sync(list(make_catalog(args.sync_products))))
+
+    index = ProductSearchIndex()
+    start = time.perf_counter()
+    index.add_many(rows)
+    print(f"indexed {len(index):,} products in {time.perf_counter() - start:.1f}s")
+
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE products (product_id TEXT PRIMARY KEY, name TEXT, category TEXT)")
+    db.executemany("INSERT INTO products VALUES (?, ?, ?)", rows)
+    db.execute("CREATE INDEX ix_products_name ON products (name)")
+
+    def like(query):
+        clauses, params = [], []
+        for term in query.split():
+            clauses.append("(name LIKE ? OR category LIKE ?)")
+            params += [f"%{term}%", f"%{term}%"]
+        sql = f"SELECT product_id FROM products WHERE {' AND '.join(clauses)} ORDER BY name LIMIT ?"
+        return db.execute(sql, params + [args.limit]).fetchall()
+
+    print(f"\n{'query':<24} {'matches':>9} {'index ms':>10} {'LIKE ms':>10} {'speedup':>8}")
+    index_times = []
+    for query in QUERIES:
+        _, total = index.search(query, args.limit)
+        index_ms = timed(lambda: index.search(query, args.limit), args.repeat)
+        like_ms = timed(lambda: like(query), max(1, args.repeat // 10))
+        index_times.append(index_ms)
+        print(f"{query:<24} {total:>9,} {index_ms:>10.3f} {like_ms:>10.1f} {like_ms / index_ms:>7.0f}x")
+
+    print(f"\nindex median over queries: {statistics.median(index_times):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Throughput cost of a concurrent sampling-profiler session.
+
+Mounts the metrics router and drives two of its existing endpoints through
+the ASGI interface (no network) for ``--seconds`` seconds: once with no
+profiler and once per sampling rate with a ``SamplingProfiler`` session
+running in a background thread for the same window. It reports requests
+per second, the slowdown against the baseline and the samples taken.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_profiler_overhead [--seconds N] [--rates 100,1000]
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+
+from fastapi import FastAPI
+
+from app.api.v1.endpoints.metrics import router
+from app.monitoring.profiler import SamplingProfiler
+from benchmarks.bench_middleware import make_scope
+
+PATHS = ["/metrics/", "/metrics/debug/slow"]
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(router, prefix="/metrics")
+    return app
+
+
+async def call(app, path, send):
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()
+
+    await app(make_scope(path), receive, send)
+
+
+async def drive(app, seconds: float) -> int:
+    async def send(message):
+        pass
+
+    for path in PATHS:
+        for _ in range(100):
+            await call(app, path, send)
+
+    requests = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for path in PATHS:
+            await call(app, path, send)
+        requests += len(PATHS)
+    return requests
+
+
+def run(app, seconds: float, rate=None):
+    result = {}
+    thread = None
+    if rate is not None:
+        profiler = SamplingProfiler(max_seconds=seconds, max_rate=rate)
+        thread = threading.Thread(
+            target=lambda: result.setdefault("profile", profiler.run(seconds, rate))
+        )
+        thread.start()
+    requests = asyncio.run(drive(app, seconds))
+    if thread is not None:
+        thread.join()
+    profile = result.get("profile")
+    return requests / seconds, profile.samples if profile else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rates", default="100,1000", help="comma-separated sampling rates in Hz")
+    args = parser.parse_args()
+
+    app = build_app()
+    rates = [float(rate) for rate in args.rates.split(",")]
+
+    baseline, _ = run(app, args.seconds)
+    print(f"{'profiler':<12} {'req/s':>10} {'slowdown':>9} {'samples':>8}")
+    print(f"{'off':<12} {baseline:>10,.0f} {'-':>9} {'-':>8}")
+    for rate in rates:
+        throughput, samples = run(app, args.seconds, rate)
+        slowdown = (1 - throughput / baseline) * 100
+        print(f"{f'{rate:g} Hz':<12} {throughput:>10,.0f} {slowdown:>8.1f}% {samples:>8,}")
+
+
+if __name__ == "__main__":
+    main()
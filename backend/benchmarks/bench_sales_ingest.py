@@ -0,0 +1,107 @@
+"""
+Sales ingestion throughput benchmark.
+
+Builds an NDJSON body of N events (default 500k), then runs it through the
+same path as ``POST /sales/events``: parse and validate each line, submit to
+a SalesPipeline (tumbling-window aggregation and buffering), and flush in
+batches. Batches are written to an in-memory SQLite table with one
+``executemany`` per transaction, or discarded with ``--no-store``.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_sales_ingest [--events N] [--request-size N]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sqlite3
+import time
+
+from app.data.sales import SalesPipeline, parse_ndjson
+
+CATEGORIES = [
+    "tools", "kitchen", "furniture", "outdoor", "electronics", "office", "apparel",
+    "garden", "home decor", "sports", "storage", "lighting", "audio", "travel",
+]
+
+
+def make_bodies(count: int, request_size: int):
+    rng = random.Random(11)
+    now = time.time()
+    lines = []
+    for index in range(count):
+        if rng.random() < 0.7:
+            event = {"type": "visit", "category": rng.choice(CATEGORIES)}
+        else:
+            event = {
+                "productId": f"p-{rng.randrange(100000)}",
+                "category": rng.choice(CATEGORIES),
+                "quantity": rng.randint(1, 5),
+                "amount": round(rng.uniform(1, 500), 2),
+            }
+        event["timestamp"] = now - rng.uniform(0, 3600)
+        lines.append(json.dumps(event))
+    return [
+        "\n".join(lines[start:start + request_size]).encode()
+        for start in range(0, count, request_size)
+    ]
+
+
+def sqlite_writer():
+    db = sqlite3.connect(":memory:")
+    db.execute(
+        "CREATE TABLE sale_events (event_type TEXT, product_id TEXT, category TEXT,"
+        " quantity INTEGER, amount REAL, occurred_at REAL)"
+    )
+
+    async def write(batch):
+        with db:
+            db.executemany("INSERT INTO sale_events VALUES (?, ?, ?, ?, ?, ?)", batch)
+
+    return write, db
+
+
+async def discard(batch):
+    pass
+
+
+async def run(args):
+    bodies = make_bodies(args.events, args.request_size)
+    writer, db = sqlite_writer() if args.store else (discard, None)
+    pipeline = SalesPipeline(batch_size=args.batch_size, max_buffered=args.events, writer=writer)
+
+    start = time.perf_counter()
+    parse_seconds = 0.0
+    for body in bodies:
+        parse_start = time.perf_counter()
+        events, rejected, _ = parse_ndjson(body)
+        parse_seconds += time.perf_counter() - parse_start
+        assert not rejected and pipeline.submit(events)
+        await asyncio.sleep(0)
+    await pipeline.stop()
+    elapsed = time.perf_counter() - start
+
+    print(f"events:       {args.events:,} in {len(bodies):,} requests of {args.request_size:,}")
+    print(f"parse+check:  {parse_seconds:.2f}s")
+    print(f"total:        {elapsed:.2f}s ({args.events / elapsed:,.0f} events/s)")
+    print(f"written:      {pipeline.written:,} in batches of {args.batch_size:,}")
+    if db is not None:
+        print(f"rows stored:  {db.execute('SELECT count(*) FROM sale_events').fetchone()[0]:,}")
+    hour = pipeline.windows["hour"].series(1)[0]
+    print(f"latest hour:  {hour['purchases']:,} purchases, {hour['visits']:,} visits, "
+          f"revenue {hour['revenue']:,.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=500000)
+    parser.add_argument("--request-size", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--no-store", dest="store", action="store_false")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+JSON serialization benchmark: stdlib path against the configured backend.
+
+Measures the serialization work behind the two busiest JSON endpoints and
+the log formatter, once the way the stdlib path does it and once through
+``app.core.serialization``:
+
+- dashboard response: FastAPI's default (``jsonable_encoder`` plus
+  ``JSONResponse``), ``FastJSONResponse``, and the per-tick cached bytes the
+  endpoint now serves
+- webhook request: parsing an AlertManager payload of ``--alerts`` alerts
+  with ``json.loads`` and with the backend's ``loads``, plus the accepted
+  response
+- log record: the previous formatter (``json.dumps`` and a per-record
+  ``isoformat``) against ``JSONFormatter``
+
+Each case reports the mean cost per call and calls per second, followed by
+the speedup of each backend case over its stdlib baseline. ``--output``
+saves the results for ``benchmarks.compare``.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_serialization [--alerts N] [--output FILE]
+"""
+
+import argparse
+import json
+import logging
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+from app.core import serialization
+from app.core.logging import JSONFormatter
+from app.core.serialization import FastJSONResponse
+from app.monitoring.aggregator import dashboard_aggregator
+from benchmarks.bench_micro import timed
+from benchmarks.results import print_table, save
+
+
+class StdlibJSONFormatter(logging.Formatter):
+    """The formatter as it was before the serialization backend."""
+
+    def format(self, record):
+        log_entry = {
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+        }
+        if hasattr(record, "extra_fields"):
+            log_entry.update(record.extra_fields)
+        return json.dumps(log_entry)
+
+
+def make_webhook_body(alerts: int) -> bytes:
+    return json.dumps({
+        "version": "4",
+        "groupKey": "{}:{alertname=\"HighLatency\"}",
+        "status": "firing",
+        "receiver": "monitoring-webhook",
+        "groupLabels": {"alertname": "HighLatency"},
+        "commonLabels": {"alertname": "HighLatency", "severity": "warning"},
+        "commonAnnotations": {},
+        "externalURL": "http://alertmanager:9093",
+        "alerts": [
+            {
+                "status": "firing",
+                "labels": {
+                    "alertname": "HighLatency",
+                    "severity": "warning",
+                    "team": "platform",
+                    "instance": f"api-{index}:8000",
+                    "job": "monitoring-api",
+                },
+                "annotations": {
+                    "summary": "p95 latency above 500ms",
+                    "description": f"api-{index} p95 latency has been above 500ms for 5 minutes",
+                },
+                "startsAt": "2024-01-01T12:00:00.000Z",
+                "endsAt": "0001-01-01T00:00:00Z",
+                "generatorURL": f"http://prometheus:9090/graph?g0.expr=latency&instance=api-{index}",
+                "fingerprint": f"{index:016x}",
+            }
+            for index in range(alerts)
+        ],
+    }).encode()
+
+
+def make_record(created_step: float):
+    record = logging.makeLogRecord({
+        "name": "middleware",
+        "levelno": logging.INFO,
+        "levelname": "INFO",
+        "msg": "API Request: GET /api/v1/dashboard/metrics - 200",
+        "module": "middleware",
+        "funcName": "send_wrapper",
+        "lineno": 150,
+        "extra_fields": {
+            "request_method": "GET",
+            "request_path": "/api/v1/dashboard/metrics",
+            "status_code": 200,
+            "response_time_ms": 1.734,
+        },
+    })
+    state = {"created": record.created}
+
+    def next_record():
+        # Records arrive a few microseconds apart, as under load
+        state["created"] += created_step
+        record.created = state["created"]
+        return record
+
+    return next_record
+
+
+def run(args):
+    dashboard_aggregator.tick()
+    snapshot = dashboard_aggregator.snapshot()
+    body = make_webhook_body(args.alerts)
+    accepted = {"status": "accepted", "message": "Webhook queued", "alerts": args.alerts}
+    next_record = make_record(args.log_interval_us / 1e6)
+    stdlib_formatter, formatter = StdlibJSONFormatter(), JSONFormatter()
+
+    cases = [
+        ("dashboard response", [
+            ("FastAPI default", lambda: JSONResponse(jsonable_encoder(snapshot))),
+            ("FastJSONResponse", lambda: FastJSONResponse(jsonable_encoder(snapshot))),
+            ("cached bytes", lambda: Response(
+                dashboard_aggregator.snapshot_json(), media_type="application/json"
+            )),
+        ]),
+        ("webhook parse", [
+            ("json.loads", lambda: json.loads(body)),
+            ("backend loads", lambda: serialization.loads(body)),
+        ]),
+        ("webhook response", [
+            ("FastAPI default", lambda: JSONResponse(jsonable_encoder(accepted))),
+            ("FastJSONResponse", lambda: FastJSONResponse(accepted)),
+        ]),
+        ("log record", [
+            ("stdlib formatter", lambda: stdlib_formatter.format(next_record())),
+            ("JSONFormatter", lambda: formatter.format(next_record())),
+        ]),
+    ]
+
+    results, speedups = {}, []
+    for group, variants in cases:
+        baseline = None
+        for label, fn in variants:
+            result = timed(fn, args.calls)
+            results[f"{group}: {label}"] = result
+            if baseline is None:
+                baseline = result["us_per_call"]
+            else:
+                speedups.append((f"{group}: {label}", baseline / result["us_per_call"]))
+    return results, speedups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--alerts", type=int, default=20, help="alerts per webhook payload")
+    parser.add_argument(
+        "--log-interval-us", type=float, default=50.0,
+        help="microseconds between consecutive log record timestamps"
+    )
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    print(f"backend: {serialization.backend}")
+    results, speedups = run(args)
+    print_table(results)
+    print()
+    for name, speedup in speedups:
+        print(f"{name:<40} {speedup:>6.2f}x")
+    if args.output:
+        params = {"calls": args.calls, "alerts": args.alerts,
+                  "log_interval_us": args.log_interval_us, "backend": serialization.backend}
+        save(args.output, "serialization", results, params)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Worker cold-start benchmark.
+
+Starts ``--runs`` fresh interpreters. Each one imports ``app.main``, runs the
+application lifespan and sends two requests through httpx's ASGI transport.
+The benchmark reports the median import time, lifespan startup time, and
+first and warm request latency. The children run in a scratch directory, so
+the report also shows whether importing the app created anything there (it
+should not: log files are opened at startup).
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_startup [--runs N] [--path /health] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.results import print_table, save
+
+MARKER = "STARTUP-RESULT "
+
+CHILD = """
+import asyncio, json, os, sys, time
+import httpx
+
+start = time.perf_counter()
+from app.main import app
+import_s = time.perf_counter() - start
+created_at_import = sorted(os.listdir("."))
+
+async def main():
+    start = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        startup_s = time.perf_counter() - start
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            latencies = []
+            for _ in range(2):
+                start = time.perf_counter()
+                response = await client.get(sys.argv[1])
+                latencies.append(time.perf_counter() - start)
+    return startup_s, latencies, response.status_code
+
+startup_s, (first_s, warm_s), status = asyncio.run(main())
+print("%s" + json.dumps({
+    "import_ms": import_s * 1000, "startup_ms": startup_s * 1000,
+    "first_request_ms": first_s * 1000, "warm_request_ms": warm_s * 1000,
+    "status": status, "created_at_import": created_at_import,
+}), flush=True)
+""" % MARKER
+
+
+def run_child(path: str, workdir: str) -> dict:
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [backend, env.get("PYTHONPATH")]))
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, path], cwd=workdir, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    for line in output.splitlines():
+        if line.startswith(MARKER):
+            return json.loads(line[len(MARKER):])
+    raise RuntimeError(f"No result from child process:\n{output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as workdir:
+            runs.append(run_child(args.path, workdir))
+
+    metrics = ["import_ms", "startup_ms", "first_request_ms", "warm_request_ms"]
+    results = {
+        f"cold start {args.path}": {
+            metric: round(statistics.median(run[metric] for run in runs), 3) for metric in metrics
+        }
+    }
+    print_table(results)
+    statuses = sorted({run["status"] for run in runs})
+    created = sorted({name for run in runs for name in run["created_at_import"]})
+    print(f"\nresponse status: {statuses}; created by import: {created or 'nothing'}")
+
+    if args.output:
+        save(args.output, "startup", results, {"runs": args.runs, "path": args.path})
+
+
+if __name__ == "__main__":
+    main()
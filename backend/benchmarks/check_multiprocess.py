@@ -0,0 +1,108 @@
+"""
+End-to-end check of multi-process metrics aggregation.
+
+Spawns several worker processes that share a PROMETHEUS_MULTIPROC_DIR, has
+each one record metrics, stops some of them, then verifies that the
+aggregating registry used by /api/v1/metrics reports:
+
+- counters summed over every worker, dead or alive
+- ``livesum`` gauges (ACTIVE_CONNECTIONS) summed over live workers only
+- ``livemax`` gauges (ERROR_RATE) as the max over live workers
+
+Run from the backend directory:
+
+    python -m benchmarks.check_multiprocess [--workers N]
+
+Exits non-zero if any aggregated value is wrong.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+WORKER = """
+import sys
+from app.monitoring.prometheus_metrics import REQUEST_COUNT, ACTIVE_CONNECTIONS, ERROR_RATE
+index = int(sys.argv[1])
+REQUEST_COUNT.labels(method="GET", endpoint="/health", status=200).inc(10)
+ACTIVE_CONNECTIONS.inc(2)
+ERROR_RATE.set(index)
+print("ready", flush=True)
+sys.stdin.readline()
+"""
+
+
+def sample_value(registry, name, **labels):
+    for family in registry.collect():
+        for sample in family.samples:
+            if sample.name == name and all(
+                sample.labels.get(key) == value for key, value in labels.items()
+            ):
+                return sample.value
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as metrics_dir:
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=metrics_dir)
+        # Must be set before app.monitoring.prometheus_metrics is imported
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+
+        workers = []
+        for index in range(args.workers):
+            worker = subprocess.Popen(
+                [sys.executable, "-c", WORKER, str(index)],
+                env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+            )
+            workers.append(worker)
+        for worker in workers:
+            assert worker.stdout.readline().strip() == "ready"
+
+        # Stop the upper half; the lower half stays alive
+        alive = workers[: args.workers // 2 or 1]
+        for worker in workers[len(alive):]:
+            worker.communicate("\n")
+
+        from app.monitoring.multiprocess import build_registry, cleanup_dead_workers
+
+        dead = cleanup_dead_workers()
+        registry = build_registry()
+
+        checks = [
+            (
+                "http_requests_total (all workers)",
+                sample_value(registry, "http_requests_total", endpoint="/health"),
+                10.0 * args.workers,
+            ),
+            (
+                "active_connections (livesum)",
+                sample_value(registry, "active_connections"),
+                2.0 * len(alive),
+            ),
+            (
+                "error_rate_percentage (livemax)",
+                sample_value(registry, "error_rate_percentage"),
+                float(len(alive) - 1),
+            ),
+        ]
+
+        for worker in alive:
+            worker.communicate("\n")
+
+    print(f"workers: {args.workers}, stopped: {len(dead)}")
+    failed = False
+    for name, actual, expected in checks:
+        ok = actual == expected
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name}: {actual} (expected {expected})")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
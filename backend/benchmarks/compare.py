@@ -0,0 +1,76 @@
+"""
+Regression check between two benchmark result files.
+
+Compares every metric present in both runs and flags it when the current
+run is worse than the baseline by more than ``--threshold`` percent, in the
+metric's own direction (see ``benchmarks.results``). Cases or metrics that
+only exist in one file are listed but never fail the check.
+
+Run from the backend directory:
+
+    python -m benchmarks.compare baseline.json current.json [--threshold 10]
+
+Exits non-zero if any metric regressed past the threshold.
+"""
+
+import argparse
+import sys
+
+from benchmarks.results import higher_is_better, load
+
+
+def compare(baseline, current, threshold: float):
+    """Yield (case, metric, baseline, current, change %, regressed) rows."""
+    for case, metrics in current.items():
+        previous = baseline.get(case)
+        if previous is None:
+            continue
+        for metric, value in metrics.items():
+            old = previous.get(metric)
+            if old is None:
+                continue
+            if old == 0:
+                change = 0.0 if value == 0 else float("inf")
+            else:
+                change = (value - old) / abs(old) * 100
+            worse = -change if higher_is_better(metric) else change
+            yield case, metric, old, value, change, worse > threshold
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0,
+        help="allowed regression in percent before the check fails"
+    )
+    args = parser.parse_args()
+
+    baseline, current = load(args.baseline), load(args.current)
+    if baseline["suite"] != current["suite"]:
+        sys.exit(f"Suites differ: {baseline['suite']} vs {current['suite']}")
+
+    regressions = 0
+    print(f"{'case':<40} {'metric':>10} {'baseline':>12} {'current':>12} {'change':>9}")
+    for case, metric, old, new, change, regressed in compare(
+        baseline["results"], current["results"], args.threshold
+    ):
+        regressions += regressed
+        flag = "  REGRESSED" if regressed else ""
+        print(f"{case:<40} {metric:>10} {old:>12,.3f} {new:>12,.3f} {change:>+8.1f}%{flag}")
+
+    only_baseline = baseline["results"].keys() - current["results"].keys()
+    only_current = current["results"].keys() - baseline["results"].keys()
+    for case in sorted(only_baseline):
+        print(f"missing from current run: {case}")
+    for case in sorted(only_current):
+        print(f"new in current run: {case}")
+
+    if regressions:
+        print(f"{regressions} metric(s) regressed by more than {args.threshold:g}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Shared result format for the benchmark suite.
+
+A run is saved as one JSON document:
+
+    {"suite": "api", "created_at": "...", "python": "3.11.7", "platform": "...",
+     "params": {...}, "results": {"GET /health": {"rps": 5210.4, "p99_ms": 3.1}}}
+
+Each result maps a case name to flat numeric metrics. Metric names carry
+their direction: ``rps`` and ``*_per_s`` are better when higher, and all
+other metrics (latencies, per-call costs) are better when lower.
+``benchmarks.compare`` diffs two such files.
+"""
+
+import json
+import math
+import platform
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Sequence
+
+Results = Dict[str, Dict[str, float]]
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric == "rps" or metric.endswith("_per_s")
+
+
+def percentile(sorted_samples: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted samples, ``q`` in [0, 100]."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_samples)), 1)
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    """p50/p90/p99/max in milliseconds from latencies in seconds."""
+    latencies = sorted(latencies)
+    return {
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p90_ms": round(percentile(latencies, 90) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+def save(path: str, suite: str, results: Results, params: Dict[str, Any]):
+    document = {
+        "suite": suite,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": params,
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def print_table(results: Results, file=sys.stdout):
+    metrics: List[str] = []
+    for values in results.values():
+        metrics.extend(metric for metric in values if metric not in metrics)
+    width = max([len(name) for name in results] + [4])
+    print(f"{'case':<{width}} " + " ".join(f"{metric:>12}" for metric in metrics), file=file)
+    for name, values in results.items():
+        cells = " ".join(
+            f"{values[metric]:>12,.3f}" if metric in values else f"{'-':>12}"
+            for metric in metrics
+        )
+        print(f"{name:<{width}} {cells}", file=file)
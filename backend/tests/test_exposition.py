@@ -0,0 +1,19 @@
+import pytest
+
+from app.monitoring.exposition import accepts_gzip
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", True),
+    ("gzip, deflate, br", True),
+    ("deflate", False),
+    ("", False),
+    ("*", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.5", True),
+    ("*;q=0, gzip", True),
+    ("gzip;q=0, *", False),
+    ("identity, *;q=0", False),
+    ("GZIP;Q=1", True),
+])
+def test_accepts_gzip(header, expected):
+    assert accepts_gzip(header) is expected
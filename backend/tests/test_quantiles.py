@@ -0,0 +1,26 @@
+import pytest
+
+from app.monitoring.quantiles import LatencyTracker
+
+def test_requests_per_second_divides_by_the_covered_span():
+    tracker = LatencyTracker(window_seconds=60.0, slots=6)
+    tracker._started = 0.0
+    now = 1005.0  # 5s into the current 10s slot
+    
+    # 110 requests spread over the 55s the merged slots cover
+    for step in range(110):
+        tracker.observe("/api/v1/products", 0.01, now=now - 54.5 + step * 0.5)
+    tracker.refresh(now)
+    
+    assert tracker.requests_per_second == pytest.approx(2.0)
+
+def test_requests_per_second_is_capped_at_the_time_since_start():
+    tracker = LatencyTracker(window_seconds=60.0, slots=6)
+    tracker._started = 1000.0
+    now = 1004.0
+    
+    for step in range(8):
+        tracker.observe("/api/v1/products", 0.01, now=1000.0 + step * 0.5)
+    tracker.refresh(now)
+    
+    assert tracker.requests_per_second == pytest.approx(2.0)
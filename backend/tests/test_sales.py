@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from app.core.exceptions import ValidationError
+from app.data.sales import parse_event, parse_ndjson
+
+NOW = 1_700_000_000.0
+
+def line(**fields) -> bytes:
+    return json.dumps({"category": "books", "amount": 10, **fields}).encode()
+
+@pytest.mark.parametrize("field", ["quantity", "amount"])
+@pytest.mark.parametrize("value", ["inf", "-inf", "nan"])
+def test_parse_event_rejects_non_finite_values(field, value):
+    with pytest.raises(ValidationError) as excinfo:
+        parse_event(line(**{field: value}), NOW)
+    assert excinfo.value.field == field
+
+def test_parse_ndjson_rejects_non_finite_lines_individually():
+    body = b"\n".join([
+        line(quantity="inf"),
+        line(amount="nan"),
+        line(quantity=2, amount=5.5),
+    ])
+    events, rejected, errors = parse_ndjson(body, NOW)
+    
+    assert rejected == 2
+    assert [error["line"] for error in errors] == [1, 2]
+    assert events == [("purchase", None, "books", 2, 5.5, NOW)]
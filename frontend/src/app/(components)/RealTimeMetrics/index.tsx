@@ -2,6 +2,7 @@
 
 import { useState, useEffect, useCallback } from "react";
 import { useGetDashboardMetricsQuery } from "@/state/api";
+import { useDashboardStream } from "@/state/dashboardStream";
 import { 
   Activity, 
   RefreshCw, 
@@ -31,13 +32,17 @@ interface RealTimeMetric {
 }
 
 const RealTimeMetrics = () => {
-  const [isConnected, setIsConnected] = useState(true);
   const [lastUpdate, setLastUpdate] = useState<Date>(new Date());
   const [autoRefresh, setAutoRefresh] = useState(true);
   const [refreshInterval, setRefreshInterval] = useState(5000); // 5 seconds
   const [previousMetrics, setPreviousMetrics] = useState<any>(null);
 
-  const { data: metrics, isLoading, isError, refetch } = useGetDashboardMetricsQuery();
+  const { data: polledMetrics, isLoading, isError, refetch } = useGetDashboardMetricsQuery();
+
+  // Live updates are pushed by the server; polling is only the fallback
+  const stream = useDashboardStream(autoRefresh);
+  const metrics = stream.metrics ?? polledMetrics;
+  const isConnected = stream.isConnected || !isError;
 
   // Calculate trends
   const calculateTrend = useCallback((current: number, previous: number): MetricTrend => {
@@ -61,28 +66,23 @@ const RealTimeMetrics = () => {
     };
   }, []);
 
-  // Auto-refresh effect
+  // Auto-refresh effect: poll only while the live stream is unavailable
   useEffect(() => {
-    if (!autoRefresh) return;
+    if (!autoRefresh || stream.isConnected) return;
 
     const interval = setInterval(() => {
-      if (isConnected) {
-        refetch();
-        setLastUpdate(new Date());
-      }
+      refetch();
+      setLastUpdate(new Date());
     }, refreshInterval);
 
     return () => clearInterval(interval);
-  }, [autoRefresh, refreshInterval, isConnected, refetch]);
+  }, [autoRefresh, refreshInterval, stream.isConnected, refetch]);
 
-  // Connection status simulation
   useEffect(() => {
-    const connectionInterval = setInterval(() => {
-      setIsConnected(Math.random() > 0.1); // 90% uptime simulation
-    }, 30000);
-
-    return () => clearInterval(connectionInterval);
-  }, []);
+    if (stream.lastUpdate) {
+      setLastUpdate(stream.lastUpdate);
+    }
+  }, [stream.lastUpdate]);
 
   // Calculate metrics with trends
   const realTimeMetrics: RealTimeMetric[] = metrics ? [
@@ -209,7 +209,7 @@ const RealTimeMetrics = () => {
     );
   }
 
-  if (isError) {
+  if (isError && !stream.metrics) {
     return (
       <div className="bg-white rounded-lg shadow p-6">
         <div className="flex items-center justify-center text-red-500">
@@ -331,10 +331,10 @@ const RealTimeMetrics = () => {
         <div className="flex items-center justify-between text-sm text-gray-500">
           <div className="flex items-center">
             <div className="w-2 h-2 bg-green-500 rounded-full mr-2 animate-pulse"></div>
-            <span>Live data streaming</span>
+            <span>{stream.isConnected ? 'Live data streaming' : 'Polling'}</span>
           </div>
           <div>
-            Refresh interval: {refreshInterval / 1000}s
+            {stream.isConnected ? 'Server push' : `Refresh interval: ${refreshInterval / 1000}s`}
           </div>
         </div>
       </div>
@@ -2,14 +2,24 @@
 
 import { useState, useEffect } from 'react';
 
+interface HealthCheck {
+  status: string;
+  critical: boolean;
+  duration_ms: number;
+  error?: string;
+}
+
 interface HealthStatus {
   status: string;
   service: string;
-  timestamp: string;
+  timestamp: string | null;
+  ready?: boolean;
+  checks?: Record<string, HealthCheck>;
 }
 
 interface ReadinessStatus {
   status: string;
+  failing?: string[];
 }
 
 interface LivenessStatus {
@@ -34,7 +44,8 @@ export default function HealthPage() {
         fetch('/api/v1/health/live')
       ]);
 
-      if (!healthRes.ok || !readinessRes.ok || !livenessRes.ok) {
+      // Readiness and liveness answer 503 with a JSON body when not ready
+      if ([healthRes, readinessRes, livenessRes].some((res) => !res.ok && res.status !== 503)) {
         throw new Error('Failed to fetch health data');
       }
 
@@ -63,11 +74,14 @@ export default function HealthPage() {
   const getStatusColor = (status: string) => {
     switch (status.toLowerCase()) {
       case 'healthy':
+      case 'ok':
       case 'ready':
       case 'alive':
         return 'text-green-600 bg-green-100';
       case 'unhealthy':
+      case 'failing':
       case 'not ready':
+      case 'stale':
       case 'dead':
         return 'text-red-600 bg-red-100';
       default:
@@ -134,9 +148,17 @@ export default function HealthPage() {
               <div className="flex items-center justify-between">
                 <span className="font-medium">Timestamp:</span>
                 <span className="text-gray-600 text-sm">
-                  {new Date(healthStatus.timestamp).toLocaleString()}
+                  {healthStatus.timestamp ? new Date(healthStatus.timestamp).toLocaleString() : '-'}
                 </span>
               </div>
+              {healthStatus.checks && Object.entries(healthStatus.checks).map(([name, check]) => (
+                <div key={name} className="flex items-center justify-between" title={check.error}>
+                  <span className="text-sm text-gray-600">{name}</span>
+                  <span className={`px-2 py-1 rounded-full text-xs ${getStatusColor(check.status)}`}>
+                    {check.status}
+                  </span>
+                </div>
+              ))}
             </div>
           )}
         </div>
@@ -152,6 +174,12 @@ export default function HealthPage() {
                   {readinessStatus.status}
                 </span>
               </div>
+              {readinessStatus.failing && readinessStatus.failing.length > 0 && (
+                <div className="flex items-center justify-between">
+                  <span className="font-medium">Failing:</span>
+                  <span className="text-gray-600 text-sm">{readinessStatus.failing.join(', ')}</span>
+                </div>
+              )}
             </div>
           )}
         </div>
@@ -0,0 +1,66 @@
+import { useEffect, useState } from "react";
+import { CONFIG } from "@/config";
+import { DashboardMetrics } from "./api";
+
+type Snapshot = Record<string, Record<string, number>>;
+
+// snake_case backend keys -> camelCase frontend keys (network_io -> networkIO)
+const toCamelCase = (key: string) =>
+  key.replace(/_([a-z])/g, (_, c: string) => c.toUpperCase()).replace(/Io$/, "IO");
+
+const toDashboardMetrics = (snapshot: Snapshot): DashboardMetrics => {
+  const metrics: Record<string, Record<string, number>> = {};
+  for (const [section, values] of Object.entries(snapshot)) {
+    const converted: Record<string, number> = {};
+    for (const [key, value] of Object.entries(values)) {
+      converted[toCamelCase(key)] = value;
+    }
+    metrics[toCamelCase(section)] = converted;
+  }
+  return metrics as unknown as DashboardMetrics;
+};
+
+const applyDelta = (snapshot: Snapshot, delta: Snapshot): Snapshot => {
+  const next: Snapshot = { ...snapshot };
+  for (const [section, values] of Object.entries(delta)) {
+    next[section] = { ...next[section], ...values };
+  }
+  return next;
+};
+
+// Subscribes to the server-pushed dashboard stream (SSE). The server sends a
+// full "snapshot" event, then "delta" events with only the changed values.
+export const useDashboardStream = (enabled: boolean) => {
+  const [metrics, setMetrics] = useState<DashboardMetrics | undefined>();
+  const [isConnected, setIsConnected] = useState(false);
+  const [lastUpdate, setLastUpdate] = useState<Date | undefined>();
+
+  useEffect(() => {
+    if (!enabled || typeof EventSource === "undefined") return;
+
+    let snapshot: Snapshot = {};
+    const source = new EventSource(`${CONFIG.api.baseUrl}/dashboard/stream`);
+
+    const update = (next: Snapshot) => {
+      snapshot = next;
+      setMetrics(toDashboardMetrics(snapshot));
+      setLastUpdate(new Date());
+    };
+
+    source.onopen = () => setIsConnected(true);
+    source.onerror = () => setIsConnected(false);
+    source.addEventListener("snapshot", (event) => {
+      update(JSON.parse((event as MessageEvent).data));
+    });
+    source.addEventListener("delta", (event) => {
+      update(applyDelta(snapshot, JSON.parse((event as MessageEvent).data)));
+    });
+
+    return () => {
+      source.close();
+      setIsConnected(false);
+    };
+  }, [enabled]);
+
+  return { metrics, isConnected, lastUpdate };
+};